@@ -0,0 +1,160 @@
+"""
+Shared health tracking and circuit breaking for the primary and backup endpoints.
+
+Clients report the outcome and latency of every call to an EndpointHealth.
+When an endpoint keeps failing its circuit opens, and clients send live calls
+straight to the backup instead of paying a full timeout on the primary first.
+Once recovery_time has passed a single probe call is let through (half-open);
+a success closes the circuit again, a failure keeps it open for another
+recovery_time.
+
+One EndpointHealth may be shared by any number of ValidateLeadV3Client,
+AsyncValidateLeadV3Client and ValidateLeadV3Soap instances and threads.
+Endpoints are keyed by their URL (the WSDL URL for SOAP).
+"""
+from collections import deque
+from typing import Callable, Optional
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _EndpointState:
+    __slots__ = ("state", "failures", "retry_at", "latencies", "successes",
+                 "total_failures", "short_circuits", "last_error")
+
+    def __init__(self, latency_samples: int):
+        self.state = CLOSED
+        self.failures = deque()
+        self.retry_at = 0.0
+        self.latencies = deque(maxlen=latency_samples)
+        self.successes = 0
+        self.total_failures = 0
+        self.short_circuits = 0
+        self.last_error = None
+
+
+class EndpointHealth:
+    """Thread-safe per-endpoint failure and latency tracker with a circuit breaker."""
+
+    def __init__(self,
+                 failure_threshold: int = 5,
+                 failure_window: float = 30.0,
+                 recovery_time: float = 15.0,
+                 latency_samples: int = 200,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Parameters:
+            failure_threshold: Failures within failure_window, with no success in between,
+                               that open an endpoint's circuit.
+            failure_window: Seconds over which failures are counted.
+            recovery_time: Seconds an open circuit waits before letting a probe call through.
+            latency_samples: Number of recent successful call latencies kept per endpoint.
+            clock: Monotonic time source, replaceable in tests.
+        """
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.recovery_time = recovery_time
+        self.latency_samples = latency_samples
+        self._clock = clock
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> _EndpointState:
+        state = self._endpoints.get(endpoint)
+        if state is None:
+            state = self._endpoints[endpoint] = _EndpointState(self.latency_samples)
+        return state
+
+    def allow(self, endpoint: str) -> bool:
+        """
+        Whether a call should be sent to endpoint now.
+
+        Always True while the circuit is closed. While it is open, True only for
+        the one probe call allowed each recovery_time.
+        """
+        with self._lock:
+            state = self._endpoint(endpoint)
+            if state.state == CLOSED:
+                return True
+            now = self._clock()
+            if now >= state.retry_at:
+                # Let one probe through; the next one waits another recovery_time,
+                # so a probe that never reports back cannot wedge the circuit
+                state.state = HALF_OPEN
+                state.retry_at = now + self.recovery_time
+                return True
+            state.short_circuits += 1
+            return False
+
+    def record_success(self, endpoint: str, latency: Optional[float] = None) -> None:
+        """Report a successful call to endpoint, closing its circuit."""
+        with self._lock:
+            state = self._endpoint(endpoint)
+            state.state = CLOSED
+            state.failures.clear()
+            state.successes += 1
+            if latency is not None:
+                state.latencies.append(latency)
+
+    def record_failure(self, endpoint: str, error: Optional[BaseException] = None) -> None:
+        """Report a failed call to endpoint: a transport error or an Error.TypeCode of 3."""
+        with self._lock:
+            state = self._endpoint(endpoint)
+            now = self._clock()
+            state.total_failures += 1
+            # Only the type: messages of HTTP errors carry the request URL, license key included
+            state.last_error = type(error).__name__ if error is not None else None
+            if state.state != CLOSED:
+                # A failed probe keeps the circuit open
+                state.state = OPEN
+                state.retry_at = now + self.recovery_time
+                return
+            failures = state.failures
+            failures.append(now)
+            while failures and failures[0] <= now - self.failure_window:
+                failures.popleft()
+            if len(failures) >= self.failure_threshold:
+                state.state = OPEN
+                state.retry_at = now + self.recovery_time
+                failures.clear()
+
+    def state(self, endpoint: str) -> str:
+        """Circuit state of endpoint: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._endpoint(endpoint).state
+
+    def reset(self, endpoint: Optional[str] = None) -> None:
+        """Forget everything recorded for endpoint, or for every endpoint."""
+        with self._lock:
+            if endpoint is None:
+                self._endpoints.clear()
+            else:
+                self._endpoints.pop(endpoint, None)
+
+    @property
+    def stats(self) -> dict:
+        """Per endpoint: circuit state, call counters and recent latency percentiles in seconds."""
+        with self._lock:
+            result = {}
+            for endpoint, state in self._endpoints.items():
+                latencies = sorted(state.latencies)
+                result[endpoint] = {
+                    "state": state.state,
+                    "successes": state.successes,
+                    "failures": state.total_failures,
+                    "short_circuits": state.short_circuits,
+                    "p50_latency": _percentile(latencies, 0.50),
+                    "p95_latency": _percentile(latencies, 0.95),
+                    "last_error": state.last_error,
+                }
+            return result
+
+
+def _percentile(ordered: list, fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
@@ -0,0 +1,229 @@
+"""
+Response cache for ValidateLead_V3 calls.
+
+Identical leads are answered from the cache instead of paying for another
+ValidateLead_V3 call. Entries are keyed on the request parameters with
+whitespace and case folded and LicenseKey left out, so the same lead sent by
+different form handlers or license keys shares one entry. Live and trial
+results are kept apart.
+
+Pass an LVCache to ValidateLeadV3Client, AsyncValidateLeadV3Client or
+ValidateLeadV3Soap through their cache argument.
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+import hashlib
+import json
+import pickle
+import shelve
+import sqlite3
+import threading
+import time
+
+# Parameters that never affect the result and must not split cache entries
+_EXCLUDED_PARAMS = ("LicenseKey",)
+
+
+def cache_key(params: dict) -> str:
+    """
+    Hash the normalized ValidateLead_V3 parameters into a cache key.
+
+    Values are stripped, have inner whitespace collapsed and are case folded;
+    empty and missing values are treated alike, and LicenseKey is ignored.
+    """
+    normalized = {}
+    for name, value in params.items():
+        if name in _EXCLUDED_PARAMS or value is None:
+            continue
+        value = " ".join(str(value).split()).casefold()
+        if value:
+            normalized[name] = value
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_key(params: dict, is_live: bool) -> str:
+    # A trial answer must never be served to a live call, nor the other way round
+    return cache_key(params) + (":live" if is_live else ":trial")
+
+
+class SqliteCacheBackend:
+    """Persistent cache storage in a SQLite database file."""
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path: SQLite database file. Created if it does not exist.
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lv_cache (key TEXT PRIMARY KEY, expires_at REAL, value BLOB)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT expires_at, value FROM lv_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return row[0], pickle.loads(row[1])
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lv_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, expires_at, blob),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM lv_cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM lv_cache")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ShelveCacheBackend:
+    """Persistent cache storage in a shelve (dbm) file."""
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path: shelve file name. Created if it does not exist.
+        """
+        self._lock = threading.Lock()
+        self._shelf = shelve.open(path)
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            return self._shelf.get(key)
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        with self._lock:
+            self._shelf[key] = (expires_at, value)
+            self._shelf.sync()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._shelf.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._shelf.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._shelf.close()
+
+
+class LVCache:
+    """
+    Thread-safe LRU cache of ValidateLead_V3 responses with a per-entry TTL.
+
+    Entries live in memory, least recently used first out. With a backend,
+    entries are also written through to disk and memory misses are read back
+    from it, so the cache survives process restarts.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 86400, backend=None):
+        """
+        Parameters:
+            max_entries: Maximum number of responses kept in memory.
+            ttl: Seconds a response stays valid after it is stored.
+            backend: Optional persistent storage, e.g. SqliteCacheBackend or ShelveCacheBackend.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, params: dict, is_live: bool = True) -> Optional[Any]:
+        """Return the cached response for params sent to the live or trial service, or None on a miss."""
+        key = _entry_key(params, is_live)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        if self.backend is not None:
+            entry = self.backend.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    with self._lock:
+                        self._store(key, entry)
+                        self.hits += 1
+                    return entry[1]
+                self.backend.delete(key)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, params: dict, response: Any, is_live: bool = True) -> None:
+        """Cache response for params sent to the live or trial service. Responses carrying an Error are not cached."""
+        if response is None or getattr(response, "Error", None):
+            return
+        key = _entry_key(params, is_live)
+        entry = (time.time() + self.ttl, response)
+        with self._lock:
+            self._store(key, entry)
+        if self.backend is not None:
+            self.backend.set(key, entry[0], response)
+
+    def get_or_call(self, params: dict, call: Callable[[], Any], is_live: bool = True) -> Any:
+        """Return the cached response for params, or call() and cache its result."""
+        response = self.get(params, is_live)
+        if response is None:
+            response = call()
+            self.put(params, response, is_live)
+        return response
+
+    def _store(self, key: str, entry: Tuple[float, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @property
+    def stats(self) -> dict:
+        """Hit and miss counters, hit ratio and current in-memory size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "size": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Drop every entry, in memory and in the backend, and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+        if self.backend is not None:
+            self.backend.clear()
+
+    def close(self) -> None:
+        """Close the backend, if any."""
+        if self.backend is not None:
+            self.backend.close()
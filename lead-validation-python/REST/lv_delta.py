@@ -0,0 +1,220 @@
+"""
+Delta re-validation: only send the leads whose inputs changed or whose results expired.
+
+A DeltaIndex remembers, for every lead ID, a fingerprint of the lead's input
+fields, when it was last validated and the LVResponse it got. On the next run
+validate_leads_v3_delta sends a lead to ValidateLead_V3 only when its ID is
+new, its fingerprint changed, or its stored response is older than max_age;
+every other lead is answered from the index.
+
+    index = DeltaIndex("crm_delta.db")
+    for response in validate_leads_v3_delta(((row["id"], lead_of(row)) for row in crm), license_key, index):
+        ...
+    print(index.stats)
+"""
+from lv_cache import cache_key
+from lv_response import LVResponse
+from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+from validate_leads_v3_bulk import _error_response
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, Mapping, Optional, Tuple
+import pickle
+import sqlite3
+import threading
+import time
+
+
+def lead_fingerprint(lead: Mapping[str, str], is_live: bool = True) -> str:
+    """
+    Fingerprint the ValidateLead_V3 input fields of a lead.
+
+    Fields are normalized the way LVCache keys are, so changes in case or
+    whitespace alone do not count as a change. Live and trial results differ,
+    so the same lead fingerprints differently for each.
+    """
+    return cache_key(build_params(lead, "")) + (":live" if is_live else ":trial")
+
+
+class DeltaIndex:
+    """Lead ID -> (fingerprint, validated_at, response) index in a SQLite database file."""
+
+    def __init__(self, path: str, commit_every: int = 500):
+        """
+        Parameters:
+            path: SQLite database file. Created if it does not exist.
+            commit_every: Writes between commits. Uncommitted writes are lost on a
+                          crash; those leads are simply validated again next run.
+        """
+        self.commit_every = commit_every
+        self.reused = 0
+        self.new = 0
+        self.changed = 0
+        self.expired = 0
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lv_delta "
+            "(lead_id TEXT PRIMARY KEY, fingerprint TEXT, validated_at REAL, response BLOB)"
+        )
+        self._conn.commit()
+
+    def lookup(self, lead_id: str) -> Optional[Tuple[str, float]]:
+        """Return the stored (fingerprint, validated_at) of lead_id, or None."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT fingerprint, validated_at FROM lv_delta WHERE lead_id = ?", (lead_id,)
+            ).fetchone()
+
+    def response(self, lead_id: str) -> Optional[Any]:
+        """Return the stored response of lead_id, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM lv_delta WHERE lead_id = ?", (lead_id,)).fetchone()
+        return pickle.loads(row[0]) if row is not None else None
+
+    def put(self, lead_id: str, fingerprint: str, response: Any, validated_at: Optional[float] = None) -> None:
+        """Store response as the result of lead_id for the inputs with the given fingerprint."""
+        blob = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lv_delta (lead_id, fingerprint, validated_at, response) VALUES (?, ?, ?, ?)",
+                (lead_id, fingerprint, time.time() if validated_at is None else validated_at, blob),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._commit()
+
+    def delete(self, lead_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM lv_delta WHERE lead_id = ?", (lead_id,))
+            self._commit()
+
+    def prune(self, older_than: float) -> int:
+        """Drop leads last validated more than older_than seconds ago, e.g. ones removed upstream."""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM lv_delta WHERE validated_at < ?", (time.time() - older_than,)
+            ).rowcount
+            self._commit()
+        return deleted
+
+    def flush(self) -> None:
+        """Commit pending writes."""
+        with self._lock:
+            self._commit()
+
+    def _commit(self) -> None:
+        self._conn.commit()
+        self._uncommitted = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM lv_delta").fetchone()[0]
+
+    @property
+    def stats(self) -> dict:
+        """Leads answered from the index, and leads sent because they were new, changed or expired."""
+        return {"reused": self.reused, "new": self.new, "changed": self.changed, "expired": self.expired}
+
+    def close(self) -> None:
+        with self._lock:
+            self._commit()
+            self._conn.close()
+
+
+def validate_leads_v3_delta(leads: Iterable[Tuple[str, Mapping[str, str]]],
+                            license_key: str,
+                            index: DeltaIndex,
+                            max_age: float = 30 * 86400,
+                            is_live: bool = True,
+                            workers: int = 8,
+                            client: Optional[ValidateLeadV3Client] = None,
+                            max_pending: Optional[int] = None) -> Iterator[LVResponse]:
+    """
+    Validate the leads that are new, changed or stale, and answer the rest from index.
+
+    Results are yielded in input order. Fresh results are written to index; those
+    carrying an Error are not, so their leads are sent again on the next run. Leads
+    are read lazily and at most max_pending of them are held between being read and
+    being yielded, whether they are sent or answered from index.
+
+    Parameters:
+        leads: (lead_id, lead) pairs. lead_id must identify the lead across runs, e.g.
+               the CRM record ID; lead is keyed like the leads of validate_leads_v3.
+               A lead whose lead_id is None is not sent, and is answered with a local
+               error like a failed call of validate_leads_v3.
+        license_key: Your ServiceObjects license key.
+        index: DeltaIndex kept between runs.
+        max_age: Seconds after which a stored result is validated again even if the
+                 lead did not change.
+        is_live: Use live or trial servers.
+        workers: Number of concurrent calls.
+        client: Client to send the calls through, as for validate_leads_v3.
+        max_pending: Maximum number of leads read but not yet yielded.
+                     Defaults to four times the number of workers.
+
+    Yields:
+        LVResponse, stored or fresh, for every lead.
+    """
+    own_client = client is None
+    if own_client:
+        client = ValidateLeadV3Client(pool_size=workers)
+    if max_pending is None:
+        max_pending = workers * 4
+    response_class = getattr(client, "response_class", LVResponse)
+
+    def call(lead: Mapping[str, str]) -> LVResponse:
+        try:
+            return client.validate_params(build_params(lead, license_key), is_live)
+        except Exception as exc:
+            return _error_response(exc, response_class)
+
+    def settle(lead_id: Optional[str], fingerprint: Optional[str], future: Optional[Future]) -> LVResponse:
+        if future is None:
+            return index.response(lead_id)
+        response = future.result()
+        if lead_id is None:
+            return response
+        if response.Error is None:
+            index.put(lead_id, fingerprint, response)
+        return response
+
+    # One (lead_id, fingerprint, future) entry per lead not yet yielded, in input order;
+    # fingerprint and future are None when the lead is answered from the index, and lead_id
+    # when it has none. Stored responses are only loaded when their turn comes, so they cost
+    # no memory while queued.
+    order = deque()
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validate_leads_v3_delta")
+    try:
+        now = time.time()
+        for lead_id, lead in leads:
+            fingerprint = stored = None
+            if lead_id is not None:
+                fingerprint = lead_fingerprint(lead, is_live)
+                stored = index.lookup(lead_id)
+            if lead_id is None:
+                missing = Future()
+                missing.set_result(_error_response(ValueError("Lead has no ID"), response_class))
+                order.append((None, None, missing))
+            elif stored is not None and stored[0] == fingerprint and now - stored[1] <= max_age:
+                index.reused += 1
+                order.append((lead_id, None, None))
+            else:
+                if stored is None:
+                    index.new += 1
+                elif stored[0] != fingerprint:
+                    index.changed += 1
+                else:
+                    index.expired += 1
+                order.append((lead_id, fingerprint, pool.submit(call, lead)))
+            if len(order) >= max_pending:
+                yield settle(*order.popleft())
+        while order:
+            yield settle(*order.popleft())
+    finally:
+        # Drop queued calls if the caller stops iterating early
+        pool.shutdown(wait=True, cancel_futures=True)
+        index.flush()
+        if own_client:
+            client.close()
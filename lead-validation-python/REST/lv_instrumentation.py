@@ -0,0 +1,352 @@
+"""
+Instrumentation hooks for ValidateLead_V3 calls.
+
+Give ValidateLeadV3Client, AsyncValidateLeadV3Client or ValidateLeadV3Soap an
+observer and every call sent to the service is reported to it:
+
+    call_started(api, is_live)      before the first request of a call
+    request_finished(RequestEvent)  after every request to an endpoint, backup and hedges included
+    call_finished(CallEvent)        once the call has a result or has failed
+
+Subclass LVObserver and override the methods you need, fan out to several
+observers with ObserverGroup, or use HistogramObserver, which aggregates
+p50/p95/p99 latencies, phase timings, response sizes and fallback counts in
+process and can render them in the Prometheus text format. Without an
+observer the clients skip all of this; the only cost is an `is None` check.
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+import bisect
+import math
+import threading
+import time
+
+
+@dataclass
+class RequestEvent:
+    """One request to one endpoint."""
+    api: str
+    endpoint: str
+    duration: float
+    phases: Dict[str, float] = field(default_factory=dict)
+    response_bytes: int = 0
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class CallEvent:
+    """One validate call, from its first request to its result."""
+    api: str
+    is_live: bool
+    duration: float
+    endpoint: Optional[str] = None
+    fallback_reason: Optional[str] = None
+    error: Optional[str] = None
+    phases: Dict[str, float] = field(default_factory=dict)
+    requests: List[RequestEvent] = field(default_factory=list)
+
+    @property
+    def outcome(self) -> str:
+        return "error" if self.error else "ok"
+
+
+class LVObserver:
+    """Observer base class; every hook is a no-op."""
+
+    def call_started(self, api: str, is_live: bool) -> None:
+        pass
+
+    def request_finished(self, event: RequestEvent) -> None:
+        pass
+
+    def call_finished(self, event: CallEvent) -> None:
+        pass
+
+
+class ObserverGroup(LVObserver):
+    """Forwards every event to each of several observers."""
+
+    def __init__(self, *observers: LVObserver):
+        self.observers = observers
+
+    def call_started(self, api: str, is_live: bool) -> None:
+        for observer in self.observers:
+            observer.call_started(api, is_live)
+
+    def request_finished(self, event: RequestEvent) -> None:
+        for observer in self.observers:
+            observer.request_finished(event)
+
+    def call_finished(self, event: CallEvent) -> None:
+        for observer in self.observers:
+            observer.call_finished(event)
+
+
+class _CallTrace:
+    __slots__ = ("api", "is_live", "start", "requests", "fallback_reason", "phases")
+
+    def __init__(self, api: str, is_live: bool):
+        self.api = api
+        self.is_live = is_live
+        self.start = time.perf_counter()
+        self.requests = []
+        self.fallback_reason = None
+        self.phases = {}
+
+
+# The call in progress on this thread or task; requests and phases are attributed to it
+_current_call = ContextVar("lv_current_call", default=None)
+
+
+def begin_call(observer: LVObserver, api: str, is_live: bool):
+    """Start tracing a call. Pass the returned token to end_call."""
+    observer.call_started(api, is_live)
+    return _current_call.set(_CallTrace(api, is_live))
+
+
+def end_call(observer: LVObserver, token, error: Optional[BaseException] = None) -> None:
+    """Finish the call started by begin_call and report it."""
+    trace = _current_call.get()
+    _current_call.reset(token)
+    requests = list(trace.requests)
+    endpoint = next((request.endpoint for request in requests if request.error is None), None)
+    reason = trace.fallback_reason
+    if reason is None and requests and requests[0].error is not None:
+        # The first endpoint tried failed, so some other endpoint answered (or none did)
+        reason = requests[0].error
+    observer.call_finished(CallEvent(
+        api=trace.api,
+        is_live=trace.is_live,
+        duration=time.perf_counter() - trace.start,
+        endpoint=endpoint,
+        fallback_reason=reason,
+        error=type(error).__name__ if error is not None else None,
+        phases=trace.phases,
+        requests=requests,
+    ))
+
+
+def record_request(observer: LVObserver, event: RequestEvent) -> None:
+    """Report a finished request and attribute it to the call in progress."""
+    trace = _current_call.get()
+    if trace is not None:
+        trace.requests.append(event)
+    observer.request_finished(event)
+
+
+def note_fallback(reason: str) -> None:
+    """Record why the call in progress left the primary endpoint, unless a reason is already set."""
+    trace = _current_call.get()
+    if trace is not None and trace.fallback_reason is None:
+        trace.fallback_reason = reason
+
+
+def note_phase(phase: str, seconds: float) -> None:
+    """Add time spent in a client-side phase (e.g. building the response) to the call in progress."""
+    trace = _current_call.get()
+    if trace is not None:
+        trace.phases[phase] = trace.phases.get(phase, 0.0) + seconds
+
+
+class LatencyHistogram:
+    """
+    Thread-safe histogram of durations in seconds with log-spaced buckets.
+
+    Bucket bounds grow by 25% from 0.1 ms to about a minute, so percentiles are
+    accurate to within one bucket (about 12%) in memory independent of the sample count.
+    """
+
+    BOUNDS = tuple(0.0001 * 1.25 ** i for i in range(60))
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.BOUNDS, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Approximate value below which fraction of the observations fall."""
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, math.ceil(fraction * self.count))
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    if index == len(self.BOUNDS):
+                        return self.max
+                    # Geometric middle of the bucket, never above the largest observation
+                    low = self.BOUNDS[index - 1] if index else 0.0
+                    return min(self.max, math.sqrt(low * self.BOUNDS[index]) if low else self.BOUNDS[index])
+            return self.max
+
+    def summary(self) -> dict:
+        """Count, mean, p50, p95, p99 and max."""
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max if self.count else None,
+        }
+
+
+def _endpoint_label(endpoint: Optional[str]) -> str:
+    return (endpoint or "").split("?", 1)[0]
+
+
+class HistogramObserver(LVObserver):
+    """Aggregates call, request and phase latencies, response sizes, request errors and fallbacks in process."""
+
+    def __init__(self):
+        self.calls = {}
+        self.requests = {}
+        self.phases = {}
+        self.response_bytes = {}
+        self.fallbacks = {}
+        self.request_errors = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, table: dict, key: tuple) -> LatencyHistogram:
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def request_finished(self, event: RequestEvent) -> None:
+        endpoint = _endpoint_label(event.endpoint)
+        self._histogram(self.requests, (event.api, endpoint)).observe(event.duration)
+        for phase, seconds in event.phases.items():
+            self._histogram(self.phases, (event.api, phase)).observe(seconds)
+        with self._lock:
+            key = (event.api, endpoint)
+            self.response_bytes[key] = self.response_bytes.get(key, 0) + event.response_bytes
+            if event.error is not None:
+                error_key = (event.api, endpoint, event.error)
+                self.request_errors[error_key] = self.request_errors.get(error_key, 0) + 1
+
+    def call_finished(self, event: CallEvent) -> None:
+        self._histogram(self.calls, (event.api, event.outcome)).observe(event.duration)
+        for phase, seconds in event.phases.items():
+            self._histogram(self.phases, (event.api, phase)).observe(seconds)
+        if event.fallback_reason is not None:
+            with self._lock:
+                key = (event.api, event.fallback_reason)
+                self.fallbacks[key] = self.fallbacks.get(key, 0) + 1
+
+    def report(self) -> dict:
+        """Latency summaries, response byte totals, request error and fallback counts, keyed by "label/label"."""
+        with self._lock:
+            calls, requests, phases = dict(self.calls), dict(self.requests), dict(self.phases)
+            response_bytes, fallbacks = dict(self.response_bytes), dict(self.fallbacks)
+            request_errors = dict(self.request_errors)
+        return {
+            "calls": {"/".join(key): histogram.summary() for key, histogram in calls.items()},
+            "requests": {"/".join(key): histogram.summary() for key, histogram in requests.items()},
+            "phases": {"/".join(key): histogram.summary() for key, histogram in phases.items()},
+            "response_bytes": {"/".join(key): total for key, total in response_bytes.items()},
+            "fallbacks": {"/".join(key): count for key, count in fallbacks.items()},
+            "request_errors": {"/".join(key): count for key, count in request_errors.items()},
+        }
+
+    def to_prometheus(self, prefix: str = "lv") -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        with self._lock:
+            calls, requests, phases = dict(self.calls), dict(self.requests), dict(self.phases)
+            response_bytes, fallbacks = dict(self.response_bytes), dict(self.fallbacks)
+            request_errors = dict(self.request_errors)
+        lines = []
+        _prometheus_histograms(lines, f"{prefix}_call_duration_seconds",
+                               "ValidateLead_V3 call latency.", ("api", "outcome"), calls)
+        _prometheus_histograms(lines, f"{prefix}_request_duration_seconds",
+                               "Latency of single requests to an endpoint.", ("api", "endpoint"), requests)
+        _prometheus_histograms(lines, f"{prefix}_phase_duration_seconds",
+                               "Time spent per phase of a request or call.", ("api", "phase"), phases)
+        _prometheus_counters(lines, f"{prefix}_response_bytes_total",
+                             "Response body bytes received.", ("api", "endpoint"), response_bytes)
+        _prometheus_counters(lines, f"{prefix}_fallbacks_total",
+                             "Calls that left the primary endpoint, by reason.", ("api", "reason"), fallbacks)
+        _prometheus_counters(lines, f"{prefix}_request_errors_total",
+                             "Failed requests by error, e.g. connect_timeout or response_too_large.",
+                             ("api", "endpoint", "error"), request_errors)
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _prometheus_histograms(lines: list, name: str, help_text: str, label_names: tuple, histograms: dict) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for key, histogram in sorted(histograms.items()):
+        with histogram._lock:
+            counts, total, count = list(histogram.counts), histogram.sum, histogram.count
+        cumulative = 0
+        for index, bound in enumerate(LatencyHistogram.BOUNDS):
+            cumulative += counts[index]
+            # Every third bound (about x2 apart) keeps the exposition short
+            if index % 3 == 0:
+                le = 'le="%.6g"' % bound
+                lines.append(f"{name}_bucket{_labels(label_names, key, le)} {cumulative}")
+        le = 'le="+Inf"'
+        lines.append(f"{name}_bucket{_labels(label_names, key, le)} {count}")
+        lines.append(f"{name}_sum{_labels(label_names, key)} {total}")
+        lines.append(f"{name}_count{_labels(label_names, key)} {count}")
+
+
+def _prometheus_counters(lines: list, name: str, help_text: str, label_names: tuple, counters: dict) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for key, value in sorted(counters.items()):
+        lines.append(f"{name}{_labels(label_names, key)} {value}")
+
+
+def serve_prometheus(observer: HistogramObserver, port: int = 9108, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve observer.to_prometheus() on http://host:port/metrics from a daemon thread.
+
+    Binds to the loopback interface by default; pass host="0.0.0.0", or a specific
+    address, for a scraper on another machine to reach it.
+
+    Returns the server; call shutdown() on it to stop serving.
+    """
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = observer.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,342 @@
+"""
+Append-only on-disk journal of ValidateLead_V3 results.
+
+Every result is appended to the current segment file as one length-prefixed
+record: a small binary header, the lead key (e.g. lv_cache.cache_key of the
+request parameters, or a CRM record ID) and the response as compact JSON.
+Records are never changed in place, and every earlier result of a key stays on
+disk until compact() or clear() deletes the segments holding it; a journal that
+is never compacted doubles as an audit trail.
+
+An in-memory index maps each key to the segment and offset of its latest
+record. When a segment reaches segment_bytes it is sealed, its index is saved
+next to it and a new segment is started, so reopening a large journal only
+scans the last segment. Lookups read the record through a memory map of its
+segment and decode that one record, without loading the file. compact()
+rewrites the latest live record of every key into fresh segments and deletes
+the old ones.
+
+    journal = LVJournal("lv-journal")
+    journal.append(cache_key(params), response)
+    journal.get(cache_key(params))
+
+JournalCacheBackend puts a journal behind LVCache.
+"""
+from lv_response import LVResponse
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+
+# Record header: payload length, key length. A zero-length payload is a tombstone.
+_HEADER = struct.Struct("<IH")
+_SEGMENT_NAME = re.compile(r"^journal-(\d{6})\.lvj$")
+
+
+def _encode(value: Any, timestamp: float, expires_at: Optional[float]) -> bytes:
+    record = {"t": timestamp}
+    if expires_at is not None:
+        record["x"] = expires_at
+    if hasattr(value, "materialize"):
+        # LazyLVResponse
+        value = value.materialize()
+    if is_dataclass(value):
+        record["r"] = asdict(value)
+    else:
+        # Anything else JSON can hold, e.g. the plain dicts ValidateLeadV3Soap caches
+        record["p"] = value
+    return json.dumps(record, separators=(",", ":")).encode("utf-8")
+
+
+class _Segment:
+    def __init__(self, directory: str, number: int):
+        self.number = number
+        self.path = os.path.join(directory, f"journal-{number:06d}.lvj")
+        self.index_path = self.path[:-4] + ".idx"
+        self.size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        self._map = None
+
+    def view(self, end: int) -> mmap.mmap:
+        """Memory map of the segment covering at least its first end bytes."""
+        if self._map is None or len(self._map) < end:
+            self.close()
+            with open(self.path, "rb") as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class LVJournal:
+    """Append-only segmented journal of results, with indexed memory-mapped lookups. Thread-safe."""
+
+    def __init__(self,
+                 directory: str,
+                 segment_bytes: int = 64 * 2 ** 20,
+                 response_class=LVResponse,
+                 durable: bool = False):
+        """
+        Parameters:
+            directory: Directory holding the segment and index files. Created if missing.
+            segment_bytes: Size at which the current segment is sealed and a new one started.
+            response_class: Class whose from_dict rebuilds stored responses, e.g. CompactLVResponse.
+            durable: fsync after every append, so an append survives a power loss, not
+                     only a crash of the process.
+        """
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.response_class = response_class
+        self.durable = durable
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # key -> (segment number, record offset, payload offset, payload length)
+        self._index: Dict[str, Tuple[int, int, int, int]] = {}
+        # key -> segment number of its tombstone, for keys deleted since their last record
+        self._tombstones: Dict[str, int] = {}
+        self._segments: Dict[int, _Segment] = {}
+        self._active = None
+        self._handle = None
+        self._open()
+
+    def _open(self) -> None:
+        numbers = sorted(int(match.group(1)) for match in map(_SEGMENT_NAME.match, os.listdir(self.directory))
+                         if match)
+        for number in numbers:
+            segment = self._segments[number] = _Segment(self.directory, number)
+            if number != numbers[-1] and os.path.exists(segment.index_path):
+                self._load_index(segment)
+            else:
+                self._scan(segment)
+        self._start_segment(numbers[-1] if numbers else 1)
+
+    def _load_index(self, segment: _Segment) -> None:
+        with open(segment.index_path, encoding="utf-8") as handle:
+            entries = json.load(handle)
+        for key, (offset, payload_offset, length) in entries.items():
+            self._apply(key, (segment.number, offset, payload_offset, length))
+
+    def _scan(self, segment: _Segment) -> None:
+        """Index a segment by reading its record headers; drops a torn record at its end."""
+        offset = 0
+        with open(segment.path, "r+b") as handle:
+            data = handle.read()
+            while offset + _HEADER.size <= len(data):
+                length, key_length = _HEADER.unpack_from(data, offset)
+                payload_offset = offset + _HEADER.size + key_length
+                if payload_offset + length > len(data):
+                    break
+                key = data[offset + _HEADER.size:payload_offset].decode("utf-8")
+                self._apply(key, (segment.number, offset, payload_offset, length))
+                offset = payload_offset + length
+            if offset < len(data):
+                # Left by a crash in the middle of an append
+                handle.truncate(offset)
+        segment.size = offset
+
+    def _apply(self, key: str, location: Tuple[int, int, int, int]) -> None:
+        if location[3]:
+            self._index[key] = location
+            self._tombstones.pop(key, None)
+        else:
+            self._index.pop(key, None)
+            self._tombstones[key] = location[0]
+
+    def _start_segment(self, number: int) -> None:
+        segment = self._segments.get(number)
+        if segment is None:
+            segment = self._segments[number] = _Segment(self.directory, number)
+        self._active = segment
+        self._handle = open(segment.path, "ab")
+
+    def _seal(self) -> None:
+        """Close the active segment, save its index, and start the next one."""
+        segment = self._active
+        # A saved index is trusted on reopen, so the records it points at go to disk first
+        os.fsync(self._handle.fileno())
+        self._handle.close()
+        entries = {key: location[1:] for key, location in self._index.items() if location[0] == segment.number}
+        # Tombstones go into the index too, or reopening would revive records of older segments
+        entries.update((key, (0, 0, 0)) for key, number in self._tombstones.items() if number == segment.number)
+        tmp_path = segment.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(entries, handle, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, segment.index_path)
+        self._start_segment(segment.number + 1)
+
+    def _write(self, key: str, payload: bytes) -> None:
+        key_bytes = key.encode("utf-8")
+        record_size = _HEADER.size + len(key_bytes) + len(payload)
+        if self._active.size and self._active.size + record_size > self.segment_bytes:
+            self._seal()
+        segment = self._active
+        offset = segment.size
+        self._handle.write(_HEADER.pack(len(payload), len(key_bytes)) + key_bytes + payload)
+        self._handle.flush()
+        if self.durable:
+            os.fsync(self._handle.fileno())
+        segment.size += record_size
+        self._apply(key, (segment.number, offset, offset + _HEADER.size + len(key_bytes), len(payload)))
+
+    def append(self, key: str, value: Any, timestamp: Optional[float] = None,
+               expires_at: Optional[float] = None) -> None:
+        """
+        Append value as the latest result for key.
+
+        Parameters:
+            key: Lead key, e.g. lv_cache.cache_key(params) or a stable record ID.
+            value: LVResponse (or CompactLVResponse, LazyLVResponse), or any JSON-serializable value.
+            timestamp: When the result was obtained. Defaults to now.
+            expires_at: Optional time after which the record is dropped by compact().
+        """
+        payload = _encode(value, time.time() if timestamp is None else timestamp, expires_at)
+        with self._lock:
+            self._write(key, payload)
+
+    def delete(self, key: str) -> None:
+        """Append a tombstone hiding every earlier record of key."""
+        with self._lock:
+            if key in self._index:
+                self._write(key, b"")
+
+    def lookup(self, key: str) -> Optional[Tuple[float, Optional[float], Any]]:
+        """Return (timestamp, expires_at, value) of the latest record of key, or None."""
+        with self._lock:
+            location = self._index.get(key)
+            if location is None:
+                return None
+            number, _, payload_offset, length = location
+            view = self._segments[number].view(payload_offset + length)
+            payload = view[payload_offset:payload_offset + length]
+        record = json.loads(payload)
+        value = record["p"] if "p" in record else self.response_class.from_dict(record["r"])
+        return record["t"], record.get("x"), value
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the latest value stored for key, or None."""
+        entry = self.lookup(key)
+        return entry[2] if entry is not None else None
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def keys(self) -> Iterator[str]:
+        """Keys with a live record."""
+        with self._lock:
+            return iter(list(self._index))
+
+    def rotate(self) -> None:
+        """Seal the current segment now, e.g. before archiving it, unless it is empty."""
+        with self._lock:
+            if self._active.size:
+                self._seal()
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """
+        Rewrite the latest record of every key into fresh segments and delete the old ones.
+
+        Records whose expires_at has passed are dropped. Other records keep their bytes,
+        so the rewritten journal returns the same values.
+
+        Returns:
+            int: Number of bytes reclaimed.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._active.size:
+                self._seal()
+            old = [segment for number, segment in self._segments.items() if number != self._active.number]
+            before = sum(segment.size for segment in self._segments.values())
+            # In file order, so records keep their relative order
+            for key, (number, _, payload_offset, length) in sorted(self._index.items(), key=lambda item: item[1][:2]):
+                end = payload_offset + length
+                payload = self._segments[number].view(end)[payload_offset:end]
+                expires_at = json.loads(payload).get("x")
+                if expires_at is not None and expires_at <= now:
+                    del self._index[key]
+                    continue
+                self._write(key, payload)
+            for segment in old:
+                self._remove(segment)
+            # Nothing older is left for the tombstones to hide
+            self._tombstones = {key: number for key, number in self._tombstones.items() if number in self._segments}
+            return before - sum(segment.size for segment in self._segments.values())
+
+    def _remove(self, segment: _Segment) -> None:
+        segment.close()
+        del self._segments[segment.number]
+        os.remove(segment.path)
+        if os.path.exists(segment.index_path):
+            os.remove(segment.index_path)
+
+    def clear(self) -> None:
+        """Delete every segment and start an empty journal."""
+        with self._lock:
+            self._handle.close()
+            for segment in list(self._segments.values()):
+                self._remove(segment)
+            self._index.clear()
+            self._tombstones.clear()
+            self._start_segment(1)
+
+    @property
+    def stats(self) -> dict:
+        """Live keys, segment count and bytes on disk."""
+        with self._lock:
+            return {
+                "keys": len(self._index),
+                "segments": len(self._segments),
+                "bytes": sum(segment.size for segment in self._segments.values()),
+            }
+
+    def close(self) -> None:
+        """Close the active segment and every memory map."""
+        with self._lock:
+            self._handle.close()
+            for segment in self._segments.values():
+                segment.close()
+
+
+class JournalCacheBackend:
+    """LVCache storage in an LVJournal, so cached results are also kept for audit."""
+
+    def __init__(self, journal: LVJournal):
+        """
+        Parameters:
+            journal: Journal to store cache entries in, keyed by lv_cache.cache_key.
+        """
+        self.journal = journal
+
+    def get(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self.journal.lookup(key)
+        if entry is None:
+            return None
+        # Records appended without an expiry, e.g. by the journal's own users, never expire
+        expires_at = entry[1] if entry[1] is not None else float("inf")
+        return expires_at, entry[2]
+
+    def set(self, key: str, expires_at: float, value: Any) -> None:
+        self.journal.append(key, value, expires_at=expires_at)
+
+    def delete(self, key: str) -> None:
+        self.journal.delete(key)
+
+    def clear(self) -> None:
+        self.journal.clear()
+
+    def close(self) -> None:
+        self.journal.close()
@@ -0,0 +1,120 @@
+"""
+Decoding of ValidateLead_V3 JSON bodies with the fastest library installed.
+
+loads() turns a response body into a dict using orjson or msgspec when either
+is installed, and the standard library json module otherwise; the dicts are
+the same whichever library decoded them. decode_response() goes one step
+further with msgspec, decoding straight into the LVResponse dataclasses without
+the intermediate dict. Either way the result equals
+LVResponse.from_dict(json.loads(body)).
+
+    pip install orjson     # or: pip install msgspec
+"""
+from dataclasses import fields, make_dataclass
+from typing import Dict, List, Optional
+import json
+
+from lv_response import LVResponse, InformationComponent, PhoneContact, Error, _section_from_dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Name of the library loads() uses: "orjson", "msgspec" or "json"
+BACKEND = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
+
+if orjson is not None:
+    _decode = orjson.loads
+elif msgspec is not None:
+    _decode = msgspec.json.Decoder().decode
+else:
+    _decode = json.loads
+# msgspec's DecodeError is not a ValueError, unlike those of json and orjson
+_WRAP_ERRORS = BACKEND == "msgspec"
+
+_PHONE_CONTACT_FIELDS = tuple(f.name for f in fields(PhoneContact))
+_ERROR_FIELDS = tuple(f.name for f in fields(Error))
+_LV_FIELDS = tuple(f.name for f in fields(LVResponse))
+
+
+def loads(body: bytes) -> dict:
+    """
+    Decode a UTF-8 JSON response body.
+
+    Raises:
+        ValueError: If body is not valid JSON, whichever library is in use.
+    """
+    if _WRAP_ERRORS:
+        try:
+            return _decode(body)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+    return _decode(body)
+
+
+if msgspec is not None:
+    # LVResponse with PhoneContact and Error left as dicts, so that they go through
+    # the same empty-section handling as LVResponse.from_dict
+    _LVWire = make_dataclass(
+        "_LVWire",
+        [
+            (f.name,
+             Optional[Dict[str, Optional[str]]] if f.name in ("PhoneContact", "Error")
+             else Optional[List[InformationComponent]] if f.name == "InformationComponents"
+             else f.type,
+             None)
+            for f in fields(LVResponse)
+        ],
+    )
+    _wire_decoder = msgspec.json.Decoder(_LVWire)
+
+
+def _decode_typed(body: bytes) -> LVResponse:
+    attrs = _wire_decoder.decode(body).__dict__
+    # msgspec leaves absent fields to the class defaults; from_dict stores None for them
+    if len(attrs) != len(_LV_FIELDS):
+        for name in _LV_FIELDS:
+            attrs.setdefault(name, None)
+    response = object.__new__(LVResponse)
+    response.__dict__ = attrs
+    attrs["PhoneContact"] = _section_from_dict(PhoneContact, _PHONE_CONTACT_FIELDS, attrs["PhoneContact"])
+    attrs["Error"] = _section_from_dict(Error, _ERROR_FIELDS, attrs["Error"])
+    components = attrs["InformationComponents"]
+    if components is None:
+        attrs["InformationComponents"] = []
+    else:
+        for component in components:
+            if len(component.__dict__) != 2:
+                component.__dict__.setdefault("Name", None)
+                component.__dict__.setdefault("Value", None)
+    return response
+
+
+def decode_response(body: bytes, response_class=LVResponse):
+    """
+    Decode a ValidateLead_V3 JSON body straight into response_class.
+
+    Uses msgspec's typed decoding for LVResponse when msgspec is installed, and
+    response_class.from_dict(loads(body)) otherwise or when the body does not match
+    the expected types (e.g. a number where a string is expected).
+
+    Raises:
+        ValueError: If body is not valid JSON, or is JSON but not an object.
+    """
+    if msgspec is not None and response_class is LVResponse:
+        try:
+            return _decode_typed(body)
+        except msgspec.ValidationError:
+            pass
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+    data = loads(body)
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+    return response_class.from_dict(data)
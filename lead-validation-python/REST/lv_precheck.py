@@ -0,0 +1,187 @@
+"""
+Local pre-validation of leads before they are sent to ValidateLead_V3.
+
+LeadPrecheck runs cheap syntactic checks (compiled regular expressions, no
+network) on the email, phone, postal code and IP address of a lead. A lead
+with a value that cannot possibly be valid is either answered locally with an
+LVResponse carrying an Error, saving the call, or sent with the bad values
+blanked out, so they do not drag down the scores of the rest of the lead.
+
+The checks are deliberately permissive: a value is only failed when it is
+certainly malformed, never because it is unusual. Postal codes, and the NANP
+format of national phone numbers, are checked for US and CA leads only; a phone
+number without a country only has to have an E.164 length. Values with non-ASCII
+characters (internationalized email addresses) are let through for the service
+to judge.
+
+Pass a LeadPrecheck to ValidateLeadV3Client or AsyncValidateLeadV3Client
+through their precheck argument.
+"""
+from typing import Iterable, Optional, Tuple
+import re
+import threading
+
+REJECT = "reject"
+STRIP = "strip"
+
+_EMAIL = re.compile(
+    r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+)*"
+    r"@(?:[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\.)+(?:[A-Za-z]{2,63}|xn--[A-Za-z0-9-]{1,59})"
+)
+# Separators people type in phone numbers, and a trailing extension
+_PHONE_NOISE = re.compile(r"[\s().\-/]+")
+_PHONE_EXTENSION = re.compile(r"(?:x|ext\.?|extension|#)\d{1,6}$", re.IGNORECASE)
+_E164 = re.compile(r"\+[1-9]\d{6,14}")
+_NANP = re.compile(r"(?:\+?1)?[2-9]\d{2}[2-9]\d{6}")
+_NATIONAL = re.compile(r"\d{7,15}")
+_US_POSTAL = re.compile(r"\d{5}(?:-?\d{4})?")
+_CA_POSTAL = re.compile(r"[ABCEGHJ-NPRSTVXY]\d[ABCEGHJ-NPRSTV-Z] ?\d[ABCEGHJ-NPRSTV-Z]\d", re.IGNORECASE)
+_IPV4 = re.compile(r"(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)")
+
+_US = frozenset(("us", "usa", "united states", "united states of america", "840"))
+_CA = frozenset(("ca", "can", "canada", "124"))
+
+# ValidateLead_V3 parameter checked by each rule
+RULES = {
+    "email": ("Email",),
+    "phone": ("Phone1", "Phone2"),
+    "postal_code": ("PostalCode",),
+    "ip_address": ("IPAddress",),
+}
+
+
+def _text(value) -> str:
+    """A parameter as stripped text; build_params passes lead values through, so JSON numbers arrive as int."""
+    return "" if value is None else str(value).strip()
+
+
+def _valid_email(value: str, country: str = "") -> bool:
+    if not value.isascii():
+        return True
+    return len(value) <= 254 and len(value.rpartition("@")[0]) <= 64 and _EMAIL.fullmatch(value) is not None
+
+
+def _valid_phone(value: str, country: str = "") -> bool:
+    number = _PHONE_EXTENSION.sub("", _PHONE_NOISE.sub("", value))
+    if number.startswith("+"):
+        return _E164.fullmatch(number) is not None and (not number.startswith("+1") or
+                                                         _NANP.fullmatch(number) is not None)
+    country = country.strip().lower()
+    if country in _US or country in _CA:
+        return _NANP.fullmatch(number) is not None
+    # Without a country the number may be from anywhere: only E.164's length limits apply
+    return _NATIONAL.fullmatch(number) is not None
+
+
+def _valid_postal_code(value: str, country: str = "") -> bool:
+    country = country.strip().lower()
+    if country in _US:
+        return _US_POSTAL.fullmatch(value) is not None
+    if country in _CA:
+        return _CA_POSTAL.fullmatch(value) is not None
+    # Formats of other countries vary too much to tell garbage from an unusual code
+    return True
+
+
+def _valid_ip_address(value: str, country: str = "") -> bool:
+    return _IPV4.fullmatch(value) is not None
+
+
+_CHECKS = {
+    "email": _valid_email,
+    "phone": _valid_phone,
+    "postal_code": _valid_postal_code,
+    "ip_address": _valid_ip_address,
+}
+
+
+class LeadPrecheck:
+    """Thread-safe local checks of lead fields, with per-rule counters."""
+
+    def __init__(self,
+                 mode: str = REJECT,
+                 rules: Iterable[str] = tuple(RULES),
+                 required: Iterable[str] = ()):
+        """
+        Parameters:
+            mode: "reject" to answer a lead with an invalid value locally, with an LVResponse
+                  whose Error has TypeCode "2" (user input), instead of calling the service;
+                  "strip" to blank the invalid values and validate the rest of the lead.
+            rules: Which of "email", "phone", "postal_code" and "ip_address" to check.
+            required: ValidateLead_V3 parameters (e.g. "Email") that must not be empty.
+                      A lead missing one is rejected in either mode.
+
+        Raises:
+            ValueError: If mode or a rule name is unknown.
+        """
+        if mode not in (REJECT, STRIP):
+            raise ValueError(f"Unknown precheck mode: {mode!r}")
+        rules = tuple(rules)
+        unknown = [rule for rule in rules if rule not in RULES]
+        if unknown:
+            raise ValueError(f"Unknown precheck rules: {unknown}")
+        self.mode = mode
+        self.rules = rules
+        self.required = tuple(required)
+        self._checks = [(rule, name, _CHECKS[rule]) for rule in rules for name in RULES[rule]]
+        self.checked = 0
+        self.rejected = 0
+        self.stripped = 0
+        self.failures = dict.fromkeys(rules + ("required",), 0)
+        self._lock = threading.Lock()
+
+    def apply(self, params: dict) -> Tuple[dict, Optional[dict]]:
+        """
+        Check the ValidateLead_V3 query parameters of one lead.
+
+        Parameters:
+            params: Query parameters as produced by build_params.
+
+        Returns:
+            tuple: (params, rejection). params is the dict to send, a copy without the
+                   invalid values in strip mode. rejection is None when the lead should be
+                   sent, else a response payload for response_class.from_dict.
+        """
+        country = _text(params.get("Country"))
+        failed = []
+        for rule, name, check in self._checks:
+            value = _text(params.get(name))
+            if value and not check(value, country):
+                failed.append((rule, name))
+        missing = [name for name in self.required if not _text(params.get(name))]
+
+        with self._lock:
+            self.checked += 1
+            for rule, _ in failed:
+                self.failures[rule] += 1
+            if missing:
+                self.failures["required"] += 1
+            if missing or (failed and self.mode == REJECT):
+                self.rejected += 1
+            elif failed:
+                self.stripped += 1
+
+        if missing or (failed and self.mode == REJECT):
+            problems = [f"invalid {name}" for _, name in failed] + [f"missing {name}" for name in missing]
+            return params, {"Error": {
+                "Type": "User Input",
+                "TypeCode": "2",
+                "Desc": "Rejected by local pre-validation: " + ", ".join(problems),
+                "DescCode": None,
+            }}
+        if failed:
+            params = dict(params)
+            for _, name in failed:
+                params[name] = ""
+        return params, None
+
+    @property
+    def stats(self) -> dict:
+        """Leads checked, rejected (API calls saved) and stripped, and failures per rule."""
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "rejected": self.rejected,
+                "stripped": self.stripped,
+                "failures": dict(self.failures),
+            }
@@ -0,0 +1,283 @@
+"""
+Client-side rate limiting and adaptive concurrency for ValidateLead_V3 calls.
+
+LicenseRateLimiter keeps a token bucket per license key, so every call made
+with that key, from any thread (and, with a directory, from any process on the
+machine), stays under the license's per-second quota instead of bursting into
+the service's throttling.
+
+AdaptiveConcurrency and AsyncAdaptiveConcurrency cap how many leads are in
+flight at once and tune that cap AIMD-style: the limit grows by about one per
+round of successful calls and is halved when calls fail or exceed a latency
+target.
+
+Pass them to ValidateLeadV3Client, AsyncValidateLeadV3Client or
+ValidateLeadV3Soap through their rate_limiter and concurrency arguments.
+"""
+from typing import Callable, Optional
+import asyncio
+import hashlib
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class TokenBucket:
+    """Thread-safe in-process token bucket."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Parameters:
+            rate: Tokens (calls) added per second.
+            burst: Bucket capacity, i.e. how many calls may go out back to back. Defaults to rate.
+            clock: Time source, replaceable in tests.
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens from the bucket and return how many seconds to wait before using them."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block until tokens may be used."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+
+class FileTokenBucket:
+    """
+    Token bucket whose state lives in a small file, shared by every process that opens it.
+
+    Each reservation takes an exclusive lock on the file, so it costs a few
+    system calls; use TokenBucket when a single process makes all the calls.
+    """
+
+    _STATE = struct.Struct("<dd")
+
+    def __init__(self, path: str, rate: float, burst: Optional[float] = None):
+        """
+        Parameters:
+            path: State file. Created if it does not exist.
+            rate: Tokens (calls) added per second.
+            burst: Bucket capacity. Defaults to rate.
+        """
+        self.path = path
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take tokens from the bucket and return how many seconds to wait before using them."""
+        with self._lock:
+            self._lock_file()
+            try:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                raw = os.read(self._fd, self._STATE.size)
+                # Wall-clock time, since monotonic clocks are not comparable between processes
+                now = time.time()
+                if len(raw) == self._STATE.size:
+                    available, updated = self._STATE.unpack(raw)
+                    available = min(self.burst, available + max(0.0, now - updated) * self.rate)
+                else:
+                    available = self.burst
+                available -= tokens
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                os.write(self._fd, self._STATE.pack(available, now))
+            finally:
+                self._unlock_file()
+        return -available / self.rate if available < 0 else 0.0
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block until tokens may be used."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    def _lock_file(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(self) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class LicenseRateLimiter:
+    """One token bucket per license key, created on first use."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, directory: Optional[str] = None):
+        """
+        Parameters:
+            rate: Calls per second allowed for each license key.
+            burst: Calls that may go out back to back. Defaults to rate.
+            directory: When set, bucket state is kept in files in this directory and shared
+                       with every process using the same directory.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.directory = directory
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, license_key: str):
+        """Return the bucket for license_key."""
+        bucket = self._buckets.get(license_key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(license_key)
+                if bucket is None:
+                    if self.directory:
+                        # File names are hashed so license keys never end up on disk
+                        name = hashlib.sha256((license_key or "").encode("utf-8")).hexdigest()[:32]
+                        path = os.path.join(self.directory, f"lv-{name}.bucket")
+                        bucket = FileTokenBucket(path, self.rate, self.burst)
+                    else:
+                        bucket = TokenBucket(self.rate, self.burst)
+                    self._buckets[license_key] = bucket
+        return bucket
+
+    def reserve(self, license_key: str) -> float:
+        """Reserve one call for license_key and return how many seconds to wait before making it."""
+        return self.bucket(license_key).reserve()
+
+    def acquire(self, license_key: str) -> None:
+        """Block until a call may be made with license_key."""
+        self.bucket(license_key).acquire()
+
+    def close(self) -> None:
+        """Close any bucket state files."""
+        with self._lock:
+            for bucket in self._buckets.values():
+                if isinstance(bucket, FileTokenBucket):
+                    bucket.close()
+            self._buckets.clear()
+
+
+class _AIMD:
+    def __init__(self,
+                 initial: int = 8,
+                 min_limit: int = 1,
+                 max_limit: int = 64,
+                 latency_target: Optional[float] = None,
+                 backoff: float = 0.5,
+                 cooldown: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Parameters:
+            initial: Starting concurrency limit.
+            min_limit: The limit never drops below this.
+            max_limit: The limit never grows above this.
+            latency_target: Seconds; slower calls count as overload like failures do.
+            backoff: Factor the limit is multiplied by on overload.
+            cooldown: Seconds after a decrease during which further overload is ignored,
+                      so one burst of failures halves the limit once rather than many times.
+            clock: Monotonic time source, replaceable in tests.
+        """
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.decreases = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+
+    def _adjust(self, latency: float, ok: bool) -> None:
+        if not ok or (self.latency_target is not None and latency > self.latency_target):
+            now = self._clock()
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = now
+                self.decreases += 1
+        else:
+            # About +1 once every `limit` successful calls
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def _has_room(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    @property
+    def stats(self) -> dict:
+        """Current limit, calls in flight and number of decreases so far."""
+        return {"limit": int(self.limit), "in_flight": self.in_flight, "decreases": self.decreases}
+
+
+class AdaptiveConcurrency(_AIMD):
+    """AIMD concurrency limit shared by threads. Takes the arguments documented on _AIMD."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until a call may start."""
+        with self._condition:
+            while not self._has_room():
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency: float, ok: bool) -> None:
+        """Report a finished call and let waiting calls start."""
+        with self._condition:
+            self.in_flight -= 1
+            self._adjust(latency, ok)
+            self._condition.notify_all()
+
+
+class AsyncAdaptiveConcurrency(_AIMD):
+    """AIMD concurrency limit shared by tasks of one event loop. Takes the arguments documented on _AIMD."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._condition = None
+
+    async def acquire(self) -> None:
+        """Wait until a call may start."""
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(self._has_room)
+            self.in_flight += 1
+
+    async def release(self, latency: float, ok: bool) -> None:
+        """Report a finished call and let waiting calls start."""
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            self._adjust(latency, ok)
+            condition.notify_all()
+
+    def _get_condition(self) -> asyncio.Condition:
+        # asyncio primitives must be created inside the running event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
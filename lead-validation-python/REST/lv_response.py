@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Optional, List
 
 
@@ -104,6 +104,27 @@ class LVResponse:
         if self.InformationComponents is None:
             self.InformationComponents = []
 
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LVResponse':
+        """
+        Build an LVResponse from a decoded ValidateLead_V3 JSON payload in a single pass.
+
+        Driven by the dataclass field tables below, so every field is read exactly once
+        and keys the dataclasses do not know about are ignored.
+        """
+        get = data.get
+        response = object.__new__(cls)
+        attrs = response.__dict__
+        for name in _LV_SCALAR_FIELDS:
+            attrs[name] = get(name)
+        attrs["PhoneContact"] = _section_from_dict(PhoneContact, _PHONE_CONTACT_FIELDS, get("PhoneContact"))
+        attrs["InformationComponents"] = [
+            InformationComponent(component.get("Name"), component.get("Value"))
+            for component in get("InformationComponents") or ()
+        ]
+        attrs["Error"] = _section_from_dict(Error, _ERROR_FIELDS, get("Error"))
+        return response
+
     def __str__(self) -> str:
         info_components_string = ', '.join(str(component) for component in self.InformationComponents) if self.InformationComponents else 'None'
         phone_contact = str(self.PhoneContact) if self.PhoneContact else 'None'
@@ -124,3 +145,20 @@ class LVResponse:
                 f"Phone2Certainty={self.Phone2Certainty}, Phone2Quality={self.Phone2Quality}, Phone2Locality={self.Phone2Locality}, "
                 f"Phone2AdminArea={self.Phone2AdminArea}, Phone2Country={self.Phone2Country}, Phone2NoteCodes={self.Phone2NoteCodes}, Phone2NoteDesc={self.Phone2NoteDesc}, "
                 f"PhoneContact={phone_contact}, InformationComponents=[{info_components_string}], Error={error}")
+
+
+# Field tables used by LVResponse.from_dict, derived from the dataclasses above
+_NESTED_FIELDS = ("PhoneContact", "InformationComponents", "Error")
+_LV_SCALAR_FIELDS = tuple(f.name for f in fields(LVResponse) if f.name not in _NESTED_FIELDS)
+_PHONE_CONTACT_FIELDS = tuple(f.name for f in fields(PhoneContact))
+_ERROR_FIELDS = tuple(f.name for f in fields(Error))
+
+
+def _section_from_dict(cls, names: tuple, data: Optional[dict]):
+    if not data:
+        return None
+    section = object.__new__(cls)
+    attrs = section.__dict__
+    for name in names:
+        attrs[name] = data.get(name)
+    return section
@@ -0,0 +1,100 @@
+"""
+Memory-lean variants of the LVResponse model for holding large batches of results.
+
+The classes have the same attribute names and __str__ output as LVResponse,
+PhoneContact and InformationComponent, but use __slots__ instead of a per-instance
+__dict__, and the low-cardinality strings (countries, quality and certainty
+scores, note codes and descriptions) are interned so a million responses share
+one copy of "US" or "Good" instead of holding a million.
+
+Pass response_class=CompactLVResponse to ValidateLeadV3Client or
+AsyncValidateLeadV3Client to receive these directly. Requires Python 3.10+.
+"""
+from lv_response import LVResponse, PhoneContact, InformationComponent, Error
+from dataclasses import fields, make_dataclass
+import sys
+
+
+def _slotted(cls, name: str):
+    """Slotted copy of dataclass cls with the same fields, defaults and __str__."""
+    return make_dataclass(
+        name,
+        [(f.name, f.type, f.default) for f in fields(cls)],
+        namespace={"__str__": cls.__str__, "__doc__": f"Slotted {cls.__name__}.", "__module__": __name__},
+        slots=True,
+    )
+
+
+CompactInformationComponent = _slotted(InformationComponent, "CompactInformationComponent")
+CompactPhoneContact = _slotted(PhoneContact, "CompactPhoneContact")
+
+# Values drawn from a small fixed set, worth sharing between responses
+_INTERNED_SUFFIXES = ("Certainty", "Quality", "NoteCodes", "NoteDesc", "Country", "AdminArea")
+_INTERNED_FIELDS = frozenset(
+    [f.name for f in fields(LVResponse) if f.name.endswith(_INTERNED_SUFFIXES)]
+    + ["LeadType", "EmailCorrected"]
+)
+_NESTED_FIELDS = ("PhoneContact", "InformationComponents", "Error")
+_SCALAR_PLAN = tuple(
+    (f.name, f.name in _INTERNED_FIELDS) for f in fields(LVResponse) if f.name not in _NESTED_FIELDS
+)
+_PHONE_CONTACT_FIELDS = tuple(f.name for f in fields(PhoneContact))
+
+
+def _intern(value):
+    return sys.intern(value) if value.__class__ is str else value
+
+
+def _from_dict(cls, data: dict):
+    """Build a CompactLVResponse from a decoded ValidateLead_V3 JSON payload."""
+    get = data.get
+    response = object.__new__(cls)
+    for name, interned in _SCALAR_PLAN:
+        value = get(name)
+        setattr(response, name, _intern(value) if interned else value)
+
+    contact = get("PhoneContact")
+    if contact:
+        contact = CompactPhoneContact(*(contact.get(name) for name in _PHONE_CONTACT_FIELDS))
+        contact.State = _intern(contact.State)
+        contact.Type = _intern(contact.Type)
+    response.PhoneContact = contact or None
+
+    response.InformationComponents = [
+        CompactInformationComponent(_intern(component.get("Name")), component.get("Value"))
+        for component in get("InformationComponents") or ()
+    ]
+    error = get("Error")
+    response.Error = Error(**{f.name: error.get(f.name) for f in fields(Error)}) if error else None
+    return response
+
+
+def _from_response(cls, response: LVResponse):
+    """Convert an eager LVResponse into a CompactLVResponse."""
+    data = {name: getattr(response, name) for name, _ in _SCALAR_PLAN}
+    if response.PhoneContact:
+        data["PhoneContact"] = vars(response.PhoneContact)
+    data["InformationComponents"] = [vars(component) for component in response.InformationComponents]
+    compact = cls.from_dict(data)
+    compact.Error = response.Error
+    return compact
+
+
+def _post_init(self):
+    if self.InformationComponents is None:
+        self.InformationComponents = []
+
+
+CompactLVResponse = make_dataclass(
+    "CompactLVResponse",
+    [(f.name, f.type, f.default) for f in fields(LVResponse)],
+    namespace={
+        "__doc__": "Slotted LVResponse with interned low-cardinality values.",
+        "__module__": __name__,
+        "__str__": LVResponse.__str__,
+        "__post_init__": _post_init,
+        "from_dict": classmethod(_from_dict),
+        "from_response": classmethod(_from_response),
+    },
+    slots=True,
+)
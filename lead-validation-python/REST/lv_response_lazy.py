@@ -0,0 +1,137 @@
+"""
+Lazy view of a ValidateLead_V3 response for callers that read only a few fields.
+
+LazyLVResponse has the same attribute names and __str__ output as LVResponse,
+but building one only keeps the decoded dict (or the raw JSON body). A section
+of fields (the overall scores, name, address, email, IP, phone 1, phone 2, the
+PhoneContact, the InformationComponents and the Error) is read out of it the
+first time one of its attributes is accessed, and is a plain attribute from
+then on. A caller reading only OverallCertainty, OverallQuality and LeadType
+never builds the other fifty fields or the nested objects.
+
+Pass response_class=LazyLVResponse to ValidateLeadV3Client or
+AsyncValidateLeadV3Client to receive these directly.
+"""
+from lv_json import loads
+from lv_response import LVResponse, PhoneContact, InformationComponent, Error, _section_from_dict
+from dataclasses import fields
+from typing import Optional, Union
+
+_NESTED_FIELDS = ("PhoneContact", "InformationComponents", "Error")
+_SCALAR_FIELDS = tuple(f.name for f in fields(LVResponse) if f.name not in _NESTED_FIELDS)
+_PHONE_CONTACT_FIELDS = tuple(f.name for f in fields(PhoneContact))
+_ERROR_FIELDS = tuple(f.name for f in fields(Error))
+
+# Scalar sections by field name prefix; fields matching none belong to "overall"
+_SECTION_PREFIXES = (
+    ("name", ("Name", "FirstName", "LastName")),
+    ("address", ("Address",)),
+    ("email", ("Email",)),
+    ("ip", ("IP",)),
+    ("phone1", ("Phone1",)),
+    ("phone2", ("Phone2",)),
+)
+
+
+def _section_of(name: str) -> str:
+    for section, prefixes in _SECTION_PREFIXES:
+        if name.startswith(prefixes):
+            return section
+    return "overall"
+
+
+_SECTIONS = {}
+for _name in _SCALAR_FIELDS:
+    _SECTIONS.setdefault(_section_of(_name), []).append(_name)
+_SECTIONS = {section: tuple(names) for section, names in _SECTIONS.items()}
+
+# Field name -> names of every field materialized along with it
+_SECTION_FIELDS = {name: names for names in _SECTIONS.values() for name in names}
+for _name in _NESTED_FIELDS:
+    _SECTION_FIELDS[_name] = (_name,)
+
+
+def _build_nested(name: str, data: dict):
+    value = data.get(name)
+    if name == "PhoneContact":
+        return _section_from_dict(PhoneContact, _PHONE_CONTACT_FIELDS, value)
+    if name == "Error":
+        return _section_from_dict(Error, _ERROR_FIELDS, value)
+    return [InformationComponent(component.get("Name"), component.get("Value")) for component in value or ()]
+
+
+class _LazyField:
+    """
+    Non-data descriptor materializing a field's whole section into the instance __dict__,
+    which then shadows the descriptor, so later reads are plain attribute lookups.
+    """
+
+    __slots__ = ("name", "section")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.section = _SECTION_FIELDS[name]
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        attrs = instance.__dict__
+        data = attrs["_data"]
+        if data is None:
+            data = attrs["_data"] = loads(attrs.pop("_body"))
+        name = self.name
+        if name in _NESTED_FIELDS:
+            value = attrs[name] = _build_nested(name, data)
+            return value
+        get = data.get
+        for field in self.section:
+            # Keeps fields of the section the caller has already assigned
+            if field not in attrs:
+                attrs[field] = get(field)
+        return attrs[name]
+
+
+class LazyLVResponse:
+    """LVResponse whose sections are built on first access from the decoded payload."""
+
+    def __init__(self, data: Optional[dict] = None):
+        """
+        Parameters:
+            data: Decoded ValidateLead_V3 payload. Use from_bytes for a raw JSON body.
+        """
+        self._data = data if data is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LazyLVResponse":
+        """Wrap a decoded ValidateLead_V3 JSON payload; nothing is read from it yet."""
+        response = object.__new__(cls)
+        response._data = data
+        return response
+
+    @classmethod
+    def from_bytes(cls, body: Union[bytes, str]) -> "LazyLVResponse":
+        """Wrap a raw ValidateLead_V3 JSON body; it is decoded on first attribute access."""
+        response = object.__new__(cls)
+        response._body = body
+        response._data = None
+        return response
+
+    def materialize(self) -> LVResponse:
+        """Return an eager LVResponse with every field of this one."""
+        return LVResponse(**{f.name: getattr(self, f.name) for f in fields(LVResponse)})
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (LazyLVResponse, LVResponse)):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(LVResponse))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data if self._data is not None else self._body!r})"
+
+    __str__ = LVResponse.__str__
+
+
+for _name in _SECTION_FIELDS:
+    setattr(LazyLVResponse, _name, _LazyField(_name))
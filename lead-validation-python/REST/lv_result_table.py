@@ -0,0 +1,313 @@
+"""
+Columnar container for batches of ValidateLead_V3 results.
+
+LVResultTable stores every LVResponse field as its own column instead of as
+one Python object per lead: the *Certainty scores as int16 arrays and every
+text field dictionary-encoded (int32 codes plus one copy of each distinct
+value), which suits the heavily repeated LeadType, *Quality and *NoteCodes
+values. Filters run over whole columns with NumPy and return boolean masks
+that combine with & and |; rows are only turned back into LVResponse objects
+when asked for.
+
+Export to Arrow, Parquet or Arrow IPC hands the column buffers to pyarrow
+without copying them. pyarrow is only needed for export (pip install pyarrow).
+NumPy is an optional dependency of the samples as a whole, but this module
+needs it (pip install numpy).
+"""
+from lv_response import LVResponse, PhoneContact, Error
+from array import array
+from dataclasses import fields
+from typing import Iterable, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError as exc:
+    raise ImportError("lv_result_table requires numpy (pip install numpy)") from exc
+
+_NESTED_FIELDS = ("PhoneContact", "InformationComponents", "Error")
+_SCALAR_FIELDS = tuple(f.name for f in fields(LVResponse) if f.name not in _NESTED_FIELDS)
+NUMERIC_COLUMNS = tuple(name for name in _SCALAR_FIELDS if name.endswith("Certainty"))
+_PHONE_CONTACT_FIELDS = tuple(f.name for f in fields(PhoneContact))
+_ERROR_FIELDS = tuple(f.name for f in fields(Error))
+_NESTED_TEXT_COLUMNS = (
+    tuple(f"PhoneContact.{name}" for name in _PHONE_CONTACT_FIELDS)
+    + tuple(f"Error.{name}" for name in _ERROR_FIELDS)
+)
+TEXT_COLUMNS = tuple(name for name in _SCALAR_FIELDS if name not in NUMERIC_COLUMNS) + _NESTED_TEXT_COLUMNS
+
+# Stored for missing or non-numeric certainty scores
+MISSING_SCORE = -1
+
+
+class _DictionaryColumn:
+    """Append-only dictionary-encoded text column. Code 0 is reserved for None."""
+
+    __slots__ = ("codes", "values", "index")
+
+    def __init__(self):
+        self.codes = array("i")
+        self.values = [None]
+        self.index = {None: 0}
+
+    def append(self, value: Optional[str]) -> None:
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def view(self) -> np.ndarray:
+        return np.frombuffer(self.codes, dtype=np.int32) if len(self.codes) else np.empty(0, dtype=np.int32)
+
+
+def _score(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return MISSING_SCORE
+
+
+class LVResultTable:
+    """
+    Column-per-field store of LVResponse results.
+
+    Build it with append/extend (or from_responses), filter with the column
+    predicates, then read rows back or export the columns.
+
+        table = LVResultTable.from_responses(validate_leads_v3(leads, license_key))
+        mask = table.ge("OverallCertainty", 80) & table.eq("EmailQuality", "Good")
+        table.to_parquet("good_leads.parquet", mask)
+    """
+
+    def __init__(self):
+        self._numeric = {name: array("h") for name in NUMERIC_COLUMNS}
+        self._text = {name: _DictionaryColumn() for name in TEXT_COLUMNS}
+        # InformationComponents are a list per row: offsets into two flat child columns
+        self._component_offsets = array("i", [0])
+        self._component_names = _DictionaryColumn()
+        self._component_values = _DictionaryColumn()
+        self._length = 0
+
+    @classmethod
+    def from_responses(cls, responses: Iterable[LVResponse]) -> "LVResultTable":
+        """Build a table from any iterable of LVResponse (or CompactLVResponse) objects."""
+        table = cls()
+        table.extend(responses)
+        return table
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, response: LVResponse) -> None:
+        """Append one response as a new row."""
+        for name, column in self._numeric.items():
+            column.append(_score(getattr(response, name)))
+        text = self._text
+        for name in _SCALAR_FIELDS:
+            if name not in self._numeric:
+                text[name].append(getattr(response, name))
+        contact = response.PhoneContact
+        for name in _PHONE_CONTACT_FIELDS:
+            text[f"PhoneContact.{name}"].append(getattr(contact, name) if contact else None)
+        error = response.Error
+        for name in _ERROR_FIELDS:
+            text[f"Error.{name}"].append(getattr(error, name) if error else None)
+        for component in response.InformationComponents or ():
+            self._component_names.append(component.Name)
+            self._component_values.append(component.Value)
+        self._component_offsets.append(len(self._component_names.codes))
+        self._length += 1
+
+    def extend(self, responses: Iterable[LVResponse]) -> None:
+        """Append every response from an iterable."""
+        for response in responses:
+            self.append(response)
+
+    @property
+    def columns(self) -> tuple:
+        """Names of the scalar columns, in LVResponse order followed by the nested sections."""
+        return _SCALAR_FIELDS + _NESTED_TEXT_COLUMNS
+
+    def scores(self, name: str) -> np.ndarray:
+        """Zero-copy int16 view of a *Certainty column; missing scores are MISSING_SCORE."""
+        column = self._numeric[name]
+        return np.frombuffer(column, dtype=np.int16) if len(column) else np.empty(0, dtype=np.int16)
+
+    def codes(self, name: str) -> np.ndarray:
+        """Zero-copy int32 view of a text column's dictionary codes."""
+        return self._text[name].view()
+
+    def dictionary(self, name: str) -> list:
+        """Distinct values of a text column, indexed by code. Index 0 is None."""
+        return self._text[name].values
+
+    def value_counts(self, name: str) -> dict:
+        """Number of rows holding each distinct value of a text column."""
+        column = self._text[name]
+        counts = np.bincount(column.view(), minlength=len(column.values))
+        return {value: int(count) for value, count in zip(column.values, counts) if count}
+
+    # Column predicates; each returns a boolean mask with one entry per row
+
+    def eq(self, name: str, value: Optional[str]) -> np.ndarray:
+        if name in self._numeric:
+            return self.scores(name) == _score(value)
+        code = self._text[name].index.get(value)
+        if code is None:
+            return np.zeros(self._length, dtype=bool)
+        return self.codes(name) == code
+
+    def ne(self, name: str, value: Optional[str]) -> np.ndarray:
+        return ~self.eq(name, value)
+
+    def isin(self, name: str, values: Iterable[Optional[str]]) -> np.ndarray:
+        if name in self._numeric:
+            return np.isin(self.scores(name), [_score(value) for value in values])
+        index = self._text[name].index
+        wanted = [index[value] for value in values if value in index]
+        return np.isin(self.codes(name), wanted)
+
+    def ge(self, name: str, score: int) -> np.ndarray:
+        return self.scores(name) >= score
+
+    def gt(self, name: str, score: int) -> np.ndarray:
+        return self.scores(name) > score
+
+    def le(self, name: str, score: int) -> np.ndarray:
+        scores = self.scores(name)
+        return (scores <= score) & (scores != MISSING_SCORE)
+
+    def lt(self, name: str, score: int) -> np.ndarray:
+        scores = self.scores(name)
+        return (scores < score) & (scores != MISSING_SCORE)
+
+    def contains_code(self, name: str, code: str) -> np.ndarray:
+        """Rows whose comma-separated *NoteCodes column includes code."""
+        column = self._text[name]
+        matching = [i for i, value in enumerate(column.values) if value and code in value.split(",")]
+        return np.isin(column.view(), matching)
+
+    # Reading rows back
+
+    def count(self, mask: Optional[np.ndarray] = None) -> int:
+        return self._length if mask is None else int(np.count_nonzero(mask))
+
+    def indices(self, mask: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(mask)
+
+    def row(self, index: int) -> LVResponse:
+        """Materialize one row as an LVResponse."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("LVResultTable index out of range")
+        data = {}
+        for name in _SCALAR_FIELDS:
+            if name in self._numeric:
+                score = self._numeric[name][index]
+                data[name] = None if score == MISSING_SCORE else str(score)
+            else:
+                column = self._text[name]
+                data[name] = column.values[column.codes[index]]
+        contact = {name: self._text_value(f"PhoneContact.{name}", index) for name in _PHONE_CONTACT_FIELDS}
+        data["PhoneContact"] = contact if any(value is not None for value in contact.values()) else None
+        error = {name: self._text_value(f"Error.{name}", index) for name in _ERROR_FIELDS}
+        data["Error"] = error if any(value is not None for value in error.values()) else None
+        start, end = self._component_offsets[index], self._component_offsets[index + 1]
+        names, values = self._component_names, self._component_values
+        data["InformationComponents"] = [
+            {"Name": names.values[names.codes[i]], "Value": values.values[values.codes[i]]}
+            for i in range(start, end)
+        ]
+        return LVResponse.from_dict(data)
+
+    def _text_value(self, name: str, index: int) -> Optional[str]:
+        column = self._text[name]
+        return column.values[column.codes[index]]
+
+    def rows(self, mask: Optional[np.ndarray] = None) -> Iterator[LVResponse]:
+        """Lazily materialize the rows selected by mask (all rows when omitted)."""
+        selected = range(self._length) if mask is None else np.flatnonzero(mask)
+        for index in selected:
+            yield self.row(int(index))
+
+    def take(self, mask: np.ndarray) -> "LVResultTable":
+        """New table holding only the rows selected by mask. Dictionaries are copied, not re-encoded."""
+        selected = np.flatnonzero(mask)
+        table = LVResultTable()
+        for name in NUMERIC_COLUMNS:
+            table._numeric[name] = array("h", self.scores(name)[selected].tobytes())
+        for name in TEXT_COLUMNS:
+            source, target = self._text[name], table._text[name]
+            target.codes = array("i", source.view()[selected].tobytes())
+            target.values = list(source.values)
+            target.index = dict(source.index)
+        offsets = np.frombuffer(self._component_offsets, dtype=np.int32)
+        starts, ends = offsets[selected], offsets[selected + 1]
+        child = np.concatenate([np.arange(s, e, dtype=np.int32) for s, e in zip(starts, ends)]) \
+            if len(selected) else np.empty(0, dtype=np.int32)
+        table._component_offsets = array("i", np.concatenate(([0], np.cumsum(ends - starts))).astype(np.int32).tobytes())
+        for source, target in ((self._component_names, table._component_names),
+                               (self._component_values, table._component_values)):
+            target.codes = array("i", source.view()[child].tobytes())
+            target.values = list(source.values)
+            target.index = dict(source.index)
+        table._length = len(selected)
+        return table
+
+    # Export
+
+    def to_arrow(self, mask: Optional[np.ndarray] = None):
+        """
+        Export as a pyarrow.Table. Text columns become dictionary arrays over the
+        existing code buffers and scores become nullable int16 arrays.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as exc:
+            raise ImportError("LVResultTable export requires pyarrow (pip install pyarrow)") from exc
+
+        source = self.take(mask) if mask is not None else self
+        length = source._length
+
+        def dictionary_array(column: _DictionaryColumn):
+            # Code 0 (None) becomes a null slot; the codes buffer itself is passed through as is
+            present = column.view() != 0
+            validity = pa.py_buffer(np.packbits(present, bitorder="little"))
+            codes = pa.Array.from_buffers(pa.int32(), len(column.codes), [validity, pa.py_buffer(column.codes)],
+                                          null_count=len(column.codes) - int(np.count_nonzero(present)))
+            return pa.DictionaryArray.from_arrays(codes, pa.array([""] + column.values[1:], pa.string()))
+
+        arrays, names = [], []
+        for name in _SCALAR_FIELDS:
+            if name in source._numeric:
+                scores = source.scores(name)
+                arrays.append(pa.array(scores, pa.int16(), mask=scores == MISSING_SCORE))
+            else:
+                arrays.append(dictionary_array(source._text[name]))
+            names.append(name)
+        for name in _NESTED_TEXT_COLUMNS:
+            arrays.append(dictionary_array(source._text[name]))
+            names.append(name)
+
+        offsets = pa.py_buffer(source._component_offsets)
+        components = pa.StructArray.from_arrays(
+            [dictionary_array(source._component_names), dictionary_array(source._component_values)],
+            ["Name", "Value"],
+        )
+        arrays.append(pa.ListArray.from_arrays(
+            pa.Array.from_buffers(pa.int32(), length + 1, [None, offsets]), components))
+        names.append("InformationComponents")
+        return pa.Table.from_arrays(arrays, names=names)
+
+    def to_parquet(self, path: str, mask: Optional[np.ndarray] = None, **kwargs) -> None:
+        """Write the (optionally filtered) table to a Parquet file."""
+        import pyarrow.parquet as pq
+        pq.write_table(self.to_arrow(mask), path, **kwargs)
+
+    def to_ipc(self, path: str, mask: Optional[np.ndarray] = None) -> None:
+        """Write the (optionally filtered) table to an Arrow IPC file."""
+        import pyarrow as pa
+        table = self.to_arrow(mask)
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
@@ -0,0 +1,188 @@
+"""
+Retry policy and call deadlines for ValidateLead_V3 calls.
+
+By default the clients try the primary once and then the backup once, each with
+the client's full timeout, so one call can take twice the timeout. Give a
+client a RetryPolicy and its calls instead:
+
+- alternate between the primary and the backup (the trial endpoint is simply retried),
+- retry only retryable failures: transport errors (connection errors, timeouts,
+  unreadable replies), HTTP statuses in retry_statuses (429 and 5xx by default)
+  and replies whose Error.TypeCode is "3",
+- wait an exponentially growing, jittered delay before every retry,
+- with a deadline, answer or fail within it, backoff and rate-limit waits included.
+  Each attempt's timeout is the time left split evenly over the attempts left,
+  so a hung primary still leaves the backup time to answer.
+
+    client = ValidateLeadV3Client(retry_policy=RetryPolicy(attempts=3, deadline=1.5))
+
+call_deadline() sets a deadline for every call made inside it, e.g. the time
+left of the web request being served. Calls made with a retry policy use the
+earlier of it and the policy's own deadline, and raise DeadlineExceeded when
+it passes. The same policy object can be shared by REST and SOAP clients.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Collection, Iterator, Optional
+import random
+import time
+
+# Statuses worth another attempt: throttling and server-side failures
+RETRY_STATUSES = frozenset([429] + list(range(500, 600)))
+
+# Absolute time.monotonic() deadline of the calls made in the current context, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("lv_call_deadline", default=None)
+
+
+class DeadlineExceeded(RuntimeError):
+    """The call's deadline passed before it had an answer."""
+
+
+@contextmanager
+def call_deadline(seconds: float) -> Iterator[None]:
+    """
+    Give every call made inside the block, through a client with a retry policy,
+    at most seconds from now to finish. Nested blocks can only shorten the deadline.
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+class RetryPolicy:
+    """Which failures a call retries, how long it waits in between, and how long it may take in total."""
+
+    def __init__(self,
+                 attempts: int = 2,
+                 deadline: Optional[float] = None,
+                 backoff: float = 0.05,
+                 max_backoff: float = 1.0,
+                 multiplier: float = 2.0,
+                 jitter: bool = True,
+                 retry_statuses: Collection[int] = RETRY_STATUSES,
+                 retry_transport_errors: bool = True,
+                 retry_service_errors: bool = True,
+                 min_attempt_timeout: float = 0.05,
+                 rand: Callable[[], float] = random.random):
+        """
+        Parameters:
+            attempts: Most requests per call, the first one included.
+            deadline: Seconds a call may take in total, or None for no limit beyond the attempt timeouts.
+            backoff: Delay before the first retry, in seconds.
+            max_backoff: The delay never grows beyond this.
+            multiplier: Factor the delay grows by with every retry.
+            jitter: Wait a random time between zero and the delay ("full jitter"), so
+                    clients that failed together do not retry together.
+            retry_statuses: HTTP statuses that are retried. Other HTTP errors fail the call at once.
+            retry_transport_errors: Retry connection errors, timeouts and unreadable replies.
+            retry_service_errors: Retry replies whose Error.TypeCode is "3" (service not available).
+            min_attempt_timeout: Seconds below which an attempt is not worth starting; with less
+                                 time left the call fails with DeadlineExceeded.
+            rand: Source of uniform numbers in [0, 1), replaceable in tests.
+        """
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        self.attempts = attempts
+        self.deadline = deadline
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_transport_errors = retry_transport_errors
+        self.retry_service_errors = retry_service_errors
+        self.min_attempt_timeout = min_attempt_timeout
+        self._rand = rand
+
+    def retryable(self, kind: str, status: Optional[int] = None) -> bool:
+        """
+        Whether a failed attempt may be retried.
+
+        Parameters:
+            kind: "transport", "http" (with status) or "service" (Error.TypeCode "3" or no result).
+            status: HTTP status of an "http" failure.
+        """
+        if kind == "http":
+            return status in self.retry_statuses
+        if kind == "service":
+            return self.retry_service_errors
+        return self.retry_transport_errors
+
+    def delay(self, retry: int) -> float:
+        """Seconds to wait before the given retry, 1 for the first."""
+        delay = min(self.max_backoff, self.backoff * self.multiplier ** (retry - 1))
+        return delay * self._rand() if self.jitter else delay
+
+    def begin(self) -> "RetryBudget":
+        """Start a call: its attempt count and deadline."""
+        deadline = _deadline.get()
+        if self.deadline is not None:
+            own = time.monotonic() + self.deadline
+            deadline = own if deadline is None else min(deadline, own)
+        return RetryBudget(self, deadline)
+
+
+class RetryBudget:
+    """Attempts made and time left of one call under a RetryPolicy."""
+
+    def __init__(self, policy: RetryPolicy, deadline: Optional[float]):
+        self.policy = policy
+        self.deadline = deadline
+        self.attempts = 0
+        self.last_error = None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None without one."""
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def attempt_timeout(self, timeout: float) -> float:
+        """
+        Start an attempt and return its timeout: the client's timeout, capped at an
+        even share of the time left for the attempts left.
+
+        Raises:
+            DeadlineExceeded: If too little time is left to start it.
+        """
+        self.attempts += 1
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if remaining < self.policy.min_attempt_timeout:
+            raise DeadlineExceeded(f"LeadValidation call deadline passed after {self.attempts - 1} attempts") \
+                from self.last_error
+        share = remaining / (self.policy.attempts - self.attempts + 1)
+        return min(timeout, remaining, max(share, self.policy.min_attempt_timeout))
+
+    def failed(self, error: BaseException, kind: str, status: Optional[int] = None) -> float:
+        """
+        Record a failed attempt. Returns the seconds to wait before the next one, or
+        raises the call's final error, chained to error.
+
+        Parameters:
+            error: What went wrong.
+            kind: "transport", "http" or "service", see RetryPolicy.retryable.
+            status: HTTP status of an "http" failure.
+
+        Raises:
+            RuntimeError: If the failure is not retryable or no attempts are left.
+            DeadlineExceeded: If the deadline leaves no time for another attempt.
+        """
+        if isinstance(error, DeadlineExceeded):
+            # Raised by attempt_timeout, caught by a client catching every exception
+            raise error
+        self.last_error = error
+        if not self.policy.retryable(kind, status):
+            raise RuntimeError(f"LeadValidation call failed: {error}") from error
+        remaining = self.remaining()
+        out_of_time = remaining is not None and remaining < self.policy.min_attempt_timeout
+        if self.attempts >= self.policy.attempts and not out_of_time:
+            raise RuntimeError(f"LeadValidation call failed after {self.attempts} attempts: {error}") from error
+        delay = 0.0 if out_of_time else self.policy.delay(self.attempts)
+        if remaining is not None and remaining - delay < self.policy.min_attempt_timeout:
+            raise DeadlineExceeded(f"LeadValidation call deadline passed after {self.attempts} attempts: {error}") \
+                from error
+        return delay
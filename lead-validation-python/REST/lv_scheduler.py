@@ -0,0 +1,225 @@
+"""
+Priority scheduling of ValidateLead_V3 calls that share a license and connections.
+
+PriorityScheduler lets at most `slots` calls run at once and queues the rest
+per priority class. Whenever a slot frees up it goes to the class picked by
+weighted fair queueing, so while several classes have calls waiting each gets
+slots in proportion to its weight; within a class calls run in arrival order.
+A class can also reserve slots that no other class may take, so real-time form
+validations find a slot free however many bulk leads are queued, and can be
+capped so it never holds more than `limit` slots.
+
+    scheduler = PriorityScheduler(slots=16, classes={
+        "interactive": PriorityClass(weight=8, reserved=4),
+        "batch": PriorityClass(weight=1, limit=12),
+    })
+    client = ValidateLeadV3Client(pool_size=16, scheduler=scheduler, priority="interactive")
+    client.validate_params(params, priority="batch")
+
+stats reports per class the calls queued and in flight and how long calls
+waited for a slot. AsyncPriorityScheduler does the same for the tasks of one
+event loop, in front of AsyncValidateLeadV3Client.
+"""
+from lv_instrumentation import LatencyHistogram
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+import asyncio
+import threading
+import time
+
+
+@dataclass(frozen=True)
+class PriorityClass:
+    """Scheduling settings of one priority class."""
+    # Share of the slots while other classes also have calls waiting
+    weight: float = 1.0
+    # Slots kept free for this class even when other classes are waiting
+    reserved: int = 0
+    # Most slots this class may hold at once; None for no cap beyond the scheduler's
+    limit: Optional[int] = None
+
+
+class _ClassState:
+    def __init__(self, settings: PriorityClass):
+        self.settings = settings
+        self.queue = deque()
+        self.in_flight = 0
+        self.dispatched = 0
+        # Virtual time at which the class's next call starts; lowest goes first
+        self.tag = 0.0
+        self.wait = LatencyHistogram()
+
+
+class _WFQ:
+    def __init__(self,
+                 slots: int,
+                 classes: Optional[Dict[str, PriorityClass]] = None,
+                 default: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Parameters:
+            slots: Most calls in flight at once, over all classes. Keep it at or below the
+                   client's pool_size so admitted calls never queue for a connection.
+            classes: Priority classes by name. Defaults to "interactive" (weight 4, a quarter
+                     of the slots reserved) and "batch" (weight 1).
+            default: Class of calls made without a priority. Defaults to the first class.
+            clock: Monotonic time source, replaceable in tests.
+
+        Raises:
+            ValueError: If the classes reserve more slots than there are.
+        """
+        if classes is None:
+            classes = {
+                "interactive": PriorityClass(weight=4, reserved=slots // 4),
+                "batch": PriorityClass(weight=1),
+            }
+        if sum(settings.reserved for settings in classes.values()) > slots:
+            raise ValueError(f"Priority classes reserve more than the {slots} slots available.")
+        self.slots = slots
+        self.default = default if default is not None else next(iter(classes))
+        self._classes = {name: _ClassState(settings) for name, settings in classes.items()}
+        self._clock = clock
+        self._in_flight = 0
+        self._virtual_time = 0.0
+        self._class(self.default)
+
+    def _class(self, priority: Optional[str]) -> _ClassState:
+        state = self._classes.get(self.default if priority is None else priority)
+        if state is None:
+            raise ValueError(f"Unknown priority class {priority!r}.")
+        return state
+
+    def _has_room(self, state: _ClassState) -> bool:
+        settings = state.settings
+        if self._in_flight >= self.slots or (settings.limit is not None and state.in_flight >= settings.limit):
+            return False
+        if state.in_flight < settings.reserved:
+            return True
+        # Slots reserved, and not in use, by the other classes are off limits
+        held = sum(max(0, other.settings.reserved - other.in_flight)
+                   for other in self._classes.values() if other is not state)
+        return self._in_flight + held < self.slots
+
+    def _enqueue(self, state: _ClassState, waiter) -> None:
+        if not state.queue:
+            # A class that was idle does not bank credit for the time it had nothing queued
+            state.tag = max(state.tag, self._virtual_time)
+        state.queue.append(waiter)
+
+    def _admit(self, state: _ClassState) -> None:
+        start = max(state.tag, self._virtual_time)
+        self._virtual_time = start
+        state.tag = start + 1.0 / state.settings.weight
+        state.in_flight += 1
+        state.dispatched += 1
+        self._in_flight += 1
+
+    def _next(self) -> Optional[_ClassState]:
+        """The class whose oldest waiting call gets the next slot, or None if none can start."""
+        chosen = None
+        for state in self._classes.values():
+            if state.queue and (chosen is None or state.tag < chosen.tag) and self._has_room(state):
+                chosen = state
+        return chosen
+
+    def _finish(self, priority: Optional[str]) -> None:
+        state = self._class(priority)
+        state.in_flight -= 1
+        self._in_flight -= 1
+
+    def _stats(self) -> dict:
+        return {
+            "slots": self.slots,
+            "in_flight": self._in_flight,
+            "classes": {
+                name: {
+                    "queued": len(state.queue),
+                    "in_flight": state.in_flight,
+                    "dispatched": state.dispatched,
+                    "wait": state.wait.summary(),
+                }
+                for name, state in self._classes.items()
+            },
+        }
+
+
+class PriorityScheduler(_WFQ):
+    """Weighted fair scheduler of calls made from many threads. Takes the arguments documented on _WFQ."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def acquire(self, priority: Optional[str] = None) -> None:
+        """Block until a call of class priority may start."""
+        state = self._class(priority)
+        start = self._clock()
+        with self._lock:
+            if not state.queue and self._has_room(state):
+                self._admit(state)
+                state.wait.observe(0.0)
+                return
+            waiter = threading.Event()
+            self._enqueue(state, waiter)
+        waiter.wait()
+        state.wait.observe(self._clock() - start)
+
+    def release(self, priority: Optional[str] = None) -> None:
+        """Report a finished call of class priority and hand its slot on."""
+        with self._lock:
+            self._finish(priority)
+            state = self._next()
+            while state is not None:
+                state.queue.popleft().set()
+                self._admit(state)
+                state = self._next()
+
+    @property
+    def stats(self) -> dict:
+        """Slots, calls in flight, and per class calls queued, in flight, dispatched and wait times in seconds."""
+        with self._lock:
+            return self._stats()
+
+
+class AsyncPriorityScheduler(_WFQ):
+    """Weighted fair scheduler of calls made by tasks of one event loop. Takes the arguments documented on _WFQ."""
+
+    async def acquire(self, priority: Optional[str] = None) -> None:
+        """Wait until a call of class priority may start."""
+        state = self._class(priority)
+        if not state.queue and self._has_room(state):
+            self._admit(state)
+            state.wait.observe(0.0)
+            return
+        start = self._clock()
+        waiter = asyncio.get_running_loop().create_future()
+        self._enqueue(state, waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                if waiter in state.queue:
+                    state.queue.remove(waiter)
+            else:
+                # Admitted just before the cancellation arrived
+                self.release(priority)
+            raise
+        state.wait.observe(self._clock() - start)
+
+    def release(self, priority: Optional[str] = None) -> None:
+        """Report a finished call of class priority and hand its slot on. Not a coroutine, so safe in finally blocks."""
+        self._finish(priority)
+        state = self._next()
+        while state is not None:
+            waiter = state.queue.popleft()
+            # A cancelled waiter has not run its cleanup yet; skip it
+            if not waiter.cancelled():
+                waiter.set_result(None)
+                self._admit(state)
+            state = self._next()
+
+    @property
+    def stats(self) -> dict:
+        """Slots, calls in flight, and per class calls queued, in flight, dispatched and wait times in seconds."""
+        return self._stats()
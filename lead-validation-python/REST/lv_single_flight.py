@@ -0,0 +1,130 @@
+"""
+Request coalescing ("single-flight") for concurrent duplicate leads.
+
+When the same lead arrives several times within milliseconds, from different
+form handlers say, each arrival would make its own ValidateLead_V3 call.
+With a SingleFlight (threads) or AsyncSingleFlight (asyncio), the first call
+for a lead goes out and every identical call made while it is in flight waits
+for it and receives the same response, or the same exception. Nothing is kept
+once the call finishes; use LVCache for that.
+
+Leads are matched on the normalized parameters used by LVCache (see
+lv_cache.cache_key), so LicenseKey does not split them, plus live or trial.
+
+Pass one to ValidateLeadV3Client or ValidateLeadV3Soap (SingleFlight), or to
+AsyncValidateLeadV3Client (AsyncSingleFlight), through their single_flight argument.
+"""
+from typing import Any, Awaitable, Callable
+import asyncio
+import threading
+
+from lv_cache import cache_key
+
+
+def _flight_key(params: dict, is_live: bool) -> str:
+    return cache_key(params) + (":live" if is_live else ":trial")
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical calls made concurrently from several threads."""
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, params: dict, call: Callable[[], Any], is_live: bool = True) -> Any:
+        """
+        Return call(), unless an identical call is already in flight; then wait for it
+        and return its result, or raise its exception.
+
+        Parameters:
+            params: Query parameters identifying the lead.
+            call: Makes the call for params.
+            is_live: Whether call goes to the live or the trial service.
+        """
+        key = _flight_key(params, is_live)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = call()
+            return flight.result
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    @property
+    def stats(self) -> dict:
+        """Calls made, calls answered by another in-flight call, and calls in flight now."""
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._flights)}
+
+
+class AsyncSingleFlight:
+    """Coalesces identical calls made concurrently from tasks of one event loop."""
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+
+    async def do(self, params: dict, call: Callable[[], Awaitable[Any]], is_live: bool = True) -> Any:
+        """
+        Await call(), unless an identical call is already in flight; then await that one.
+
+        The call runs as a task of its own, so cancelling any one caller, the first
+        included, does not cancel it for the others.
+
+        Parameters:
+            params: Query parameters identifying the lead.
+            call: Coroutine function making the call for params.
+            is_live: Whether call goes to the live or the trial service.
+        """
+        key = _flight_key(params, is_live)
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._flights[key] = task
+            task.add_done_callback(lambda finished: self._finished(key, finished))
+            self.calls += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Future) -> None:
+        self._flights.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved, in case every caller was cancelled meanwhile
+            task.exception()
+
+    @property
+    def stats(self) -> dict:
+        """Calls made, calls answered by another in-flight call, and calls in flight now."""
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._flights)}
@@ -0,0 +1,216 @@
+"""
+Per-phase timeouts and a response size cap for ValidateLead_V3 requests.
+
+With one scalar timeout a stalled TLS connect waits as long as a slow server,
+and nothing stops a misbehaving proxy from sending a huge body that is then
+buffered in full. The REST and SOAP clients therefore take, next to their
+total timeout:
+
+    connect_timeout     seconds to open the connection, TLS handshake included
+    read_timeout        seconds to wait for the reply to start, and between its chunks
+    max_response_bytes  largest reply body accepted
+
+The total timeout covers the whole request. A Deadline started before
+connecting shortens the wait for the headers, and each read of the body, to
+the time left, so no single read can block past it. The body is read as a
+stream. Once it is larger than max_response_bytes, or the request is past its
+total timeout, it is abandoned with ResponseTooLarge or TotalTimeout. Bodies
+are read one socket read at a time (see read1_chunks), so a server trickling
+its reply cannot hold a single read open past the deadline. Each
+client raises these as its own transport errors, chained to the originals, so
+fallback and retries treat them like any other transport failure.
+
+timeout_phase(exc) names the phase a timeout happened in ("connect", "read"
+or "total"), following exception chains, so it works on the RuntimeError a
+call finally raises too. error_label(exc) is the short form observers receive
+in RequestEvent.error, e.g. "connect_timeout" or "response_too_large".
+"""
+from typing import Iterable, Iterator, Optional
+import functools
+import time
+import requests
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+
+# Exception class names, checked most specific first, and the phase they stand for
+_TIMEOUT_PHASES = {
+    "TotalTimeout": "total",
+    "ConnectTimeout": "connect",          # requests
+    "ConnectTimeoutError": "connect",     # urllib3
+    "ConnectionTimeoutError": "connect",  # aiohttp
+    "ReadTimeout": "read",                # requests
+    "ReadTimeoutError": "read",           # urllib3
+    "SocketTimeoutError": "read",         # aiohttp
+    "ServerTimeoutError": "read",         # aiohttp before 3.10, connect and read
+}
+
+
+class ResponseTooLarge(Exception):
+    """A reply body was larger than the client's max_response_bytes."""
+
+    def __init__(self, limit: int, size: Optional[int] = None):
+        self.limit = limit
+        self.size = size
+        detail = f"{size} bytes" if size is not None else "more"
+        super().__init__(f"Response body of {detail} is over the {limit} byte limit")
+
+
+class TotalTimeout(TimeoutError):
+    """A request was still receiving its reply when its total timeout passed."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        super().__init__(f"Total timeout of {timeout:g} s passed before the response was read")
+
+
+class Deadline:
+    """
+    The total timeout of one request, enforced on the socket it is read from.
+
+    Start it before connecting. clamp() sets the socket's timeout for the next
+    read to read_timeout, or to the time left when that is shorter, so a read
+    cannot block past the deadline. A timeout raised once the deadline has passed
+    is the total timeout's, which is_total() tells.
+    """
+
+    def __init__(self, timeout: float, read_timeout: Optional[float] = None):
+        """
+        Parameters:
+            timeout: Total seconds the request may take.
+            read_timeout: Seconds a single read may wait. Defaults to, and is capped at, timeout.
+        """
+        self.timeout = timeout
+        self.read_timeout = min(read_timeout or timeout, timeout)
+        self.at = time.monotonic() + timeout
+        # The socket being read from, once the client has one
+        self.sock = None
+
+    def left(self) -> float:
+        """Seconds until the deadline, negative once it has passed."""
+        return self.at - time.monotonic()
+
+    def clamp(self) -> None:
+        # The reply may already have closed a socket whose body it read in full
+        if self.sock is not None and self.sock.fileno() != -1:
+            # Never zero: that would make the socket non-blocking instead of timing out
+            self.sock.settimeout(max(min(self.read_timeout, self.left()), 0.001))
+
+    def is_total(self, exc: BaseException) -> bool:
+        """Whether exc is a timeout that happened because the deadline passed."""
+        return self.left() <= 0 and timeout_phase(exc) is not None
+
+    def chunks(self, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """
+        Pass a body's chunks through, clamping the socket before each read.
+
+        Raises:
+            TotalTimeout: If a read times out because the deadline passed.
+        """
+        while True:
+            self.clamp()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            except Exception as exc:
+                if self.is_total(exc):
+                    raise TotalTimeout(self.timeout) from exc
+                raise
+            yield chunk
+
+
+def read1_chunks(response: requests.Response, chunk_bytes: int) -> Iterator[bytes]:
+    """
+    Yield the body of a response opened with stream=True as it arrives, one socket read at a time.
+
+    iter_content() fills each chunk before yielding it, reading the socket as often as that
+    takes, so a body trickling in holds one chunk, and the read Deadline.chunks() clamped
+    before it, open for as long as the server likes. Errors are raised as iter_content()
+    raises them. urllib3 before 2 has no read1(); the body is then read with iter_content().
+    """
+    raw = response.raw
+    if not hasattr(raw, "read1"):
+        yield from response.iter_content(chunk_bytes)
+        return
+    try:
+        yield from iter(functools.partial(raw.read1, chunk_bytes, decode_content=True), b"")
+    except ProtocolError as exc:
+        raise requests.exceptions.ChunkedEncodingError(exc) from exc
+    except DecodeError as exc:
+        raise requests.exceptions.ContentDecodingError(exc) from exc
+    except ReadTimeoutError as exc:
+        raise requests.exceptions.ConnectionError(exc) from exc
+    except SSLError as exc:
+        raise requests.exceptions.SSLError(exc) from exc
+
+
+def check_length(content_length: Optional[str], max_bytes: Optional[int]) -> None:
+    """Reject a reply up front when its Content-Length is already over max_bytes."""
+    if max_bytes is not None and content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise ResponseTooLarge(max_bytes, int(content_length))
+
+
+def limit_chunks(chunks: Iterable[bytes],
+                 max_bytes: Optional[int] = None,
+                 deadline: Optional[float] = None,
+                 timeout: Optional[float] = None) -> Iterator[bytes]:
+    """
+    Pass a stream of body chunks through, stopping once they exceed max_bytes or time.monotonic() passes deadline.
+
+    Parameters:
+        chunks: Body chunks as they arrive.
+        max_bytes: Largest body accepted, or None for no limit.
+        deadline: time.monotonic() value by which the body must be complete, or None.
+        timeout: The total timeout behind deadline, for the error message.
+
+    Raises:
+        ResponseTooLarge: If the body is larger than max_bytes.
+        TotalTimeout: If the deadline passes before the body is complete.
+    """
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            raise ResponseTooLarge(max_bytes)
+        if deadline is not None and time.monotonic() > deadline:
+            raise TotalTimeout(timeout)
+        yield chunk
+
+
+def read_limited(chunks: Iterable[bytes],
+                 max_bytes: Optional[int] = None,
+                 deadline: Optional[float] = None,
+                 timeout: Optional[float] = None) -> bytes:
+    """Join a stream of body chunks under the limits of limit_chunks, which raises as documented there."""
+    return b"".join(limit_chunks(chunks, max_bytes, deadline, timeout))
+
+
+def timeout_phase(exc: Optional[BaseException]) -> Optional[str]:
+    """The phase, "connect", "read" or "total", of the timeout behind exc, or None if it is not one."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        for cls in type(exc).__mro__:
+            phase = _TIMEOUT_PHASES.get(cls.__name__)
+            if phase is not None:
+                return phase
+        # urllib wraps a timed out connect in URLError; a timed out read is a bare socket timeout
+        if isinstance(getattr(exc, "reason", None), TimeoutError):
+            return "connect"
+        if type(exc) is TimeoutError:
+            return "read"
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def error_label(exc: BaseException) -> str:
+    """Short label of a failed request for metrics: "<phase>_timeout", "response_too_large" or the exception type."""
+    phase = timeout_phase(exc)
+    if phase is not None:
+        return f"{phase}_timeout"
+    cause, seen = exc, set()
+    while cause is not None and id(cause) not in seen:
+        seen.add(id(cause))
+        if isinstance(cause, ResponseTooLarge):
+            return "response_too_large"
+        cause = cause.__cause__ or cause.__context__
+    return type(exc).__name__
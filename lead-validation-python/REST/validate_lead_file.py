@@ -0,0 +1,414 @@
+"""
+Validate a CSV, JSONL or JSON array file of leads with ValidateLead_V3.
+
+Rows are streamed from the input, validated concurrently and written to the
+output as they complete, so memory use stays flat regardless of file size.
+Each output row holds the original fields followed by the LVResponse fields.
+
+Progress is checkpointed next to the output file. If a run is interrupted,
+running the same command again resumes after the last checkpointed row
+instead of re-validating (and re-billing) rows already written.
+
+    python validate_lead_file.py leads.csv validated.csv --license-key KEY --workers 16
+
+On multi-core machines, --processes spreads the calls over that many worker
+processes with --workers threads each; --rate-limit then caps the calls per
+second made by all of them together.
+
+    python validate_lead_file.py leads.csv validated.csv --license-key KEY --processes 32 --rate-limit 500
+
+For recurring runs over the same records, --delta-index keeps an index of what
+was sent for each record ID (--id-column) and only re-validates records that
+are new, changed or older than --max-age days; the rest are answered from it.
+
+    python validate_lead_file.py crm.csv validated.csv --license-key KEY --delta-index crm.db --id-column Id
+"""
+from lv_delta import DeltaIndex, validate_leads_v3_delta
+from lv_response import LVResponse, PhoneContact, Error
+from validate_lead_v3_rest import LEAD_FIELDS, ValidateLeadV3Client
+from validate_leads_v3_bulk import validate_leads_v3
+from validate_leads_v3_sharded import validate_leads_v3_sharded
+from collections import deque
+from dataclasses import fields
+from typing import Dict, Iterable, Iterator, List, Optional
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+
+# Output column names for the flattened LVResponse, in dataclass order
+_SCALAR_FIELDS = [f.name for f in fields(LVResponse)
+                  if f.name not in ("PhoneContact", "InformationComponents", "Error")]
+RESPONSE_COLUMNS = (
+    _SCALAR_FIELDS
+    + [f"PhoneContact{f.name}" for f in fields(PhoneContact)]
+    + ["InformationComponents"]
+    + [f"Error{f.name}" for f in fields(Error)]
+)
+
+
+def _normalize(name: str) -> str:
+    return name.replace("_", "").replace(" ", "").replace("-", "").lower()
+
+
+# Column headers are matched case-insensitively against both the snake_case
+# argument names (full_name) and the API parameter names (FullName)
+_KNOWN_COLUMNS = {}
+for _field, _api_name in LEAD_FIELDS:
+    _KNOWN_COLUMNS[_normalize(_field)] = _field
+    _KNOWN_COLUMNS[_normalize(_api_name)] = _field
+
+
+def map_columns(columns: Iterable[str], overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Map input column names onto validate_lead_v3 argument names.
+
+    Parameters:
+        columns: Input column names.
+        overrides: Explicit column -> argument name mappings, applied on top of the
+                   automatic matching.
+
+    Returns:
+        dict: Input column name -> validate_lead_v3 argument name, for matched columns only.
+    """
+    mapping = {}
+    for column in columns:
+        field = _KNOWN_COLUMNS.get(_normalize(column))
+        if field:
+            mapping[column] = field
+    for column, field in (overrides or {}).items():
+        if field not in dict(LEAD_FIELDS):
+            raise ValueError(f"Unknown ValidateLead_V3 field in column mapping: {field}")
+        mapping[column] = field
+    return mapping
+
+
+def flatten_response(response: LVResponse) -> Dict[str, Optional[str]]:
+    """Flatten an LVResponse into RESPONSE_COLUMNS keyed values."""
+    row = {name: getattr(response, name) for name in _SCALAR_FIELDS}
+    contact = response.PhoneContact
+    for f in fields(PhoneContact):
+        row[f"PhoneContact{f.name}"] = getattr(contact, f.name) if contact else None
+    row["InformationComponents"] = json.dumps(
+        [{"Name": c.Name, "Value": c.Value} for c in response.InformationComponents]
+    ) if response.InformationComponents else None
+    error = response.Error
+    for f in fields(Error):
+        row[f"Error{f.name}"] = getattr(error, f.name) if error else None
+    return row
+
+
+# Characters read at a time while streaming the items of a JSON array
+_JSON_CHUNK = 65536
+
+
+def _detect_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    return "json" if extension == ".json" else "csv"
+
+
+def _csv_rows(handle, path: str) -> Iterator[dict]:
+    reader = csv.DictReader(handle)
+    for row in reader:
+        if None in row:
+            # DictReader files fields beyond the header under the key None
+            raise ValueError(f"{path}, line {reader.line_num}: {len(row[None])} more field(s) than the header; "
+                             "fix or remove the row, then run again to resume")
+        yield row
+
+
+def _json_array_rows(handle, path: str) -> Iterator[dict]:
+    """Yield the objects of a top-level JSON array one at a time, without reading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    while not buffer:
+        chunk = handle.read(_JSON_CHUNK)
+        if not chunk:
+            break
+        buffer = chunk.lstrip()
+    if not buffer.startswith("["):
+        raise ValueError(f"{path}: expected a JSON array of lead objects; use a .jsonl file for JSON Lines")
+    buffer = buffer[1:]
+    eof = False
+    expect_item = True
+    while True:
+        buffer = buffer.lstrip()
+        if buffer:
+            if buffer[0] == "]":
+                return
+            if expect_item:
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    # Most likely an item cut off at the end of the buffer
+                    if eof:
+                        raise
+                else:
+                    if not isinstance(item, dict):
+                        raise ValueError(f"{path}: array items must be objects, got {type(item).__name__}")
+                    yield item
+                    buffer = buffer[end:]
+                    expect_item = False
+                    continue
+            elif buffer[0] == ",":
+                buffer = buffer[1:]
+                expect_item = True
+                continue
+            else:
+                raise ValueError(f"{path}: expected ',' or ']' between array items")
+        if eof:
+            raise ValueError(f"{path}: JSON array is not closed")
+        chunk = handle.read(_JSON_CHUNK)
+        eof = not chunk
+        buffer += chunk
+
+
+def read_rows(path: str, fmt: str) -> Iterator[dict]:
+    """Lazily yield input rows as dicts. fmt is "csv", "jsonl" or "json" (an array of objects)."""
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        if fmt == "csv":
+            yield from _csv_rows(handle, path)
+        elif fmt == "json":
+            yield from _json_array_rows(handle, path)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class _Checkpoint:
+    """Records how many input rows are safely in the output, and the output size at that point."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[dict]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def save(self, rows_done: int, output_bytes: int) -> None:
+        # Write-then-rename so a crash never leaves a torn checkpoint behind
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"rows_done": rows_done, "output_bytes": output_bytes}, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def validate_file(input_path: str,
+                  output_path: str,
+                  license_key: str,
+                  is_live: bool = True,
+                  workers: int = 8,
+                  input_format: Optional[str] = None,
+                  output_format: Optional[str] = None,
+                  column_map: Optional[Dict[str, str]] = None,
+                  test_type: str = "",
+                  checkpoint_every: int = 100,
+                  restart: bool = False,
+                  client: Optional[ValidateLeadV3Client] = None,
+                  processes: int = 1,
+                  rate_limit: Optional[float] = None,
+                  delta_index: Optional[DeltaIndex] = None,
+                  id_column: Optional[str] = None,
+                  max_age: float = 30 * 86400) -> int:
+    """
+    Stream a lead file through ValidateLead_V3 and write enriched rows to output_path.
+
+    Parameters:
+        input_path: CSV, JSONL or JSON array file of leads.
+        output_path: File to write enriched rows to.
+        license_key: Your ServiceObjects license key.
+        is_live: Use live or trial servers.
+        workers: Number of concurrent calls, per process when processes is above 1.
+        input_format: "csv", "jsonl" or "json". Detected from the file extension when omitted.
+        output_format: "csv" or "jsonl". Defaults to the input format, and to "jsonl" for "json".
+        column_map: Explicit input column -> validate_lead_v3 argument name mappings.
+        test_type: TestType sent for rows that do not provide one.
+        checkpoint_every: Rows between checkpoints. After a crash, the rows written since the
+                          last checkpoint and the rows still in flight are validated, and billed,
+                          again: up to checkpoint_every plus four times workers, or plus
+                          2 * processes * 64 with processes above 1. Rows that failed locally, e.g.
+                          because both endpoints were down, are written with Error.TypeCode "local"
+                          and count as done, so a resumed run does not retry them.
+        restart: Ignore an existing checkpoint and start over. A checkpoint whose output file
+                 is missing or shorter than recorded is ignored too.
+        client: Client to send the calls through. Defaults to a new ValidateLeadV3Client.
+                Cannot be combined with processes above 1, where each process builds its own.
+        processes: Number of worker processes (see validate_leads_v3_sharded).
+        rate_limit: Calls per second allowed across all workers. Only used with processes
+                    above 1; otherwise give client a rate_limiter.
+        delta_index: Optional DeltaIndex (see lv_delta.py). Only rows that are new, changed
+                     or older than max_age are sent; the others are answered from the index.
+        id_column: Input column holding the stable record ID. Required with delta_index.
+                   Rows where it is missing or empty get a local error instead of a call.
+        max_age: Seconds after which an unchanged row is validated again, with delta_index.
+
+    Returns:
+        int: Number of rows validated by this run.
+    """
+    if processes > 1 and client is not None:
+        raise ValueError("client cannot be shared with worker processes; pass processes=1")
+    if delta_index is not None and (processes > 1 or not id_column):
+        raise ValueError("delta_index needs id_column, and runs in a single process")
+    input_format = input_format or _detect_format(input_path)
+    output_format = output_format or ("jsonl" if input_format == "json" else input_format)
+    checkpoint = _Checkpoint(output_path + ".checkpoint")
+
+    state = None if restart else checkpoint.load()
+    if state and (not os.path.exists(output_path) or os.path.getsize(output_path) < state["output_bytes"]):
+        # The output the checkpoint describes is gone; resuming would lose rows
+        state = None
+    rows_done = state["rows_done"] if state else 0
+
+    rows = read_rows(input_path, input_format)
+    for _ in range(rows_done):
+        next(rows, None)
+
+    # Rows read but not yet written; the pipelines below read at most max_pending rows ahead
+    originals = deque()
+    mapping_cache = {}
+
+    def leads() -> Iterator[dict]:
+        for row in rows:
+            # JSONL rows may differ in keys, so the mapping is resolved per distinct key set
+            key = tuple(row)
+            mapping = mapping_cache.get(key)
+            if mapping is None:
+                mapping = mapping_cache[key] = map_columns(row, column_map)
+            lead = {field: row[column] for column, field in mapping.items() if row.get(column) is not None}
+            lead.setdefault("test_type", test_type)
+            originals.append(row)
+            yield lead
+
+    def row_id(row: dict) -> Optional[str]:
+        # A row without an ID is answered with a local error by validate_leads_v3_delta
+        value = row.get(id_column)
+        return None if value is None or value == "" else str(value)
+
+    if delta_index is not None:
+        # originals[-1] is the row leads() has just turned into lead
+        keyed = ((row_id(originals[-1]), lead) for lead in leads())
+        responses = validate_leads_v3_delta(keyed, license_key, delta_index, max_age=max_age, is_live=is_live,
+                                            workers=workers, client=client)
+    elif processes > 1:
+        responses = validate_leads_v3_sharded(leads(), license_key, is_live=is_live, processes=processes,
+                                              workers=workers, rate_limit=rate_limit)
+    else:
+        responses = validate_leads_v3(leads(), license_key, is_live=is_live, workers=workers, client=client)
+
+    if state:
+        # Drop anything written after the last checkpoint; those rows are validated again
+        raw = open(output_path, "r+b")
+        raw.truncate(state["output_bytes"])
+        raw.seek(0, os.SEEK_END)
+    else:
+        raw = open(output_path, "wb")
+    validated = 0
+    # Written through a binary handle so that tell() is a byte offset the checkpoint can truncate to
+    with io.TextIOWrapper(raw, encoding="utf-8", newline="") as out:
+        writer = None
+        for response in responses:
+            row = originals.popleft()
+            enriched = dict(row)
+            enriched.update(flatten_response(response))
+            if output_format == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(out, fieldnames=list(row) + [c for c in RESPONSE_COLUMNS if c not in row],
+                                            extrasaction="ignore")
+                    if not state:
+                        writer.writeheader()
+                writer.writerow(enriched)
+            else:
+                out.write(json.dumps(enriched) + "\n")
+
+            validated += 1
+            if validated % checkpoint_every == 0:
+                out.flush()
+                os.fsync(raw.fileno())
+                checkpoint.save(rows_done + validated, raw.tell())
+
+    checkpoint.clear()
+    return validated
+
+
+def _parse_map(values: List[str]) -> Dict[str, str]:
+    mapping = {}
+    for value in values:
+        column, sep, field = value.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(f"Expected COLUMN=field, got {value!r}")
+        mapping[column] = field
+    return mapping
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV, JSONL or JSON array file of leads.")
+    parser.add_argument("output", help="File to write validated rows to.")
+    parser.add_argument("--license-key", default=os.environ.get("LV_LICENSE_KEY"),
+                        help="ServiceObjects license key. Defaults to $LV_LICENSE_KEY.")
+    parser.add_argument("--trial", action="store_true", help="Use the trial endpoint.")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent calls, per process.")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes.")
+    parser.add_argument("--rate-limit", type=float,
+                        help="Calls per second across all worker processes (with --processes).")
+    parser.add_argument("--input-format", choices=("csv", "jsonl", "json"))
+    parser.add_argument("--output-format", choices=("csv", "jsonl"))
+    parser.add_argument("--map", action="append", default=[], metavar="COLUMN=field",
+                        help="Map an input column onto a validate_lead_v3 argument, e.g. 'E-Mail=email'.")
+    parser.add_argument("--test-type", default="", help="TestType for rows that do not provide one.")
+    parser.add_argument("--delta-index", metavar="PATH",
+                        help="SQLite index of earlier results; only new, changed or stale rows are sent.")
+    parser.add_argument("--id-column", help="Column holding a stable record ID (with --delta-index).")
+    parser.add_argument("--max-age", type=float, default=30,
+                        help="Days after which unchanged rows are validated again (with --delta-index).")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="Rows between checkpoints.")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint.")
+    args = parser.parse_args(argv)
+
+    if not args.license_key:
+        parser.error("a license key is required (--license-key or $LV_LICENSE_KEY)")
+
+    if args.delta_index and not args.id_column:
+        parser.error("--delta-index needs --id-column")
+    delta_index = DeltaIndex(args.delta_index) if args.delta_index else None
+
+    try:
+        validated = validate_file(
+            args.input, args.output, args.license_key,
+            is_live=not args.trial,
+            workers=args.workers,
+            input_format=args.input_format,
+            output_format=args.output_format,
+            column_map=_parse_map(args.map),
+            test_type=args.test_type,
+            checkpoint_every=args.checkpoint_every,
+            restart=args.restart,
+            processes=args.processes,
+            rate_limit=args.rate_limit,
+            delta_index=delta_index,
+            id_column=args.id_column,
+            max_age=args.max_age * 86400,
+        )
+    finally:
+        if delta_index is not None:
+            delta_index.close()
+    print(f"Validated {validated} rows into {args.output}", file=sys.stderr)
+    if delta_index is not None:
+        print(f"Delta: {delta_index.stats}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,705 @@
-from lv_response import LVResponse, PhoneContact, InformationComponent, Error
+from lv_response import LVResponse
+from lv_json import loads
+from lv_instrumentation import RequestEvent, begin_call, end_call, note_fallback, note_phase, record_request
+from lv_timeouts import Deadline, ResponseTooLarge, TotalTimeout, check_length, error_label, read1_chunks, read_limited
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from typing import Optional
+import contextvars
+import socket
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Timeout
 
 # Endpoint URLs for ServiceObjects Lead Validation (LV) API
 primary_url = "https://sws.serviceobjects.com/lv/api.svc/json/ValidateLead_V3?"
 backup_url = "https://swsbackup.serviceobjects.com/lv/api.svc/json/ValidateLead_V3?"
 trial_url = "https://trial.serviceobjects.com/lv/api.svc/json/ValidateLead_V3?"
 
+# Bytes read from the socket at a time while streaming a response body
+_CHUNK_BYTES = 65536
+
+# The side of a hedged race the current request belongs to, if any (see _HedgeAttempt)
+_hedge_attempt = contextvars.ContextVar("lv_hedge_attempt", default=None)
+
+
+class _HedgeAttempt:
+    """
+    One request of a hedged race, which the winner can stop wherever it has got to.
+
+    The pools of _HedgeAdapter register the connection a request has checked out.
+    abort() shuts that connection's socket down, which ends a blocked wait for the
+    headers or the body at once; a request that has no connection yet fails as
+    soon as it takes one or finishes connecting.
+    """
+
+    def __init__(self):
+        self.aborted = False
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def check(self) -> None:
+        if self.aborted:
+            raise ConnectionAbortedError("Hedged request lost the race")
+
+    def checkout(self, conn) -> None:
+        with self._lock:
+            self.check()
+            self._conn = conn
+
+    def checkin(self) -> None:
+        # Before the connection goes back to the pool, where another request may take it
+        with self._lock:
+            self._conn = None
+
+    def abort(self) -> None:
+        with self._lock:
+            self.aborted = True
+            sock = getattr(self._conn, "sock", None)
+            if sock is not None:
+                try:
+                    # The plain socket's shutdown, so a TLS socket is not torn down under its reader
+                    socket.socket.shutdown(sock, socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+def _hedge_lost() -> bool:
+    attempt = _hedge_attempt.get()
+    return attempt is not None and attempt.aborted
+
+
+class _AbortableConnectionMixin:
+    def connect(self):
+        super().connect()
+        attempt = _hedge_attempt.get()
+        if attempt is not None:
+            attempt.check()
+
+
+class _AbortableHTTPConnection(_AbortableConnectionMixin, HTTPConnection):
+    pass
+
+
+class _AbortableHTTPSConnection(_AbortableConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _AbortablePoolMixin:
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        attempt = _hedge_attempt.get()
+        if attempt is not None:
+            try:
+                attempt.checkout(conn)
+            except ConnectionAbortedError:
+                super()._put_conn(conn)
+                raise
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        attempt = _hedge_attempt.get()
+        if attempt is not None:
+            attempt.checkin()
+        super()._put_conn(conn)
+
+
+class _AbortableHTTPPool(_AbortablePoolMixin, HTTPConnectionPool):
+    ConnectionCls = _AbortableHTTPConnection
+
+
+class _AbortableHTTPSPool(_AbortablePoolMixin, HTTPSConnectionPool):
+    ConnectionCls = _AbortableHTTPSConnection
+
+
+class _HedgeAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools let a hedged request be stopped mid-flight."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _AbortableHTTPPool, "https": _AbortableHTTPSPool}
+
+
+# Maps the snake_case lead fields accepted by validate_lead_v3 onto ValidateLead_V3 query parameters
+LEAD_FIELDS = (
+    ("full_name", "FullName"),
+    ("salutation", "Salutation"),
+    ("first_name", "FirstName"),
+    ("last_name", "LastName"),
+    ("business_name", "BusinessName"),
+    ("business_domain", "BusinessDomain"),
+    ("business_ein", "BusinessEIN"),
+    ("address1", "Address1"),
+    ("address2", "Address2"),
+    ("address3", "Address3"),
+    ("address4", "Address4"),
+    ("address5", "Address5"),
+    ("locality", "Locality"),
+    ("admin_area", "AdminArea"),
+    ("postal_code", "PostalCode"),
+    ("country", "Country"),
+    ("phone1", "Phone1"),
+    ("phone2", "Phone2"),
+    ("email", "Email"),
+    ("ip_address", "IPAddress"),
+    ("gender", "Gender"),
+    ("date_of_birth", "DateOfBirth"),
+    ("utc_capture_time", "UTCCaptureTime"),
+    ("output_language", "OutputLanguage"),
+    ("test_type", "TestType"),
+)
+
+
+def build_params(lead: dict, license_key: str) -> dict:
+    """
+    Build the ValidateLead_V3 query parameters for a lead given as a mapping.
+
+    Parameters:
+        lead: Mapping keyed by the snake_case argument names of validate_lead_v3
+              (full_name, salutation, ..., test_type). Missing fields are sent empty.
+        license_key: Your ServiceObjects license key.
+
+    Returns:
+        dict: Query parameters in the same shape validate_lead_v3 sends.
+    """
+    params = {api_name: lead.get(field, "") for field, api_name in LEAD_FIELDS}
+    params["LicenseKey"] = license_key
+    return params
+
+
+def _decode(response: requests.Response, body: bytes) -> dict:
+    # orjson/msgspec when installed (see lv_json); invalid bodies fail like Response.json() does
+    try:
+        return loads(body)
+    except ValueError as exc:
+        raise requests.exceptions.InvalidJSONError(str(exc), response=response) from exc
+
+
+class ValidateLeadV3Client:
+    """
+    Reusable client for the ValidateLead_V3 REST endpoint.
+
+    Holds one keep-alive requests.Session per endpoint (primary, backup, trial) so
+    repeated calls reuse pooled TCP/TLS connections instead of opening a new one
+    for every lead and every backup attempt. Instances are safe to share across threads.
+    """
+
+    def __init__(self,
+                 pool_size: int = 10,
+                 timeout: float = 10,
+                 primary_url: str = primary_url,
+                 backup_url: str = backup_url,
+                 trial_url: str = trial_url,
+                 cache=None,
+                 response_class=LVResponse,
+                 hedge_after: Optional[float] = None,
+                 health=None,
+                 rate_limiter=None,
+                 concurrency=None,
+                 observer=None,
+                 precheck=None,
+                 single_flight=None,
+                 scheduler=None,
+                 priority: Optional[str] = None,
+                 retry_policy=None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 max_response_bytes: Optional[int] = None):
+        """
+        Parameters:
+            pool_size: Maximum number of pooled connections kept open per endpoint.
+                       Size it to the number of threads calling the client concurrently.
+            timeout: Total time per request in seconds, reading the response included.
+                     Also the connect and read timeouts unless those are set.
+            primary_url: Live endpoint URL.
+            backup_url: Live backup endpoint URL, used when the primary fails.
+            trial_url: Trial endpoint URL, used when is_live is False.
+            cache: Optional LVCache answering repeated leads without a call.
+            response_class: Class whose from_dict builds the results, e.g. CompactLVResponse
+                            from lv_response_compact for large in-memory batches, or LazyLVResponse
+                            from lv_response_lazy when only a few fields are read.
+            hedge_after: Opt-in hedging for live calls. When the primary has not answered
+                         within this many seconds, the same request is also sent to the backup
+                         and the first valid response wins; the losing request's connection is
+                         shut down. Set it near the primary's p95 latency.
+            health: Optional EndpointHealth (see endpoint_health.py), possibly shared with other
+                    clients. Every call is reported to it, and live calls go straight to the
+                    backup while the primary's circuit is open.
+            rate_limiter: Optional LicenseRateLimiter (see lv_rate_limit.py); every request,
+                          backup attempts included, waits for a token of its license key.
+            concurrency: Optional AdaptiveConcurrency (see lv_rate_limit.py) capping, and adapting,
+                         how many leads are validated at once.
+            observer: Optional LVObserver (see lv_instrumentation.py) receiving call and request
+                      events with endpoint, fallback reason, phase timings and response size.
+            precheck: Optional LeadPrecheck (see lv_precheck.py) run on every lead first. It answers
+                      leads with malformed values locally, or blanks those values, before any call.
+            single_flight: Optional SingleFlight (see lv_single_flight.py). Identical leads validated
+                           concurrently then share one call and receive the same response.
+            scheduler: Optional PriorityScheduler (see lv_scheduler.py), usually shared with other
+                       clients. Calls then wait for a slot of their priority class before going out.
+            priority: Priority class of this client's calls. Defaults to the scheduler's default class.
+            retry_policy: Optional RetryPolicy (see lv_retry.py) replacing the one primary and one
+                          backup attempt with retries that alternate between them, back off with
+                          jitter and fit in a total deadline. hedge_after is not used with it.
+            connect_timeout: Seconds to open a connection, TLS handshake included (see lv_timeouts.py).
+            read_timeout: Seconds to wait for the response to start, and between its chunks.
+            max_response_bytes: Largest response body accepted. Bodies are streamed and a larger
+                                one fails the request like a transport error.
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.primary_url = primary_url
+        self.backup_url = backup_url
+        self.trial_url = trial_url
+        self.cache = cache
+        self.response_class = response_class
+        self.hedge_after = hedge_after
+        self.health = health
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.observer = observer
+        self.precheck = precheck
+        self.single_flight = single_flight
+        self.scheduler = scheduler
+        self.priority = priority
+        self.retry_policy = retry_policy
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_response_bytes = max_response_bytes
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._hedge_pool = None
+
+    def _session(self, url: str) -> requests.Session:
+        # Sessions are created lazily so a live-only caller never opens a trial pool
+        session = self._sessions.get(url)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(url)
+                if session is None:
+                    session = requests.Session()
+                    adapter_class = HTTPAdapter if self.hedge_after is None else _HedgeAdapter
+                    adapter = adapter_class(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._sessions[url] = session
+        return session
+
+    def _get(self, url: str, params: dict, budget=None) -> dict:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(params.get("LicenseKey"))
+        # Under a retry policy the attempt's timeout depends on the time left after the rate limit
+        timeout = self.timeout if budget is None else budget.attempt_timeout(self.timeout)
+        fetch = self._fetch if self.observer is None else self._fetch_observed
+        if self.health is None:
+            return fetch(url, params, timeout)
+        start = time.perf_counter()
+        try:
+            data = fetch(url, params, timeout)
+        except requests.RequestException as exc:
+            # A hedge that lost the race was stopped by the client, not failed by the endpoint
+            if not _hedge_lost():
+                self.health.record_failure(url, exc)
+            raise
+        error = data.get('Error')
+        if error is not None and error.get('TypeCode') == "3":
+            self.health.record_failure(url, RuntimeError(f"LV service error: {error}"))
+        else:
+            self.health.record_success(url, time.perf_counter() - start)
+        return data
+
+    def _open(self, url: str, params: dict, deadline: Deadline) -> requests.Response:
+        # urllib3 takes the time a new connection took off the read timeout, so the headers
+        # arrive within the total too; the body is then read under deadline's clamp
+        left = deadline.left()
+        phases = Timeout(connect=min(self.connect_timeout or left, left), read=min(deadline.read_timeout, left),
+                         total=left)
+        try:
+            return self._session(url).get(url, params=params, timeout=phases, stream=True)
+        except requests.exceptions.Timeout as exc:
+            if not deadline.is_total(exc):
+                raise
+            total = TotalTimeout(deadline.timeout)
+            total.__cause__ = exc
+            raise requests.exceptions.Timeout(str(total), request=exc.request) from total
+
+    def _read_body(self, response: requests.Response, deadline: Deadline) -> bytes:
+        connection = response.raw.connection
+        deadline.sock = connection.sock if connection is not None else None
+        try:
+            check_length(response.headers.get("Content-Length"), self.max_response_bytes)
+            chunks = deadline.chunks(read1_chunks(response, _CHUNK_BYTES))
+            return read_limited(chunks, self.max_response_bytes, deadline.at, deadline.timeout)
+        except TotalTimeout as exc:
+            raise requests.exceptions.Timeout(str(exc), response=response) from exc
+        except ResponseTooLarge as exc:
+            raise requests.RequestException(str(exc), response=response) from exc
+
+    def _fetch(self, url: str, params: dict, timeout: float) -> dict:
+        deadline = Deadline(timeout, self.read_timeout)
+        with self._open(url, params, deadline) as response:
+            response.raise_for_status()
+            return _decode(response, self._read_body(response, deadline))
+
+    def _fetch_observed(self, url: str, params: dict, timeout: float) -> dict:
+        start = time.perf_counter()
+        deadline = Deadline(timeout, self.read_timeout)
+        event = RequestEvent("rest", url, 0.0)
+        try:
+            with self._open(url, params, deadline) as response:
+                # requests cannot split out DNS and connect time: "server" runs from sending the
+                # request to parsing the response headers, including any new connection's set-up
+                server = response.elapsed.total_seconds()
+                event.phases["server"] = server
+                event.status = response.status_code
+                response.raise_for_status()
+                body = self._read_body(response, deadline)
+            received = time.perf_counter()
+            event.phases["transfer"] = max(0.0, received - start - server)
+            event.response_bytes = len(body)
+            data = _decode(response, body)
+            event.phases["decode"] = time.perf_counter() - received
+            error = data.get('Error')
+            if error is not None and error.get('TypeCode') == "3":
+                event.error = "Error.TypeCode=3"
+            return data
+        except Exception as exc:
+            event.error = "hedge_lost" if _hedge_lost() else error_label(exc)
+            raise
+        finally:
+            event.duration = time.perf_counter() - start
+            record_request(self.observer, event)
+
+    def _build(self, data: dict) -> LVResponse:
+        if self.observer is None:
+            return self.response_class.from_dict(data)
+        start = time.perf_counter()
+        response = self.response_class.from_dict(data)
+        note_phase("build", time.perf_counter() - start)
+        return response
+
+    def validate_lead_v3(self,
+                         full_name: str,
+                         salutation: str,
+                         first_name: str,
+                         last_name: str,
+                         business_name: str,
+                         business_domain: str,
+                         business_ein: str,
+                         address1: str,
+                         address2: str,
+                         address3: str,
+                         address4: str,
+                         address5: str,
+                         locality: str,
+                         admin_area: str,
+                         postal_code: str,
+                         country: str,
+                         phone1: str,
+                         phone2: str,
+                         email: str,
+                         ip_address: str,
+                         gender: str,
+                         date_of_birth: str,
+                         utc_capture_time: str,
+                         output_language: str,
+                         test_type: str,
+                         license_key: str,
+                         is_live: bool) -> LVResponse:
+        """
+        Call the ValidateLead_V3 endpoint over the client's pooled sessions.
+
+        Takes the same arguments, and behaves the same, as the module-level validate_lead_v3.
+
+        Returns:
+            LVResponse: Parsed JSON response with lead validation results or error details.
+
+        Raises:
+            RuntimeError: If the API returns an error payload or both endpoints are unreachable.
+        """
+        params = {
+            "FullName": full_name,
+            "Salutation": salutation,
+            "FirstName": first_name,
+            "LastName": last_name,
+            "BusinessName": business_name,
+            "BusinessDomain": business_domain,
+            "BusinessEIN": business_ein,
+            "Address1": address1,
+            "Address2": address2,
+            "Address3": address3,
+            "Address4": address4,
+            "Address5": address5,
+            "Locality": locality,
+            "AdminArea": admin_area,
+            "PostalCode": postal_code,
+            "Country": country,
+            "Phone1": phone1,
+            "Phone2": phone2,
+            "Email": email,
+            "IPAddress": ip_address,
+            "Gender": gender,
+            "DateOfBirth": date_of_birth,
+            "UTCCaptureTime": utc_capture_time,
+            "OutputLanguage": output_language,
+            "TestType": test_type,
+            "LicenseKey": license_key,
+        }
+        return self.validate_params(params, is_live)
+
+    def validate_params(self, params: dict, is_live: bool = True, priority: Optional[str] = None) -> LVResponse:
+        """
+        Call the ValidateLead_V3 endpoint with an already built query parameter dict.
+
+        Parameters:
+            params: Query parameters as produced by build_params.
+            is_live: Use live or trial servers.
+            priority: Priority class of this call when the client has a scheduler.
+                      Defaults to the client's priority.
+
+        Returns:
+            LVResponse: Parsed JSON response with lead validation results or error details.
+
+        Raises:
+            RuntimeError: If the API returns an error payload or both endpoints are unreachable.
+        """
+        if self.precheck is not None:
+            params, rejection = self.precheck.apply(params)
+            if rejection is not None:
+                return self.response_class.from_dict(rejection)
+        call = self._call if self.concurrency is None else self._call_adaptive
+        if self.observer is not None:
+            call = self._observed(call)
+        if self.scheduler is not None:
+            call = self._scheduled(call, self.priority if priority is None else priority)
+        if self.single_flight is not None:
+            call = self._coalesced(call)
+        if self.cache is None:
+            return call(params, is_live)
+        return self.cache.get_or_call(params, lambda: call(params, is_live), is_live)
+
+    def _coalesced(self, call):
+        def coalesced_call(params: dict, is_live: bool) -> LVResponse:
+            return self.single_flight.do(params, lambda: call(params, is_live), is_live)
+        return coalesced_call
+
+    def _scheduled(self, call, priority: Optional[str]):
+        def scheduled_call(params: dict, is_live: bool) -> LVResponse:
+            self.scheduler.acquire(priority)
+            try:
+                return call(params, is_live)
+            finally:
+                self.scheduler.release(priority)
+        return scheduled_call
+
+    def _observed(self, call):
+        def observed_call(params: dict, is_live: bool) -> LVResponse:
+            token = begin_call(self.observer, "rest", is_live)
+            error = None
+            try:
+                return call(params, is_live)
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                end_call(self.observer, token, error)
+        return observed_call
+
+    def _call_adaptive(self, params: dict, is_live: bool) -> LVResponse:
+        self.concurrency.acquire()
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = self._call(params, is_live)
+            ok = True
+            return response
+        finally:
+            self.concurrency.release(time.perf_counter() - start, ok)
+
+    def _call(self, params: dict, is_live: bool) -> LVResponse:
+        if self.retry_policy is not None:
+            return self._call_retrying(params, is_live)
+
+        if is_live and self.health is not None and not self.health.allow(self.primary_url):
+            # The primary's circuit is open: skip straight to the backup
+            note_fallback("circuit_open")
+            return self._call_backup(params)
+
+        if is_live and self.hedge_after is not None:
+            return self._call_hedged(params)
+
+        # Select the base URL: production vs trial
+        url = self.primary_url if is_live else self.trial_url
+
+        try:
+            # Attempt primary (or trial) endpoint
+            data = self._get(url, params)
+
+            # If API returned an error in JSON payload, trigger fallback
+            error = data.get('Error')
+            if not (error is None or error.get('TypeCode') != "3"):
+                if is_live:
+                    # Try backup URL
+                    data = self._get(self.backup_url, params)
+
+                    # If still error, propagate exception
+                    if 'Error' in data:
+                        raise RuntimeError(f"LV service error: {data['Error']}")
+                else:
+                    # Trial mode error is terminal
+                    raise RuntimeError(f"LV trial error: {data['Error']}")
+
+            return self._build(data)
+
+        except requests.RequestException as req_exc:
+            # Network or HTTP-level error occurred
+            if is_live:
+                try:
+                    # Fallback to backup URL
+                    data = self._get(self.backup_url, params)
+                    if "Error" in data:
+                        raise RuntimeError(f"LeadValidation backup error: {data['Error']}") from req_exc
+                    return self._build(data)
+                except Exception as backup_exc:
+                    raise RuntimeError("LeadValidation service unreachable on both endpoints") from backup_exc
+            else:
+                raise RuntimeError(f"LeadValidation trial error: {str(req_exc)}") from req_exc
+
+    def _call_retrying(self, params: dict, is_live: bool) -> LVResponse:
+        budget = self.retry_policy.begin()
+        urls = (self.primary_url, self.backup_url) if is_live else (self.trial_url,)
+        while True:
+            url = urls[budget.attempts % len(urls)]
+            if url == self.primary_url and self.health is not None and not self.health.allow(url):
+                # The primary's circuit is open: this attempt goes to the backup
+                note_fallback("circuit_open")
+                url = self.backup_url
+            elif budget.attempts:
+                note_fallback("retry")
+            try:
+                data = self._get(url, params, budget)
+            except requests.HTTPError as exc:
+                status = exc.response.status_code if exc.response is not None else None
+                delay = budget.failed(exc, "http", status)
+            except requests.RequestException as exc:
+                delay = budget.failed(exc, "transport")
+            else:
+                error = data.get('Error')
+                if error is None or error.get('TypeCode') != "3":
+                    return self._build(data)
+                delay = budget.failed(RuntimeError(f"LV service error: {error}"), "service")
+            if delay:
+                time.sleep(delay)
+
+    def _call_hedged(self, params: dict) -> LVResponse:
+        if self._hedge_pool is None:
+            with self._lock:
+                if self._hedge_pool is None:
+                    self._hedge_pool = ThreadPoolExecutor(max_workers=self.pool_size * 2,
+                                                          thread_name_prefix="lv_hedge")
+        # Run in a copy of this context so instrumentation attributes the requests to this call
+        primary_attempt = _HedgeAttempt()
+        primary = self._hedge_pool.submit(contextvars.copy_context().run, self._get_hedged, primary_attempt,
+                                          self.primary_url, params)
+        try:
+            data = primary.result(timeout=self.hedge_after)
+        except FutureTimeoutError:
+            pass
+        except requests.RequestException:
+            # The primary failed outright before the threshold: plain fallback
+            return self._call_backup(params)
+        else:
+            error = data.get('Error')
+            if error is None or error.get('TypeCode') != "3":
+                return self._build(data)
+            return self._call_backup(params)
+
+        # Primary is slow: race it against the backup
+        with self._lock:
+            self.hedges_fired += 1
+        note_fallback("hedge")
+        backup_attempt = _HedgeAttempt()
+        backup = self._hedge_pool.submit(contextvars.copy_context().run, self._get_hedged, backup_attempt,
+                                         self.backup_url, params)
+        attempts = {primary: primary_attempt, backup: backup_attempt}
+        last_error = None
+        for future in as_completed((primary, backup)):
+            try:
+                data = future.result()
+            except requests.RequestException as exc:
+                last_error = exc
+                continue
+            error = data.get('Error')
+            valid = 'Error' not in data if future is backup else error is None or error.get('TypeCode') != "3"
+            if not valid:
+                last_error = RuntimeError(f"LV service error: {data['Error']}")
+                continue
+            if future is backup:
+                with self._lock:
+                    self.hedges_won += 1
+            # Stop the loser: drop it if still queued, otherwise close its connection
+            loser = backup if future is primary else primary
+            loser.cancel()
+            attempts[loser].abort()
+            return self._build(data)
+        raise RuntimeError("LeadValidation service unreachable on both endpoints") from last_error
+
+    def _get_hedged(self, attempt: _HedgeAttempt, url: str, params: dict) -> dict:
+        # Runs in its own context copy, so the attempt is only seen by this request
+        _hedge_attempt.set(attempt)
+        return self._get(url, params)
+
+    def _call_backup(self, params: dict) -> LVResponse:
+        try:
+            data = self._get(self.backup_url, params)
+            if "Error" in data:
+                raise RuntimeError(f"LeadValidation backup error: {data['Error']}")
+            return self._build(data)
+        except Exception as backup_exc:
+            raise RuntimeError("LeadValidation service unreachable on both endpoints") from backup_exc
+
+    @property
+    def hedge_stats(self) -> dict:
+        """How often hedged requests were fired, and how often the backup answered first."""
+        with self._lock:
+            return {"fired": self.hedges_fired, "won": self.hedges_won}
+
+    def close(self) -> None:
+        """Close every pooled session held by the client."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            hedge_pool, self._hedge_pool = self._hedge_pool, None
+        if hedge_pool is not None:
+            hedge_pool.shutdown(wait=False, cancel_futures=True)
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> "ValidateLeadV3Client":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def _get_default_client() -> ValidateLeadV3Client:
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = ValidateLeadV3Client()
+    return _default_client
+
+
 def validate_lead_v3(full_name: str,
                     salutation: str,
                     first_name: str,
@@ -37,6 +731,9 @@ def validate_lead_v3(full_name: str,
     Call ServiceObjects Lead Validation (LV) API's ValidateLead_V3 endpoint
     to retrieve lead validation information for a given US or Canada lead.
 
+    Calls go through a shared ValidateLeadV3Client, so connections are pooled
+    and kept alive between calls.
+
     Parameters:
         full_name: The contacts full name. Optional.
         salutation: Salutation of the contact. Optional.
@@ -73,200 +770,9 @@ def validate_lead_v3(full_name: str,
         RuntimeError: If the API returns an error payload.
         requests.RequestException: On network/HTTP failures (trial mode).
     """
-    params = {
-        "FullName": full_name,
-        "Salutation": salutation,
-        "FirstName": first_name,
-        "LastName": last_name,
-        "BusinessName": business_name,
-        "BusinessDomain": business_domain,
-        "BusinessEIN": business_ein,
-        "Address1": address1,
-        "Address2": address2,
-        "Address3": address3,
-        "Address4": address4,
-        "Address5": address5,
-        "Locality": locality,
-        "AdminArea": admin_area,
-        "PostalCode": postal_code,
-        "Country": country,
-        "Phone1": phone1,
-        "Phone2": phone2,
-        "Email": email,
-        "IPAddress": ip_address,
-        "Gender": gender,
-        "DateOfBirth": date_of_birth,
-        "UTCCaptureTime": utc_capture_time,
-        "OutputLanguage": output_language,
-        "TestType": test_type,
-        "LicenseKey": license_key,
-    }
-    # Select the base URL: production vs trial
-    url = primary_url if is_live else trial_url
-
-    try:
-        # Attempt primary (or trial) endpoint
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-
-        # If API returned an error in JSON payload, trigger fallback
-        error = data.get('Error')
-        if not (error is None or error.get('TypeCode') != "3"):
-            if is_live:
-                # Try backup URL
-                response = requests.get(backup_url, params=params, timeout=10)
-                data = response.json()
-
-                # If still error, propagate exception
-                if 'Error' in data:
-                    raise RuntimeError(f"LV service error: {data['Error']}")
-            else:
-                # Trial mode error is terminal
-                raise RuntimeError(f"LV trial error: {data['Error']}")
-
-        # Convert JSON response to LVResponse for structured access
-        error = Error(**data.get("Error", {})) if data.get("Error") else None
-        phone_contact = PhoneContact(**data.get("PhoneContact", {})) if data.get("PhoneContact") else None
-
-        return LVResponse(
-            OverallCertainty=data.get("OverallCertainty"),
-            OverallQuality=data.get("OverallQuality"),
-            LeadType=data.get("LeadType"),
-            LeadCountry=data.get("LeadCountry"),
-            NoteCodes=data.get("NoteCodes"),
-            NoteDesc=data.get("NoteDesc"),
-            NameCertainty=data.get("NameCertainty"),
-            NameQuality=data.get("NameQuality"),
-            FirstName=data.get("FirstName"),
-            LastName=data.get("LastName"),
-            FirstNameClean=data.get("FirstNameClean"),
-            LastNameClean=data.get("LastNameClean"),
-            NameNoteCodes=data.get("NameNoteCodes"),
-            NameNoteDesc=data.get("NameNoteDesc"),
-            AddressCertainty=data.get("AddressCertainty"),
-            AddressQuality=data.get("AddressQuality"),
-            Address1=data.get("Address1"),
-            Address2=data.get("Address2"),
-            Address3=data.get("Address3"),
-            Address4=data.get("Address4"),
-            Address5=data.get("Address5"),
-            AddressLocality=data.get("AddressLocality"),
-            AddressAdminArea=data.get("AddressAdminArea"),
-            AddressPostalCode=data.get("AddressPostalCode"),
-            AddressCountry=data.get("AddressCountry"),
-            AddressNoteCodes=data.get("AddressNoteCodes"),
-            AddressNoteDesc=data.get("AddressNoteDesc"),
-            EmailCertainty=data.get("EmailCertainty"),
-            EmailQuality=data.get("EmailQuality"),
-            EmailCorrected=data.get("EmailCorrected"),
-            EmailNoteCodes=data.get("EmailNoteCodes"),
-            EmailNoteDesc=data.get("EmailNoteDesc"),
-            IPAddressCertainty=data.get("IPAddressCertainty"),
-            IPAddressQuality=data.get("IPAddressQuality"),
-            IPCountry=data.get("IPCountry"),
-            IPLocality=data.get("IPLocality"),
-            IPAdminArea=data.get("IPAdminArea"),
-            IPNoteCodes=data.get("IPNoteCodes"),
-            IPNoteDesc=data.get("IPNoteDesc"),
-            Phone1Certainty=data.get("Phone1Certainty"),
-            Phone1Quality=data.get("Phone1Quality"),
-            Phone1Locality=data.get("Phone1Locality"),
-            Phone1AdminArea=data.get("Phone1AdminArea"),
-            Phone1Country=data.get("Phone1Country"),
-            Phone1NoteCodes=data.get("Phone1NoteCodes"),
-            Phone1NoteDesc=data.get("Phone1NoteDesc"),
-            Phone2Certainty=data.get("Phone2Certainty"),
-            Phone2Quality=data.get("Phone2Quality"),
-            Phone2Locality=data.get("Phone2Locality"),
-            Phone2AdminArea=data.get("Phone2AdminArea"),
-            Phone2Country=data.get("Phone2Country"),
-            Phone2NoteCodes=data.get("Phone2NoteCodes"),
-            Phone2NoteDesc=data.get("Phone2NoteDesc"),
-            PhoneContact=phone_contact,
-            InformationComponents=[
-                InformationComponent(Name=comp.get("Name"), Value=comp.get("Value"))
-                for comp in data.get("InformationComponents", [])
-            ] if "InformationComponents" in data else [],
-            Error=error
-        )
-
-    except requests.RequestException as req_exc:
-        # Network or HTTP-level error occurred
-        if is_live:
-            try:
-                # Fallback to backup URL
-                response = requests.get(backup_url, params=params, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                if "Error" in data:
-                    raise RuntimeError(f"LeadValidation backup error: {data['Error']}") from req_exc
-
-                error = Error(**data.get("Error", {})) if data.get("Error") else None
-                phone_contact = PhoneContact(**data.get("PhoneContact", {})) if data.get("PhoneContact") else None
-
-                return LVResponse(
-                    OverallCertainty=data.get("OverallCertainty"),
-                    OverallQuality=data.get("OverallQuality"),
-                    LeadType=data.get("LeadType"),
-                    LeadCountry=data.get("LeadCountry"),
-                    NoteCodes=data.get("NoteCodes"),
-                    NoteDesc=data.get("NoteDesc"),
-                    NameCertainty=data.get("NameCertainty"),
-                    NameQuality=data.get("NameQuality"),
-                    FirstName=data.get("FirstName"),
-                    LastName=data.get("LastName"),
-                    FirstNameClean=data.get("FirstNameClean"),
-                    LastNameClean=data.get("LastNameClean"),
-                    NameNoteCodes=data.get("NameNoteCodes"),
-                    NameNoteDesc=data.get("NameNoteDesc"),
-                    AddressCertainty=data.get("AddressCertainty"),
-                    AddressQuality=data.get("AddressQuality"),
-                    Address1=data.get("Address1"),
-                    Address2=data.get("Address2"),
-                    Address3=data.get("Address3"),
-                    Address4=data.get("Address4"),
-                    Address5=data.get("Address5"),
-                    AddressLocality=data.get("AddressLocality"),
-                    AddressAdminArea=data.get("AddressAdminArea"),
-                    AddressPostalCode=data.get("AddressPostalCode"),
-                    AddressCountry=data.get("AddressCountry"),
-                    AddressNoteCodes=data.get("AddressNoteCodes"),
-                    AddressNoteDesc=data.get("AddressNoteDesc"),
-                    EmailCertainty=data.get("EmailCertainty"),
-                    EmailQuality=data.get("EmailQuality"),
-                    EmailCorrected=data.get("EmailCorrected"),
-                    EmailNoteCodes=data.get("EmailNoteCodes"),
-                    EmailNoteDesc=data.get("EmailNoteDesc"),
-                    IPAddressCertainty=data.get("IPAddressCertainty"),
-                    IPAddressQuality=data.get("IPAddressQuality"),
-                    IPCountry=data.get("IPCountry"),
-                    IPLocality=data.get("IPLocality"),
-                    IPAdminArea=data.get("IPAdminArea"),
-                    IPNoteCodes=data.get("IPNoteCodes"),
-                    IPNoteDesc=data.get("IPNoteDesc"),
-                    Phone1Certainty=data.get("Phone1Certainty"),
-                    Phone1Quality=data.get("Phone1Quality"),
-                    Phone1Locality=data.get("Phone1Locality"),
-                    Phone1AdminArea=data.get("Phone1AdminArea"),
-                    Phone1Country=data.get("Phone1Country"),
-                    Phone1NoteCodes=data.get("Phone1NoteCodes"),
-                    Phone1NoteDesc=data.get("Phone1NoteDesc"),
-                    Phone2Certainty=data.get("Phone2Certainty"),
-                    Phone2Quality=data.get("Phone2Quality"),
-                    Phone2Locality=data.get("Phone2Locality"),
-                    Phone2AdminArea=data.get("Phone2AdminArea"),
-                    Phone2Country=data.get("Phone2Country"),
-                    Phone2NoteCodes=data.get("Phone2NoteCodes"),
-                    Phone2NoteDesc=data.get("Phone2NoteDesc"),
-                    PhoneContact=phone_contact,
-                    InformationComponents=[
-                        InformationComponent(Name=comp.get("Name"), Value=comp.get("Value"))
-                        for comp in data.get("InformationComponents", [])
-                    ] if "InformationComponents" in data else [],
-                    Error=error
-                )
-            except Exception as backup_exc:
-                raise RuntimeError("LeadValidation service unreachable on both endpoints") from backup_exc
-        else:
-            raise RuntimeError(f"LeadValidation trial error: {str(req_exc)}") from req_exc
+    return _get_default_client().validate_lead_v3(
+        full_name, salutation, first_name, last_name, business_name, business_domain, business_ein,
+        address1, address2, address3, address4, address5, locality, admin_area, postal_code, country,
+        phone1, phone2, email, ip_address, gender, date_of_birth, utc_capture_time, output_language,
+        test_type, license_key, is_live
+    )
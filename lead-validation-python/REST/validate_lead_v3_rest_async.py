@@ -0,0 +1,537 @@
+from lv_response import LVResponse
+from lv_json import loads
+from lv_instrumentation import RequestEvent, begin_call, end_call, note_fallback, note_phase, record_request
+from lv_timeouts import ResponseTooLarge, TotalTimeout, check_length, error_label
+from validate_lead_v3_rest import primary_url, backup_url, trial_url, _CHUNK_BYTES
+from typing import Optional
+import asyncio
+import functools
+import time
+import aiohttp
+
+# Failures that send a call on to the backup endpoint
+_TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, TimeoutError, ValueError)
+
+
+def _total_timeout(exc: BaseException, timeout: float) -> BaseException:
+    """Tell a total timeout apart: aiohttp raises its connect and read timeouts as subclasses."""
+    if type(exc) is asyncio.TimeoutError:
+        total = TotalTimeout(timeout)
+        total.__cause__ = exc
+        return total
+    return exc
+
+
+def _phase_trace_config() -> aiohttp.TraceConfig:
+    """aiohttp trace hooks stamping when DNS, connection set-up and response headers finish."""
+    def marker(name: str):
+        async def mark(session, context, params):
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx[name] = time.perf_counter()
+        return mark
+
+    config = aiohttp.TraceConfig()
+    config.on_dns_resolvehost_start.append(marker("dns_start"))
+    config.on_dns_resolvehost_end.append(marker("dns_end"))
+    config.on_connection_create_start.append(marker("connect_start"))
+    config.on_connection_create_end.append(marker("connect_end"))
+    config.on_request_end.append(marker("headers"))
+    return config
+
+
+def _request_phases(start: float, marks: dict) -> dict:
+    phases = {}
+    if "dns_end" in marks:
+        phases["dns"] = marks["dns_end"] - marks["dns_start"]
+    if "connect_end" in marks:
+        # Connection set-up, TLS handshake included, after name resolution
+        phases["connect"] = marks["connect_end"] - marks["connect_start"] - phases.get("dns", 0.0)
+    if "headers" in marks:
+        phases["server"] = marks["headers"] - marks.get("connect_end", start)
+        if "received" in marks:
+            phases["transfer"] = marks["received"] - marks["headers"]
+    return phases
+
+
+class AsyncValidateLeadV3Client:
+    """
+    asyncio counterpart of ValidateLeadV3Client.
+
+    Sends the same query parameters, applies the same primary -> backup fallback
+    (on Error.TypeCode == "3" and on transport errors) and returns the same LVResponse,
+    without tying up a thread per in-flight lead. A semaphore caps how many leads
+    are validated concurrently on the event loop.
+    """
+
+    def __init__(self,
+                 max_concurrency: int = 100,
+                 timeout: float = 10,
+                 primary_url: str = primary_url,
+                 backup_url: str = backup_url,
+                 trial_url: str = trial_url,
+                 cache=None,
+                 response_class=LVResponse,
+                 hedge_after: Optional[float] = None,
+                 health=None,
+                 rate_limiter=None,
+                 concurrency=None,
+                 observer=None,
+                 precheck=None,
+                 single_flight=None,
+                 scheduler=None,
+                 priority: Optional[str] = None,
+                 retry_policy=None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 max_response_bytes: Optional[int] = None):
+        """
+        Parameters:
+            max_concurrency: Maximum number of leads validated at the same time.
+                             Also sizes the connection pool.
+            timeout: Total time per request in seconds, reading the response included.
+            primary_url: Live endpoint URL.
+            backup_url: Live backup endpoint URL, used when the primary fails.
+            trial_url: Trial endpoint URL, used when is_live is False.
+            cache: Optional LVCache answering repeated leads without a call.
+            response_class: Class whose from_dict builds the results, e.g. CompactLVResponse
+                            from lv_response_compact for large in-memory batches, or LazyLVResponse
+                            from lv_response_lazy when only a few fields are read.
+            hedge_after: Opt-in hedging for live calls. When the primary has not answered
+                         within this many seconds, the same request is also sent to the backup;
+                         the first valid response wins and the other request is cancelled.
+            health: Optional EndpointHealth (see endpoint_health.py), possibly shared with other
+                    clients. Every call is reported to it, and live calls go straight to the
+                    backup while the primary's circuit is open.
+            rate_limiter: Optional LicenseRateLimiter (see lv_rate_limit.py); every request,
+                          backup attempts included, waits for a token of its license key.
+            concurrency: Optional AsyncAdaptiveConcurrency (see lv_rate_limit.py) capping, and adapting,
+                         how many leads are validated at once.
+            observer: Optional LVObserver (see lv_instrumentation.py) receiving call and request
+                      events with endpoint, fallback reason, phase timings and response size.
+            precheck: Optional LeadPrecheck (see lv_precheck.py) run on every lead first. It answers
+                      leads with malformed values locally, or blanks those values, before any call.
+            single_flight: Optional AsyncSingleFlight (see lv_single_flight.py). Identical leads validated
+                           concurrently then share one call and receive the same response.
+            scheduler: Optional AsyncPriorityScheduler (see lv_scheduler.py), usually shared with other
+                       clients. Calls then wait for a slot of their priority class before going out.
+            priority: Priority class of this client's calls. Defaults to the scheduler's default class.
+            retry_policy: Optional RetryPolicy (see lv_retry.py) replacing the one primary and one
+                          backup attempt with retries that alternate between them, back off with
+                          jitter and fit in a total deadline. hedge_after is not used with it.
+            connect_timeout: Seconds to open a connection, TLS handshake included (see lv_timeouts.py).
+            read_timeout: Seconds to wait for the response to start, and between its chunks.
+            max_response_bytes: Largest response body accepted. Bodies are streamed and a larger
+                                one fails the request like a transport error.
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.primary_url = primary_url
+        self.backup_url = backup_url
+        self.trial_url = trial_url
+        self.cache = cache
+        self.response_class = response_class
+        self.hedge_after = hedge_after
+        self.health = health
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.observer = observer
+        self.precheck = precheck
+        self.single_flight = single_flight
+        self.scheduler = scheduler
+        self.priority = priority
+        self.retry_policy = retry_policy
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_response_bytes = max_response_bytes
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._session = None
+        self._semaphore = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions must be created inside the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                trace_configs=[_phase_trace_config()] if self.observer is not None else None,
+            )
+        return self._session
+
+    async def _get(self, url: str, params: dict, budget=None) -> dict:
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(params.get("LicenseKey"))
+            if delay:
+                await asyncio.sleep(delay)
+        # Under a retry policy the attempt's timeout depends on the time left after the rate limit
+        timeout = self.timeout if budget is None else budget.attempt_timeout(self.timeout)
+        fetch = self._fetch if self.observer is None else self._fetch_observed
+        if self.health is None:
+            return await fetch(url, params, timeout)
+        start = time.perf_counter()
+        try:
+            data = await fetch(url, params, timeout)
+        except _TRANSPORT_ERRORS as exc:
+            self.health.record_failure(url, exc)
+            raise
+        error = data.get('Error')
+        if error is not None and error.get('TypeCode') == "3":
+            self.health.record_failure(url, RuntimeError(f"LV service error: {error}"))
+        else:
+            self.health.record_success(url, time.perf_counter() - start)
+        return data
+
+    def _client_timeout(self, timeout: float) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=timeout, sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        if self.max_response_bytes is None:
+            return await response.read()
+        try:
+            check_length(response.headers.get("Content-Length"), self.max_response_bytes)
+            parts = []
+            size = 0
+            async for chunk in response.content.iter_chunked(_CHUNK_BYTES):
+                size += len(chunk)
+                if size > self.max_response_bytes:
+                    raise ResponseTooLarge(self.max_response_bytes)
+                parts.append(chunk)
+        except ResponseTooLarge as exc:
+            raise aiohttp.ClientPayloadError(str(exc)) from exc
+        return b"".join(parts)
+
+    async def _fetch(self, url: str, params: dict, timeout: float) -> dict:
+        try:
+            async with self._get_session().get(url, params=params,
+                                               timeout=self._client_timeout(timeout)) as response:
+                response.raise_for_status()
+                return loads(await self._read_body(response))
+        except asyncio.TimeoutError as exc:
+            raise _total_timeout(exc, timeout)
+
+    async def _fetch_observed(self, url: str, params: dict, timeout: float) -> dict:
+        start = time.perf_counter()
+        marks = {}
+        event = RequestEvent("rest-async", url, 0.0)
+        try:
+            try:
+                async with self._get_session().get(url, params=params, trace_request_ctx=marks,
+                                                   timeout=self._client_timeout(timeout)) as response:
+                    event.status = response.status
+                    response.raise_for_status()
+                    body = await self._read_body(response)
+            except asyncio.TimeoutError as exc:
+                raise _total_timeout(exc, timeout)
+            marks["received"] = time.perf_counter()
+            event.response_bytes = len(body)
+            data = loads(body)
+            event.phases["decode"] = time.perf_counter() - marks["received"]
+            error = data.get('Error')
+            if error is not None and error.get('TypeCode') == "3":
+                event.error = "Error.TypeCode=3"
+            return data
+        except Exception as exc:
+            event.error = error_label(exc)
+            raise
+        finally:
+            event.phases.update(_request_phases(start, marks))
+            event.duration = time.perf_counter() - start
+            record_request(self.observer, event)
+
+    def _build(self, data: dict) -> LVResponse:
+        if self.observer is None:
+            return self.response_class.from_dict(data)
+        start = time.perf_counter()
+        response = self.response_class.from_dict(data)
+        note_phase("build", time.perf_counter() - start)
+        return response
+
+    async def validate_lead_v3(self,
+                               full_name: str,
+                               salutation: str,
+                               first_name: str,
+                               last_name: str,
+                               business_name: str,
+                               business_domain: str,
+                               business_ein: str,
+                               address1: str,
+                               address2: str,
+                               address3: str,
+                               address4: str,
+                               address5: str,
+                               locality: str,
+                               admin_area: str,
+                               postal_code: str,
+                               country: str,
+                               phone1: str,
+                               phone2: str,
+                               email: str,
+                               ip_address: str,
+                               gender: str,
+                               date_of_birth: str,
+                               utc_capture_time: str,
+                               output_language: str,
+                               test_type: str,
+                               license_key: str,
+                               is_live: bool) -> LVResponse:
+        """
+        Asynchronously call the ValidateLead_V3 endpoint.
+
+        Takes the same arguments, and behaves the same, as validate_lead_v3 in validate_lead_v3_rest.
+
+        Returns:
+            LVResponse: Parsed JSON response with lead validation results or error details.
+
+        Raises:
+            RuntimeError: If the API returns an error payload or both endpoints are unreachable.
+        """
+        params = {
+            "FullName": full_name,
+            "Salutation": salutation,
+            "FirstName": first_name,
+            "LastName": last_name,
+            "BusinessName": business_name,
+            "BusinessDomain": business_domain,
+            "BusinessEIN": business_ein,
+            "Address1": address1,
+            "Address2": address2,
+            "Address3": address3,
+            "Address4": address4,
+            "Address5": address5,
+            "Locality": locality,
+            "AdminArea": admin_area,
+            "PostalCode": postal_code,
+            "Country": country,
+            "Phone1": phone1,
+            "Phone2": phone2,
+            "Email": email,
+            "IPAddress": ip_address,
+            "Gender": gender,
+            "DateOfBirth": date_of_birth,
+            "UTCCaptureTime": utc_capture_time,
+            "OutputLanguage": output_language,
+            "TestType": test_type,
+            "LicenseKey": license_key,
+        }
+        return await self.validate_params(params, is_live)
+
+    async def validate_params(self, params: dict, is_live: bool = True,
+                              priority: Optional[str] = None) -> LVResponse:
+        """
+        Asynchronously call the ValidateLead_V3 endpoint with an already built query parameter dict.
+
+        Parameters:
+            params: Query parameters as produced by build_params.
+            is_live: Use live or trial servers.
+            priority: Priority class of this call when the client has a scheduler.
+                      Defaults to the client's priority.
+
+        Returns:
+            LVResponse: Parsed JSON response with lead validation results or error details.
+
+        Raises:
+            RuntimeError: If the API returns an error payload or both endpoints are unreachable.
+        """
+        if self.precheck is not None:
+            params, rejection = self.precheck.apply(params)
+            if rejection is not None:
+                return self.response_class.from_dict(rejection)
+
+        if self.cache is not None:
+            cached = self.cache.get(params, is_live)
+            if cached is not None:
+                return cached
+
+        call = self._call if self.concurrency is None else self._call_adaptive
+        if self.observer is not None:
+            call = functools.partial(self._call_observed, call)
+        if self.scheduler is not None:
+            call = functools.partial(self._call_scheduled, call, self.priority if priority is None else priority)
+        if self.single_flight is None:
+            response = await call(params, is_live)
+        else:
+            response = await self.single_flight.do(params, lambda: call(params, is_live), is_live)
+        if self.cache is not None:
+            self.cache.put(params, response, is_live)
+        return response
+
+    async def _call_scheduled(self, call, priority: Optional[str], params: dict, is_live: bool) -> LVResponse:
+        await self.scheduler.acquire(priority)
+        try:
+            return await call(params, is_live)
+        finally:
+            self.scheduler.release(priority)
+
+    async def _call_observed(self, call, params: dict, is_live: bool) -> LVResponse:
+        token = begin_call(self.observer, "rest-async", is_live)
+        error = None
+        try:
+            return await call(params, is_live)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            end_call(self.observer, token, error)
+
+    async def _call_adaptive(self, params: dict, is_live: bool) -> LVResponse:
+        await self.concurrency.acquire()
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = await self._call(params, is_live)
+            ok = True
+            return response
+        finally:
+            await self.concurrency.release(time.perf_counter() - start, ok)
+
+    async def _call(self, params: dict, is_live: bool) -> LVResponse:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # requests silently drops None values; aiohttp rejects them
+        params = {key: value for key, value in params.items() if value is not None}
+        url = self.primary_url if is_live else self.trial_url
+
+        async with self._semaphore:
+            if self.retry_policy is not None:
+                return await self._call_retrying(params, is_live)
+
+            if is_live and self.health is not None and not self.health.allow(self.primary_url):
+                # The primary's circuit is open: skip straight to the backup
+                note_fallback("circuit_open")
+                return await self._call_backup(params)
+
+            if is_live and self.hedge_after is not None:
+                return await self._call_hedged(params)
+
+            try:
+                # Attempt primary (or trial) endpoint
+                data = await self._get(url, params)
+
+                # If API returned an error in JSON payload, trigger fallback
+                error = data.get('Error')
+                if not (error is None or error.get('TypeCode') != "3"):
+                    if is_live:
+                        # Try backup URL
+                        data = await self._get(self.backup_url, params)
+
+                        # If still error, propagate exception
+                        if 'Error' in data:
+                            raise RuntimeError(f"LV service error: {data['Error']}")
+                    else:
+                        # Trial mode error is terminal
+                        raise RuntimeError(f"LV trial error: {data['Error']}")
+
+                return self._build(data)
+
+            except _TRANSPORT_ERRORS as req_exc:
+                # Network, HTTP-level or decoding error occurred
+                if is_live:
+                    try:
+                        # Fallback to backup URL
+                        data = await self._get(self.backup_url, params)
+                        if "Error" in data:
+                            raise RuntimeError(f"LeadValidation backup error: {data['Error']}") from req_exc
+                        return self._build(data)
+                    except Exception as backup_exc:
+                        raise RuntimeError("LeadValidation service unreachable on both endpoints") from backup_exc
+                else:
+                    raise RuntimeError(f"LeadValidation trial error: {str(req_exc)}") from req_exc
+
+    async def _call_retrying(self, params: dict, is_live: bool) -> LVResponse:
+        budget = self.retry_policy.begin()
+        urls = (self.primary_url, self.backup_url) if is_live else (self.trial_url,)
+        while True:
+            url = urls[budget.attempts % len(urls)]
+            if url == self.primary_url and self.health is not None and not self.health.allow(url):
+                # The primary's circuit is open: this attempt goes to the backup
+                note_fallback("circuit_open")
+                url = self.backup_url
+            elif budget.attempts:
+                note_fallback("retry")
+            try:
+                data = await self._get(url, params, budget)
+            except aiohttp.ClientResponseError as exc:
+                delay = budget.failed(exc, "http", exc.status)
+            except _TRANSPORT_ERRORS as exc:
+                delay = budget.failed(exc, "transport")
+            else:
+                error = data.get('Error')
+                if error is None or error.get('TypeCode') != "3":
+                    return self._build(data)
+                delay = budget.failed(RuntimeError(f"LV service error: {error}"), "service")
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def _call_hedged(self, params: dict) -> LVResponse:
+        primary = asyncio.ensure_future(self._get(self.primary_url, params))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+            if done:
+                try:
+                    data = primary.result()
+                except _TRANSPORT_ERRORS:
+                    # The primary failed outright before the threshold: plain fallback
+                    return await self._call_backup(params)
+                error = data.get('Error')
+                if error is None or error.get('TypeCode') != "3":
+                    return self._build(data)
+                return await self._call_backup(params)
+
+            # Primary is slow: race it against the backup
+            self.hedges_fired += 1
+            note_fallback("hedge")
+            backup = asyncio.ensure_future(self._get(self.backup_url, params))
+            tasks.append(backup)
+            pending = {primary, backup}
+            last_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        data = task.result()
+                    except _TRANSPORT_ERRORS as exc:
+                        last_error = exc
+                        continue
+                    error = data.get('Error')
+                    valid = 'Error' not in data if task is backup else error is None or error.get('TypeCode') != "3"
+                    if not valid:
+                        last_error = RuntimeError(f"LV service error: {data['Error']}")
+                        continue
+                    if task is backup:
+                        self.hedges_won += 1
+                    return self._build(data)
+            raise RuntimeError("LeadValidation service unreachable on both endpoints") from last_error
+        finally:
+            # The loser of the race, or every request when the caller was cancelled or timed out
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _call_backup(self, params: dict) -> LVResponse:
+        try:
+            data = await self._get(self.backup_url, params)
+            if "Error" in data:
+                raise RuntimeError(f"LeadValidation backup error: {data['Error']}")
+            return self._build(data)
+        except Exception as backup_exc:
+            raise RuntimeError("LeadValidation service unreachable on both endpoints") from backup_exc
+
+    @property
+    def hedge_stats(self) -> dict:
+        """How often hedged requests were fired, and how often the backup answered first."""
+        return {"fired": self.hedges_fired, "won": self.hedges_won}
+
+    async def close(self) -> None:
+        """Close the pooled session held by the client."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncValidateLeadV3Client":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
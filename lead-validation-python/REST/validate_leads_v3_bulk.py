@@ -0,0 +1,111 @@
+from lv_response import LVResponse
+from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+
+# Error.Type and Error.TypeCode of leads that failed in this process, not at the service.
+# TypeCode "3" stays reserved for the service's own "not available" answer.
+LOCAL_ERROR_TYPE = "Client Error"
+LOCAL_ERROR_TYPE_CODE = "local"
+
+
+def _error_response(exc: Exception, response_class=LVResponse):
+    """
+    Wrap a failed call in a response so one bad lead does not abort the batch.
+
+    Error.DescCode is the exception's class, e.g. "RuntimeError" when both endpoints
+    failed, "DeadlineExceeded" or "ValueError", and Error.Desc its message.
+    """
+    return response_class.from_dict({
+        "Error": {
+            "Type": LOCAL_ERROR_TYPE,
+            "TypeCode": LOCAL_ERROR_TYPE_CODE,
+            "Desc": f"{type(exc).__name__}: {exc}",
+            "DescCode": type(exc).__name__,
+        },
+    })
+
+
+def validate_leads_v3(leads: Iterable[Mapping[str, str]],
+                      license_key: str,
+                      is_live: bool = True,
+                      workers: int = 8,
+                      ordered: bool = True,
+                      max_pending: Optional[int] = None,
+                      client: Optional[ValidateLeadV3Client] = None,
+                      priority: Optional[str] = None
+                      ) -> Iterator[Union[LVResponse, Tuple[int, LVResponse]]]:
+    """
+    Validate many leads concurrently over a thread pool.
+
+    Leads are read from the iterable lazily and only max_pending calls are queued
+    at once, so arbitrarily large inputs run in constant memory. A call that fails
+    yields a response whose Error has TypeCode LOCAL_ERROR_TYPE_CODE and the
+    exception class in DescCode, built with the client's response_class, instead
+    of raising.
+
+    Parameters:
+        leads: Leads keyed by the snake_case argument names of validate_lead_v3
+               (full_name, salutation, ..., test_type).
+        license_key: Your ServiceObjects license key.
+        is_live: Use live or trial servers.
+        workers: Number of worker threads, and of pooled connections per endpoint
+                 when the client is created here.
+        ordered: Yield results in input order. When False, results are yielded as
+                 they complete, as (input_index, LVResponse) pairs.
+        max_pending: Maximum number of submitted but not yet yielded calls.
+                     Defaults to four times the number of workers.
+        client: Client to send the calls through. Defaults to a new
+                ValidateLeadV3Client sized for the worker count, closed when done.
+        priority: Priority class of the calls, e.g. "batch", when the client has a
+                  PriorityScheduler (see lv_scheduler.py). Defaults to the client's priority.
+
+    Yields:
+        LVResponse, or (int, LVResponse) when ordered is False.
+    """
+    own_client = client is None
+    if own_client:
+        client = ValidateLeadV3Client(pool_size=workers)
+    if max_pending is None:
+        max_pending = workers * 4
+    # SOAP clients handed in as client have no response_class
+    response_class = getattr(client, "response_class", LVResponse)
+
+    def call(lead: Mapping[str, str]) -> LVResponse:
+        try:
+            params = build_params(lead, license_key)
+            if priority is None:
+                return client.validate_params(params, is_live)
+            return client.validate_params(params, is_live, priority=priority)
+        except Exception as exc:
+            return _error_response(exc, response_class)
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validate_leads_v3")
+    try:
+        if ordered:
+            pending = deque()
+            for lead in leads:
+                pending.append(pool.submit(call, lead))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        else:
+            pending = {}
+            for index, lead in enumerate(leads):
+                pending[pool.submit(call, lead)] = index
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+    finally:
+        # Drop queued calls if the caller stops iterating early
+        pool.shutdown(wait=True, cancel_futures=True)
+        if own_client:
+            client.close()
@@ -0,0 +1,160 @@
+"""
+Validate many leads across several worker processes.
+
+A single process tops out on CPU long before the service does: TLS, JSON
+decoding and building LVResponse objects all hold the GIL. validate_leads_v3_sharded
+splits the input into chunks and hands them to a pool of worker processes,
+each running validate_leads_v3 over its own pooled ValidateLeadV3Client. Chunks
+and results travel over the pool's pipes, and results are merged back in input
+order (or yielded as they complete).
+
+A rate limit given here is shared by every worker: the token bucket of each
+license key lives in a file (see lv_rate_limit.FileTokenBucket), so the workers
+together stay under the quota rather than each getting the full rate.
+"""
+from lv_response import LVResponse
+from lv_rate_limit import LicenseRateLimiter
+from validate_lead_v3_rest import ValidateLeadV3Client
+from validate_leads_v3_bulk import validate_leads_v3, _error_response
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+import itertools
+import os
+import shutil
+import tempfile
+
+# Set in each worker process by _init_worker
+_worker = None
+
+
+class _Worker:
+    def __init__(self, license_key: str, is_live: bool, threads: int, client_options: dict,
+                 rate_limit: Optional[float], rate_burst: Optional[float], rate_limit_dir: Optional[str]):
+        self.license_key = license_key
+        self.is_live = is_live
+        self.threads = threads
+        self.rate_limiter = None
+        if rate_limit is not None:
+            self.rate_limiter = LicenseRateLimiter(rate_limit, rate_burst, directory=rate_limit_dir)
+        options = dict(client_options)
+        options.setdefault("pool_size", threads)
+        self.client = ValidateLeadV3Client(rate_limiter=self.rate_limiter, **options)
+
+
+def _init_worker(*args) -> None:
+    global _worker
+    _worker = _Worker(*args)
+
+
+def _validate_chunk(chunk: List[Mapping[str, str]]) -> List[LVResponse]:
+    return list(validate_leads_v3(chunk, _worker.license_key, is_live=_worker.is_live,
+                                  workers=_worker.threads, client=_worker.client))
+
+
+def _chunks(leads: Iterable[Mapping[str, str]], size: int) -> Iterator[List[Mapping[str, str]]]:
+    leads = iter(leads)
+    while True:
+        chunk = list(itertools.islice(leads, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _results(future, chunk_size: int, response_class=LVResponse) -> List[LVResponse]:
+    # A worker that died (BrokenProcessPool) fails its whole chunk, not the batch
+    try:
+        return future.result()
+    except Exception as exc:
+        return [_error_response(exc, response_class)] * chunk_size
+
+
+def validate_leads_v3_sharded(leads: Iterable[Mapping[str, str]],
+                              license_key: str,
+                              is_live: bool = True,
+                              processes: Optional[int] = None,
+                              workers: int = 8,
+                              chunk_size: int = 64,
+                              ordered: bool = True,
+                              max_pending: Optional[int] = None,
+                              rate_limit: Optional[float] = None,
+                              rate_burst: Optional[float] = None,
+                              rate_limit_dir: Optional[str] = None,
+                              client_options: Optional[dict] = None
+                              ) -> Iterator[Union[LVResponse, Tuple[int, LVResponse]]]:
+    """
+    Validate many leads concurrently over a pool of worker processes.
+
+    Leads are read from the iterable lazily and only max_pending chunks are queued
+    at once, so arbitrarily large inputs run in constant memory. A call that fails
+    yields a response whose Error describes the failure instead of raising; see
+    validate_leads_v3.
+
+    Parameters:
+        leads: Leads keyed by the snake_case argument names of validate_lead_v3
+               (full_name, salutation, ..., test_type).
+        license_key: Your ServiceObjects license key.
+        is_live: Use live or trial servers.
+        processes: Number of worker processes. Defaults to the number of CPUs.
+        workers: Number of worker threads, and of pooled connections per endpoint,
+                 in each process.
+        chunk_size: Leads sent to a worker process at a time. Larger chunks cost
+                    fewer round trips over the pipes but hold more results back.
+        ordered: Yield results in input order. When False, results are yielded as
+                 their chunks complete, as (input_index, LVResponse) pairs.
+        max_pending: Maximum number of submitted but not yet yielded chunks.
+                     Defaults to twice the number of processes.
+        rate_limit: Calls per second allowed for the license key across all processes.
+        rate_burst: Calls that may go out back to back. Defaults to rate_limit.
+        rate_limit_dir: Directory holding the shared token bucket files. Defaults to a
+                        temporary directory removed when done; pass one to share the
+                        budget with other jobs on the machine too.
+        client_options: Keyword arguments for the ValidateLeadV3Client built in each
+                        process, e.g. timeout or hedge_after. They must be picklable.
+
+    Yields:
+        LVResponse, or (int, LVResponse) when ordered is False.
+    """
+    processes = processes or os.cpu_count() or 1
+    response_class = (client_options or {}).get("response_class", LVResponse)
+    if max_pending is None:
+        max_pending = processes * 2
+
+    own_dir = rate_limit is not None and rate_limit_dir is None
+    if own_dir:
+        rate_limit_dir = tempfile.mkdtemp(prefix="lv-rate-")
+
+    pool = ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                               initargs=(license_key, is_live, workers, client_options or {},
+                                         rate_limit, rate_burst, rate_limit_dir))
+    try:
+        if ordered:
+            pending = deque()
+            for chunk in _chunks(leads, chunk_size):
+                pending.append((pool.submit(_validate_chunk, chunk), len(chunk)))
+                if len(pending) >= max_pending:
+                    yield from _results(*pending.popleft(), response_class)
+            while pending:
+                yield from _results(*pending.popleft(), response_class)
+        else:
+            pending = {}
+            start = 0
+
+            def drain():
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    first, size = pending.pop(future)
+                    yield from enumerate(_results(future, size, response_class), first)
+
+            for chunk in _chunks(leads, chunk_size):
+                pending[pool.submit(_validate_chunk, chunk)] = (start, len(chunk))
+                start += len(chunk)
+                if len(pending) >= max_pending:
+                    yield from drain()
+            while pending:
+                yield from drain()
+    finally:
+        # Drop queued chunks if the caller stops iterating early
+        pool.shutdown(wait=True, cancel_futures=True)
+        if own_dir:
+            shutil.rmtree(rate_limit_dir, ignore_errors=True)
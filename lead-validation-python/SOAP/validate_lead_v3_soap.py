@@ -1,33 +1,426 @@
-from suds.client import Client
+from suds.client import Client, ServiceSelector
 from suds import WebFault
-from suds.sudsobject import Object
+from suds.cache import ObjectCache
+from suds.options import Options
+from suds.transport import TransportError
+from suds.transport.https import HttpAuthenticated
+from suds.sudsobject import Object, Factory
+from suds.plugin import MessagePlugin
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+import contextvars
+import functools
+import http.client
+import socket
+import threading
+import time
+import urllib.request
+
+# Bytes read from the socket at a time while reading a reply under a size cap or total timeout
+_CHUNK_BYTES = 65536
+
+# The side of a hedged race the current call belongs to, if any (see _HedgeAttempt)
+_hedge_attempt = contextvars.ContextVar("lv_soap_hedge_attempt", default=None)
+
+
+def _to_plain(value):
+    """Convert a suds result into picklable dicts and lists so it can be cached."""
+    if isinstance(value, Object):
+        plain = {name: _to_plain(item) for name, item in value}
+        plain["__class__"] = value.__class__.__name__
+        return plain
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, str):
+        return str(value)
+    return value
+
+
+def _from_plain(value):
+    """Rebuild the attribute-style suds result stored by _to_plain."""
+    if isinstance(value, dict):
+        items = {name: _from_plain(item) for name, item in value.items() if name != "__class__"}
+        return Factory.object(value.get("__class__"), items)
+    if isinstance(value, list):
+        return [_from_plain(item) for item in value]
+    return value
+
+
+def _clone_client(client: Client, transport=None, **options) -> Client:
+    """
+    Copy a suds Client so it shares the parsed WSDL but has its own options and transport.
+
+    Stands in for Client.clone(), whose deep copy of the options recurses
+    without end on current suds-community releases.
+    """
+    clone = Client.__new__(Client)
+    clone.options = Options()
+    clone.options.transport = transport if transport is not None else HttpAuthenticated()
+    clone.set_options(**options)
+    clone.wsdl = client.wsdl
+    clone.factory = client.factory
+    clone.service = ServiceSelector(clone, client.wsdl.services)
+    clone.sd = client.sd
+    clone.messages = dict(tx=None, rx=None)
+    return clone
+
+
+def _http_status(ex: Exception):
+    """HTTP status behind a suds failure, or None for transport errors."""
+    if isinstance(ex, WebFault):
+        # Faults come with status 500
+        return 500
+    if isinstance(ex, TransportError):
+        return ex.httpcode
+    # suds reports other non-200 replies as Exception((status, reason))
+    if type(ex) is Exception and ex.args and isinstance(ex.args[0], tuple) and isinstance(ex.args[0][0], int):
+        return ex.args[0][0]
+    return None
+
+
+class _HedgeAttempt:
+    """
+    One call of a hedged race, which the winner can stop wherever it has got to.
+
+    The connections of _PhasedTransport register their socket once connected.
+    abort() shuts that socket down, which ends a blocked wait for the reply at
+    once; a call that has not connected yet fails as soon as it has.
+    """
+
+    def __init__(self):
+        self.aborted = False
+        self._sock = None
+        self._lock = threading.Lock()
+
+    def connected(self, sock) -> None:
+        with self._lock:
+            if self.aborted:
+                raise ConnectionAbortedError("Hedged call lost the race")
+            self._sock = sock
+
+    def abort(self) -> None:
+        with self._lock:
+            self.aborted = True
+            if self._sock is not None:
+                try:
+                    # The plain socket's shutdown, so a TLS socket is not torn down under its reader
+                    socket.socket.shutdown(self._sock, socket.SHUT_RDWR)
+                except OSError:
+                    # Already closed: the call has finished
+                    pass
+
+
+def _hedge_lost() -> bool:
+    attempt = _hedge_attempt.get()
+    return attempt is not None and attempt.aborted
+
+
+class _PhasedConnectionMixin:
+    def connect(self):
+        super().connect()
+        if self.deadline is not None:
+            self.deadline.sock = self.sock
+            self.deadline.clamp()
+        attempt = _hedge_attempt.get()
+        if attempt is not None:
+            attempt.connected(self.sock)
+
+
+class _PhasedHTTPConnection(_PhasedConnectionMixin, http.client.HTTPConnection):
+    """
+    Connection opened within its timeout whose socket then waits up to the read
+    timeout per read, and never past the request's Deadline (see lv_timeouts.py).
+    A hedged call's socket is registered with its _HedgeAttempt.
+    """
+
+    def __init__(self, *args, deadline=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deadline = deadline
+
+
+class _PhasedHTTPSConnection(_PhasedConnectionMixin, http.client.HTTPSConnection):
+    """HTTPS counterpart of _PhasedHTTPConnection; the TLS handshake counts towards the connect timeout."""
+
+    def __init__(self, *args, deadline=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deadline = deadline
+
+
+class _PhasedHTTPHandler(urllib.request.HTTPHandler):
+    def __init__(self, deadline):
+        super().__init__()
+        self.deadline = deadline
+
+    def http_open(self, req):
+        return self.do_open(_PhasedHTTPConnection, req, deadline=self.deadline)
+
+
+class _PhasedHTTPSHandler(urllib.request.HTTPSHandler):
+    def __init__(self, deadline):
+        super().__init__()
+        self.deadline = deadline
+
+    def https_open(self, req):
+        return self.do_open(_PhasedHTTPSConnection, req, context=self._context, deadline=self.deadline)
+
+
+class _LimitedReply:
+    """urllib reply whose read() gives up past max_bytes or the total deadline."""
+
+    def __init__(self, fp, limits, max_bytes: int, deadline):
+        self._fp = fp
+        self._limits = limits
+        self._max_bytes = max_bytes
+        self._deadline = deadline
+
+    def __getattr__(self, name):
+        # headers, info(), close() and the rest come from the underlying reply
+        return getattr(self._fp, name)
+
+    def read(self, amt: int = None) -> bytes:
+        if amt is not None:
+            return self._fp.read(amt)
+        self._limits.check_length(self._fp.headers.get("Content-Length"), self._max_bytes)
+        deadline = self._deadline
+        chunks = deadline.chunks(iter(functools.partial(self._fp.read1, _CHUNK_BYTES), b""))
+        return self._limits.read_limited(chunks, self._max_bytes, deadline.at, deadline.timeout)
+
+
+class _PhasedTransport(HttpAuthenticated):
+    """
+    suds transport with separate connect and read timeouts, and a total timeout
+    and size cap on the reply body. suds itself has one timeout per socket operation.
+    Without limits it keeps suds' timeout and only lets a hedged call be stopped.
+    """
+
+    def __init__(self, limits=None, connect_timeout: float = None, read_timeout: float = None,
+                 max_response_bytes: int = None):
+        super().__init__()
+        self._limits = limits
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._max_response_bytes = max_response_bytes
+        self._deadline = None
+
+    def u2handlers(self):
+        # Replace urllib's default HTTP(S) handlers with ones clamping reads to the deadline
+        return super().u2handlers() + [_PhasedHTTPHandler(self._deadline), _PhasedHTTPSHandler(self._deadline)]
+
+    def u2open(self, u2request, timeout=None):
+        if self._limits is None:
+            self._deadline = None
+            return super().u2open(u2request, timeout)
+        total = timeout or self.options.timeout
+        # Started before connecting, so the connect, the wait for the headers and the body all fit
+        # in the total, which shrinks under a retry policy's deadline
+        deadline = self._deadline = self._limits.Deadline(total, self._read_timeout)
+        connect = min(self._connect_timeout or total, total)
+        try:
+            fp = self.u2opener().open(u2request, timeout=connect)
+        except Exception as ex:
+            if deadline.is_total(ex):
+                raise self._limits.TotalTimeout(total) from ex
+            raise
+        return _LimitedReply(fp, self._limits, self._max_response_bytes, deadline)
+
+
+class _PhasePlugin(MessagePlugin):
+    """suds plugin stamping, per thread, when a call's request is sent, its reply arrives and is parsed."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def begin(self) -> dict:
+        marks = self._local.marks = {"start": time.perf_counter()}
+        return marks
+
+    def _mark(self, name: str) -> None:
+        marks = getattr(self._local, "marks", None)
+        if marks is not None:
+            marks[name] = time.perf_counter()
+
+    def sending(self, context):
+        self._mark("sent")
+
+    def received(self, context):
+        self._mark("received")
+        marks = getattr(self._local, "marks", None)
+        if marks is not None:
+            marks["bytes"] = len(context.reply or b"")
+
+    def parsed(self, context):
+        self._mark("parsed")
+
+
+def _soap_phases(marks: dict, end: float) -> dict:
+    phases = {}
+    order = [("serialize", "start", "sent"), ("server", "sent", "received"),
+             ("parse", "received", "parsed"), ("unmarshal", "parsed", None)]
+    for phase, begin, finish in order:
+        if begin in marks and (finish is None or finish in marks):
+            phases[phase] = (marks[finish] if finish else end) - marks[begin]
+    return phases
 
 
 class ValidateLeadV3Soap:
-    def __init__(self, license_key: str, is_live: bool = True, timeout_ms: int = 15000):
+    def __init__(self,
+                 license_key: str,
+                 is_live: bool = True,
+                 timeout_ms: int = 15000,
+                 cache=None,
+                 wsdl_path: str = None,
+                 wsdl_cache_dir: str = None,
+                 wsdl_cache_days: int = 30,
+                 hedge_after: float = None,
+                 health=None,
+                 rate_limiter=None,
+                 concurrency=None,
+                 observer=None,
+                 primary_wsdl: str = None,
+                 backup_wsdl: str = None,
+                 single_flight=None,
+                 retry_policy=None,
+                 connect_timeout_ms: int = None,
+                 read_timeout_ms: int = None,
+                 max_response_bytes: int = None,
+                 hedge_workers: int = 16):
         """
+        The suds clients for the primary and backup WSDLs are built on first use and
+        reused by every later call; each thread works on its own cheap copy of them.
+
         Parameters:
             license_key: Service Objects LV license key.
             is_live: Whether to use live or trial endpoints.
-            timeout_ms: SOAP call timeout in milliseconds.
+            timeout_ms: Total time per SOAP call in milliseconds, reading the reply included.
+                        Without the settings below suds applies it to each socket operation instead.
+            cache: Optional LVCache (see REST/lv_cache.py) answering repeated leads without a call.
+            wsdl_path: Local copy of the LV WSDL. When set, the WSDL is read from this file
+                       and calls go to its port address, on the primary/backup host.
+            wsdl_cache_dir: Directory for a persistent cache of the parsed WSDL, so later
+                            processes start without fetching it.
+            wsdl_cache_days: Days a WSDL in wsdl_cache_dir stays valid.
+            hedge_after: Opt-in hedging for live calls. When the primary has not answered
+                         within this many seconds, the same request is also sent to the backup
+                         and the first valid response wins; the losing call's connection is
+                         shut down. Set it near the primary's p95 latency.
+            health: Optional EndpointHealth (see REST/endpoint_health.py), possibly shared with
+                    other clients. Every call is reported to it, and live calls go straight to
+                    the backup while the primary's circuit is open.
+            rate_limiter: Optional LicenseRateLimiter (see REST/lv_rate_limit.py); every call,
+                          backup attempts included, waits for a token of the license key.
+            concurrency: Optional AdaptiveConcurrency (see REST/lv_rate_limit.py) capping, and
+                         adapting, how many leads are validated at once.
+            observer: Optional LVObserver (see REST/lv_instrumentation.py) receiving call and
+                      request events with endpoint, fallback reason, phase timings and reply size.
+            primary_wsdl: WSDL URL overriding the live or trial primary, e.g. a local stub.
+            backup_wsdl: WSDL URL overriding the live or trial backup.
+            single_flight: Optional SingleFlight (see REST/lv_single_flight.py). Identical leads
+                           validated concurrently then share one call and receive the same reply.
+            retry_policy: Optional RetryPolicy (see REST/lv_retry.py) replacing the one primary and
+                          one backup attempt with retries that alternate between them, back off
+                          with jitter and fit in a total deadline. hedge_after is not used with it.
+            connect_timeout_ms: Milliseconds to open a connection, TLS handshake included
+                                (see REST/lv_timeouts.py).
+            read_timeout_ms: Milliseconds to wait for the reply to start, and between its chunks.
+            max_response_bytes: Largest reply body accepted. A larger one fails the call like a
+                                transport error.
+            hedge_workers: Most primary and backup calls of hedged calls in flight at once.
+                           Size it to twice the number of threads calling the client.
         """
         
         self.is_live = is_live
         self._timeout_s = timeout_ms / 1000.0
         self.license_key = license_key
+        self.cache = cache
 
         # WSDL URLs
-        self._primary_wsdl = (
+        self._primary_wsdl = primary_wsdl or (
             "https://sws.serviceobjects.com/lv/soap.svc?wsdl"
             if is_live
             else "https://trial.serviceobjects.com/lv/soap.svc?wsdl"
         )
-        self._backup_wsdl = (
+        self._backup_wsdl = backup_wsdl or (
             "https://swsbackup.serviceobjects.com/lv/soap.svc?wsdl"
             if is_live
             else "https://trial.serviceobjects.com/lv/soap.svc?wsdl"
         )
 
+        self._wsdl_path = wsdl_path
+        self._wsdl_cache_dir = wsdl_cache_dir
+        self._wsdl_cache_days = wsdl_cache_days
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._local = threading.local()
+
+        self.health = health
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.observer = observer
+        self.single_flight = single_flight
+        self.retry_policy = retry_policy
+        self._connect_timeout_s = connect_timeout_ms / 1000.0 if connect_timeout_ms else None
+        self._read_timeout_s = read_timeout_ms / 1000.0 if read_timeout_ms else None
+        self.max_response_bytes = max_response_bytes
+        self._phased = bool(connect_timeout_ms or read_timeout_ms or max_response_bytes)
+        self._instrumentation = None
+        self._timeouts = None
+        self._phase_plugin = None
+        if observer is not None:
+            # Imported only when used, from REST/ like the observer itself
+            import lv_instrumentation
+            self._instrumentation = lv_instrumentation
+            self._phase_plugin = _PhasePlugin()
+        if observer is not None or self._phased:
+            import lv_timeouts
+            self._timeouts = lv_timeouts
+        self.hedge_after = hedge_after if is_live else None
+        self.hedge_workers = hedge_workers
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self._hedge_pool = None
+        self._hedge_lock = threading.Lock()
+
+    def _client(self, wsdl: str) -> Client:
+        """Return this thread's client for wsdl, parsing the WSDL only once per instance."""
+        clients = getattr(self._local, "clients", None)
+        if clients is None:
+            clients = self._local.clients = {}
+        client = clients.get(wsdl)
+        if client is None:
+            # Copies share the parsed WSDL but not options or transport, so threads never share state
+            shared, options = self._shared_client(wsdl)
+            transport = None
+            if self._phased:
+                transport = _PhasedTransport(self._timeouts, self._connect_timeout_s, self._read_timeout_s,
+                                             self.max_response_bytes)
+            elif self.hedge_after is not None:
+                transport = _PhasedTransport()
+            client = clients[wsdl] = _clone_client(shared, transport, **options)
+        return client
+
+    def _shared_client(self, wsdl: str):
+        with self._clients_lock:
+            entry = self._clients.get(wsdl)
+            if entry is None:
+                options = dict(timeout=self._timeout_s)
+                if self._wsdl_cache_dir:
+                    options["cache"] = ObjectCache(location=self._wsdl_cache_dir, days=self._wsdl_cache_days)
+                if self._phase_plugin is not None:
+                    options["plugins"] = [self._phase_plugin]
+                if not self._wsdl_path:
+                    entry = self._clients[wsdl] = (Client(wsdl, **options), options)
+                    return entry
+                client = Client(Path(self._wsdl_path).resolve().as_uri(), **options)
+                # The local copy names the primary's port address; keep its path and send
+                # the calls to the host this WSDL URL stands for (backup or trial)
+                port = urlsplit(client.wsdl.services[0].ports[0].location)
+                host = urlsplit(wsdl)
+                options["location"] = urlunsplit((host.scheme, host.netloc, port.path, port.query, ""))
+                client.set_options(location=options["location"])
+                entry = self._clients[wsdl] = (client, options)
+            return entry
+
     def validate_lead_v3(self,
                         full_name: str,
                         salutation: str,
@@ -121,10 +514,78 @@ class ValidateLeadV3Soap:
             LicenseKey=self.license_key,
         )
 
+        call = self._call if self.concurrency is None else self._call_adaptive
+        if self.observer is not None:
+            call = self._observed(call)
+        if self.single_flight is not None:
+            call = self._coalesced(call)
+        if self.cache is None:
+            return call(call_kwargs)
+
+        cached = self.cache.get(call_kwargs, self.is_live)
+        if cached is not None:
+            return _from_plain(cached)
+        response = call(call_kwargs)
+        if not getattr(response, "Error", None):
+            self.cache.put(call_kwargs, _to_plain(response), self.is_live)
+        return response
+
+    def _coalesced(self, call):
+        def coalesced_call(call_kwargs: dict) -> Object:
+            return self.single_flight.do(call_kwargs, lambda: call(call_kwargs), self.is_live)
+        return coalesced_call
+
+    def _observed(self, call):
+        instrumentation = self._instrumentation
+
+        def observed_call(call_kwargs: dict) -> Object:
+            token = instrumentation.begin_call(self.observer, "soap", self.is_live)
+            error = None
+            try:
+                return call(call_kwargs)
+            except Exception as ex:
+                error = ex
+                raise
+            finally:
+                instrumentation.end_call(self.observer, token, error)
+        return observed_call
+
+    def _call_adaptive(self, call_kwargs: dict) -> Object:
+        self.concurrency.acquire()
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = self._call(call_kwargs)
+            ok = True
+            return response
+        finally:
+            self.concurrency.release(time.perf_counter() - start, ok)
+
+    def _call(self, call_kwargs: dict) -> Object:
+        if self.retry_policy is not None:
+            return self._call_retrying(call_kwargs)
+
+        if self.is_live and self.health is not None and not self.health.allow(self._primary_wsdl):
+            # The primary's circuit is open: skip straight to the backup
+            if self._instrumentation is not None:
+                self._instrumentation.note_fallback("circuit_open")
+            try:
+                response = self._invoke(self._backup_wsdl, call_kwargs)
+                if response is None:
+                    raise ValueError("Backup returned no result")
+                return response
+            except (WebFault, Exception) as backup_ex:
+                raise RuntimeError(
+                    "Primary skipped while its circuit is open.\n"
+                    f"Backup error: {str(backup_ex)}"
+                )
+
+        if self.hedge_after is not None:
+            return self._call_hedged(call_kwargs)
+
         # Attempt primary
         try:
-            client = Client(self._primary_wsdl, timeout=self._timeout_s)
-            response = client.service.ValidateLead_V3(**call_kwargs)
+            response = self._invoke(self._primary_wsdl, call_kwargs)
 
             # If response is None or fatal error code, trigger fallback
             if response is None or (hasattr(response, "Error") and response.Error and response.Error.TypeCode == "3"):
@@ -135,8 +596,7 @@ class ValidateLeadV3Soap:
         except (WebFault, ValueError, Exception) as primary_ex:
             # Attempt backup
             try:
-                client = Client(self._backup_wsdl, timeout=self._timeout_s)
-                response = client.service.ValidateLead_V3(**call_kwargs)
+                response = self._invoke(self._backup_wsdl, call_kwargs)
                 if response is None:
                     raise ValueError("Backup returned no result")
                 return response
@@ -147,3 +607,166 @@ class ValidateLeadV3Soap:
                     f"Backup error: {str(backup_ex)}"
                 )
                 raise RuntimeError(msg)
+
+    def _call_retrying(self, call_kwargs: dict) -> Object:
+        budget = self.retry_policy.begin()
+        wsdls = (self._primary_wsdl, self._backup_wsdl)
+        while True:
+            wsdl = wsdls[budget.attempts % 2]
+            if wsdl == self._primary_wsdl and self.health is not None and not self.health.allow(wsdl):
+                # The primary's circuit is open: this attempt goes to the backup
+                self._note_fallback("circuit_open")
+                wsdl = self._backup_wsdl
+            elif budget.attempts:
+                self._note_fallback("retry")
+            try:
+                response = self._invoke(wsdl, call_kwargs, budget)
+            except Exception as ex:
+                status = _http_status(ex)
+                delay = budget.failed(ex, "transport") if status is None else budget.failed(ex, "http", status)
+            else:
+                if response is not None and not (getattr(response, "Error", None) and response.Error.TypeCode == "3"):
+                    return response
+                delay = budget.failed(ValueError("No result or Error.TypeCode=3"), "service")
+            if delay:
+                time.sleep(delay)
+
+    def _note_fallback(self, reason: str) -> None:
+        if self._instrumentation is not None:
+            self._instrumentation.note_fallback(reason)
+
+    def _invoke(self, wsdl: str, call_kwargs: dict, budget=None) -> Object:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(self.license_key)
+        # Under a retry policy the attempt's timeout depends on the time left after the rate limit
+        timeout = self._timeout_s if budget is None else budget.attempt_timeout(self._timeout_s)
+        send = self._send if self.observer is None else self._send_observed
+        if self.health is None:
+            return send(wsdl, call_kwargs, timeout)
+        start = time.perf_counter()
+        try:
+            response = send(wsdl, call_kwargs, timeout)
+        except Exception as ex:
+            # A hedge that lost the race was stopped by the client, not failed by the endpoint
+            if not _hedge_lost():
+                self.health.record_failure(wsdl, ex)
+            raise
+        if response is None or (getattr(response, "Error", None) and response.Error.TypeCode == "3"):
+            self.health.record_failure(wsdl, ValueError("No result or Error.TypeCode=3"))
+        else:
+            self.health.record_success(wsdl, time.perf_counter() - start)
+        return response
+
+    def _client_for(self, wsdl: str, timeout: float) -> Client:
+        client = self._client(wsdl)
+        # Each thread has its own copy, so the timeout can change per attempt
+        if client.options.timeout != timeout:
+            client.set_options(timeout=timeout)
+        return client
+
+    def _send(self, wsdl: str, call_kwargs: dict, timeout: float) -> Object:
+        return self._client_for(wsdl, timeout).service.ValidateLead_V3(**call_kwargs)
+
+    def _send_observed(self, wsdl: str, call_kwargs: dict, timeout: float) -> Object:
+        client = self._client_for(wsdl, timeout)
+        marks = self._phase_plugin.begin()
+        event = self._instrumentation.RequestEvent("soap", wsdl, 0.0)
+        try:
+            response = client.service.ValidateLead_V3(**call_kwargs)
+            if response is None or (getattr(response, "Error", None) and response.Error.TypeCode == "3"):
+                event.error = "Error.TypeCode=3" if response is not None else "NoResult"
+            return response
+        except Exception as ex:
+            event.error = "hedge_lost" if _hedge_lost() else self._timeouts.error_label(ex)
+            raise
+        finally:
+            end = time.perf_counter()
+            event.phases = _soap_phases(marks, end)
+            event.response_bytes = marks.get("bytes", 0)
+            event.duration = end - marks["start"]
+            self._instrumentation.record_request(self.observer, event)
+
+    def _call_hedged(self, call_kwargs: dict) -> Object:
+        with self._hedge_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=self.hedge_workers, thread_name_prefix="lv-hedge")
+            pool = self._hedge_pool
+
+        attempts = {}
+
+        def submit(wsdl: str):
+            # Run in a copy of this context so instrumentation attributes the requests to this call
+            attempt = _HedgeAttempt()
+            future = pool.submit(contextvars.copy_context().run, self._invoke_hedged, attempt, wsdl, call_kwargs)
+            attempts[future] = attempt
+            return future
+
+        primary = submit(self._primary_wsdl)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if not done:
+            # Primary is slow: race it against the backup
+            with self._hedge_lock:
+                self.hedges_fired += 1
+            if self._instrumentation is not None:
+                self._instrumentation.note_fallback("hedge")
+            backup = submit(self._backup_wsdl)
+            pending = {primary, backup}
+        else:
+            backup = None
+            pending = {primary}
+        hedged = backup is not None
+
+        errors = {}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = "Backup" if future is backup else "Primary"
+                try:
+                    response = future.result()
+                except Exception as ex:
+                    errors[name] = ex
+                    continue
+                if response is None:
+                    errors[name] = ValueError(f"{name} returned no result")
+                    continue
+                if future is primary and getattr(response, "Error", None) and response.Error.TypeCode == "3":
+                    errors[name] = ValueError("Primary returned no result or Error.TypeCode=3")
+                    continue
+                if future is backup and hedged:
+                    with self._hedge_lock:
+                        self.hedges_won += 1
+                # Stop the loser: drop it if still queued, otherwise shut its connection down
+                for loser in pending:
+                    loser.cancel()
+                    attempts[loser].abort()
+                return response
+
+            if not pending and backup is None:
+                # Primary failed before the threshold: plain fallback
+                backup = submit(self._backup_wsdl)
+                pending = {backup}
+
+        msg = (
+            "Both primary and backup endpoints failed.\n"
+            f"Primary error: {str(errors.get('Primary'))}\n"
+            f"Backup error: {str(errors.get('Backup'))}"
+        )
+        raise RuntimeError(msg)
+
+    def _invoke_hedged(self, attempt: _HedgeAttempt, wsdl: str, call_kwargs: dict) -> Object:
+        # Runs in its own context copy, so the attempt is only seen by this call
+        _hedge_attempt.set(attempt)
+        return self._invoke(wsdl, call_kwargs)
+
+    @property
+    def hedge_stats(self) -> dict:
+        """How often hedged requests were fired, and how often the backup answered first."""
+        with self._hedge_lock:
+            return {"fired": self.hedges_fired, "won": self.hedges_won}
+
+    def close(self) -> None:
+        """Release the threads used for hedged calls."""
+        with self._hedge_lock:
+            pool, self._hedge_pool = self._hedge_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,725 @@
+"""
+Concurrent ValidateLead_V3 SOAP clients that bypass suds on the request path.
+
+ValidateLeadV3Soap builds a suds request object graph for every call, sends it
+over a fresh urllib connection and unmarshals the reply through the WSDL schema.
+The clients here fill a pre-rendered ValidateLead_V3 envelope, post it over a
+pooled keep-alive connection, and read the reply with an incremental XML parser
+straight into the same attribute-style suds objects ValidateLeadV3Soap returns.
+
+ValidateLeadV3SoapPooled is blocking and safe to share across threads, e.g. the
+workers of a ThreadPoolExecutor or of REST/validate_leads_v3_bulk.py, whose
+client argument it can stand in for. AsyncValidateLeadV3SoapPooled does the same
+on asyncio over aiohttp. Both keep ValidateLeadV3Soap's failover: a primary
+that fails, answers nothing or answers Error.TypeCode "3" is retried on the backup.
+"""
+from validate_lead_v3_soap import _CHUNK_BYTES, _from_plain
+from suds.sudsobject import Object
+from typing import Optional
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import asyncio
+import time
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Timeout
+
+# Port addresses of the ValidateLead_V3 SOAP endpoints, as in the service WSDL
+primary_url = "https://sws.serviceobjects.com/LV/soap.svc/SOAP"
+backup_url = "https://swsbackup.serviceobjects.com/LV/soap.svc/SOAP"
+trial_url = "https://trial.serviceobjects.com/LV/soap.svc/SOAP"
+# (primary, backup) by is_live; trial keys have no backup, so a failed trial call is retried on trial
+_ENDPOINTS = {True: (primary_url, backup_url), False: (trial_url, trial_url)}
+
+# Target namespace and SOAPAction of the service's ILVSoapService contract
+_NS = "http://www.serviceobjects.com"
+_SOAP_ACTION = f'"{_NS}/ILVSoapService/ValidateLead_V3"'
+_HEADERS = {"Content-Type": "text/xml; charset=utf-8", "SOAPAction": _SOAP_ACTION}
+_ENVELOPE_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+_FAULT = f"{{{_ENVELOPE_NS}}}Fault"
+
+# Request elements, in the order of the WSDL's xs:sequence
+REQUEST_FIELDS = (
+    "FullName", "Salutation", "FirstName", "LastName", "BusinessName", "BusinessDomain",
+    "BusinessEIN", "Address1", "Address2", "Address3", "Address4", "Address5", "Locality",
+    "AdminArea", "PostalCode", "Country", "Phone1", "Phone2", "Email", "IPAddress", "Gender",
+    "DateOfBirth", "UTCCaptureTime", "OutputLanguage", "TestType", "LicenseKey",
+)
+
+# The envelope with one str.format slot per request field, rendered once at import
+_ENVELOPE = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    f'<soap:Envelope xmlns:soap="{_ENVELOPE_NS}"><soap:Body>'
+    f'<ValidateLead_V3 xmlns="{_NS}">'
+    + "".join(f"<{name}>{{}}</{name}>" for name in REQUEST_FIELDS)
+    + "</ValidateLead_V3></soap:Body></soap:Envelope>"
+)
+
+# Complex reply elements and the suds class names ValidateLeadV3Soap gives them
+_COMPLEX_TYPES = {
+    "ValidateLead_V3Result": "ContactInternational",
+    "PhoneContact": "PhoneContact",
+    "InformationComponents": "ArrayOfInformationComponent",
+    "InformationComponent": "InformationComponent",
+    "Error": "Error",
+}
+# Elements that may repeat, gathered into a list as suds does for maxOccurs="unbounded"
+_REPEATED = frozenset(("InformationComponent",))
+
+
+def render_envelope(call_kwargs: dict) -> bytes:
+    """Fill the ValidateLead_V3 request envelope with call_kwargs, keyed by REQUEST_FIELDS."""
+    get = call_kwargs.get
+    return _ENVELOPE.format(*(escape(str(get(name) or "")) for name in REQUEST_FIELDS)).encode("utf-8")
+
+
+class ReplyParser:
+    """
+    Incremental parser of a ValidateLead_V3 SOAP reply.
+
+    Feed it the body as it arrives; close() returns the ValidateLead_V3Result as the
+    plain dicts and lists of ValidateLeadV3Soap's cache format, or None when the reply
+    has no result. A SOAP fault raises ValueError.
+    """
+
+    def __init__(self):
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        # Plain dicts of the complex elements open inside the result
+        self._stack = []
+        self._result = None
+        self._fault = None
+
+    def feed(self, data: bytes) -> None:
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self) -> Optional[dict]:
+        self._parser.close()
+        self._drain()
+        if self._fault is not None:
+            raise ValueError(f"SOAP fault: {self._fault}")
+        return self._result
+
+    def _drain(self) -> None:
+        stack = self._stack
+        for event, element in self._parser.read_events():
+            tag = element.tag.rpartition("}")[2]
+            if event == "start":
+                cls = _COMPLEX_TYPES.get(tag)
+                if cls is not None and (stack or tag == "ValidateLead_V3Result"):
+                    stack.append({"__class__": cls})
+                continue
+
+            if not stack:
+                if element.tag == _FAULT:
+                    self._fault = _fault_string(element)
+                continue
+            if tag in _COMPLEX_TYPES:
+                value = stack.pop()
+                if len(value) == 1:
+                    # Nil or empty: suds returns None for a complex element without children
+                    value = None
+                if not stack:
+                    self._result = value
+                    continue
+            else:
+                # Empty elements come back as None, like suds returns them
+                value = element.text or None
+            parent = stack[-1]
+            if tag in _REPEATED:
+                parent.setdefault(tag, []).append(value)
+            else:
+                parent[tag] = value
+            element.clear()
+
+
+def parse_reply(body: bytes) -> Optional[dict]:
+    """Parse a complete ValidateLead_V3 SOAP reply; see ReplyParser."""
+    parser = ReplyParser()
+    parser.feed(body)
+    return parser.close()
+
+
+def _fault_string(fault: ElementTree.Element) -> str:
+    return fault.findtext("faultstring") or "unknown"
+
+
+def _is_fault(body: bytes) -> bool:
+    """Whether body is a SOAP envelope whose Body holds a soap:Fault."""
+    try:
+        envelope = ElementTree.fromstring(body)
+    except ElementTree.ParseError:
+        return False
+    return envelope.find(f"{{{_ENVELOPE_NS}}}Body/{_FAULT}") is not None
+
+
+def _unavailable(plain: Optional[dict]) -> bool:
+    """Whether a reply calls for the backup: no result, or Error.TypeCode "3"."""
+    if plain is None:
+        return True
+    error = plain.get("Error")
+    return bool(error) and error.get("TypeCode") == "3"
+
+
+def _call_kwargs(license_key: str, **fields) -> dict:
+    return {
+        "FullName": fields["full_name"],
+        "Salutation": fields["salutation"],
+        "FirstName": fields["first_name"],
+        "LastName": fields["last_name"],
+        "BusinessName": fields["business_name"],
+        "BusinessDomain": fields["business_domain"],
+        "BusinessEIN": fields["business_ein"],
+        "Address1": fields["address1"],
+        "Address2": fields["address2"],
+        "Address3": fields["address3"],
+        "Address4": fields["address4"],
+        "Address5": fields["address5"],
+        "Locality": fields["locality"],
+        "AdminArea": fields["admin_area"],
+        "PostalCode": fields["postal_code"],
+        "Country": fields["country"],
+        "Phone1": fields["phone1"],
+        "Phone2": fields["phone2"],
+        "Email": fields["email"],
+        "IPAddress": fields["ip_address"],
+        "Gender": fields["gender"],
+        "DateOfBirth": fields["date_of_birth"],
+        "UTCCaptureTime": fields["utc_capture_time"],
+        "OutputLanguage": fields["output_language"],
+        "TestType": fields["test_type"],
+        "LicenseKey": license_key,
+    }
+
+
+def _both_failed(primary_ex: Exception, backup_ex: Exception) -> RuntimeError:
+    return RuntimeError(
+        "Both primary and backup endpoints failed.\n"
+        f"Primary error: {str(primary_ex)}\n"
+        f"Backup error: {str(backup_ex)}"
+    )
+
+
+class _PooledSoapBase:
+    def __init__(self,
+                 license_key: str,
+                 is_live: bool = True,
+                 timeout_ms: int = 15000,
+                 primary_url: str = None,
+                 backup_url: str = None,
+                 cache=None,
+                 health=None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 connect_timeout_ms: int = None,
+                 read_timeout_ms: int = None,
+                 max_response_bytes: int = None):
+        self.license_key = license_key
+        self.is_live = is_live
+        self._timeout_s = timeout_ms / 1000.0
+        self.primary_url = primary_url or _ENDPOINTS[is_live][0]
+        self.backup_url = backup_url or _ENDPOINTS[is_live][1]
+        self.cache = cache
+        self.health = health
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self._connect_timeout_s = connect_timeout_ms / 1000.0 if connect_timeout_ms else None
+        self._read_timeout_s = read_timeout_ms / 1000.0 if read_timeout_ms else None
+        self.max_response_bytes = max_response_bytes
+        self._limits = None
+        if connect_timeout_ms or read_timeout_ms or max_response_bytes:
+            # Imported only when used, from REST/ like the other shared helpers
+            import lv_timeouts
+            self._limits = lv_timeouts
+
+    def _attempt_url(self, budget) -> str:
+        """Endpoint of a retry policy's next attempt: primary and backup in turn, skipping an open circuit."""
+        url = self.backup_url if budget.attempts % 2 else self.primary_url
+        if url == self.primary_url and self.health is not None and not self.health.allow(url):
+            url = self.backup_url
+        return url
+
+    def _record(self, url: str, start: float, plain: Optional[dict]) -> None:
+        if _unavailable(plain):
+            self.health.record_failure(url, ValueError("No result or Error.TypeCode=3"))
+        else:
+            self.health.record_success(url, time.perf_counter() - start)
+
+    def _cached(self, call_kwargs: dict) -> Optional[Object]:
+        if self.cache is None:
+            return None
+        cached = self.cache.get(call_kwargs, self.is_live)
+        return _from_plain(cached) if cached is not None else None
+
+    def _result(self, call_kwargs: dict, plain: dict) -> Object:
+        if self.cache is not None and not plain.get("Error"):
+            # The parsed reply already is in the cache's plain format
+            self.cache.put(call_kwargs, plain, self.is_live)
+        return _from_plain(plain)
+
+
+class ValidateLeadV3SoapPooled(_PooledSoapBase):
+    """
+    Blocking ValidateLead_V3 SOAP client over pooled keep-alive connections.
+
+    Returns the same attribute-style objects as ValidateLeadV3Soap. Instances are
+    safe to share across threads; size pool_size to the number of threads.
+    """
+
+    def __init__(self,
+                 license_key: str,
+                 is_live: bool = True,
+                 timeout_ms: int = 15000,
+                 pool_size: int = 10,
+                 primary_url: str = None,
+                 backup_url: str = None,
+                 cache=None,
+                 health=None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 connect_timeout_ms: int = None,
+                 read_timeout_ms: int = None,
+                 max_response_bytes: int = None):
+        """
+        Parameters:
+            license_key: Service Objects LV license key.
+            is_live: Whether to use live or trial endpoints.
+            timeout_ms: Total time per request in milliseconds, reading the reply included.
+            pool_size: Maximum number of pooled connections kept open per endpoint.
+            primary_url: Service address overriding the live or trial primary, e.g. a local stub.
+            backup_url: Service address overriding the live or trial backup.
+            cache: Optional LVCache (see REST/lv_cache.py) answering repeated leads without a call.
+            health: Optional EndpointHealth (see REST/endpoint_health.py). Every request is
+                    reported to it, and calls go straight to the backup while the primary's
+                    circuit is open.
+            rate_limiter: Optional LicenseRateLimiter (see REST/lv_rate_limit.py); every request,
+                          backup attempts included, waits for a token of the license key.
+            retry_policy: Optional RetryPolicy (see REST/lv_retry.py) replacing the one primary and
+                          one backup attempt with retries that alternate between them, back off
+                          with jitter and fit in a total deadline.
+            connect_timeout_ms: Milliseconds to open a connection, TLS handshake included
+                                (see REST/lv_timeouts.py).
+            read_timeout_ms: Milliseconds to wait for the reply to start, and between its chunks.
+            max_response_bytes: Largest reply body accepted. A larger one fails the request like
+                                a transport error.
+        """
+        super().__init__(license_key, is_live, timeout_ms, primary_url, backup_url, cache, health, rate_limiter,
+                         retry_policy, connect_timeout_ms, read_timeout_ms, max_response_bytes)
+        self.pool_size = pool_size
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def validate_lead_v3(self,
+                         full_name: str,
+                         salutation: str,
+                         first_name: str,
+                         last_name: str,
+                         business_name: str,
+                         business_domain: str,
+                         business_ein: str,
+                         address1: str,
+                         address2: str,
+                         address3: str,
+                         address4: str,
+                         address5: str,
+                         locality: str,
+                         admin_area: str,
+                         postal_code: str,
+                         country: str,
+                         phone1: str,
+                         phone2: str,
+                         email: str,
+                         ip_address: str,
+                         gender: str,
+                         date_of_birth: str,
+                         utc_capture_time: str,
+                         output_language: str,
+                         test_type: str) -> Object:
+        """
+        Call the ValidateLead_V3 SOAP API. Takes the same arguments, and returns the
+        same kind of object, as ValidateLeadV3Soap.validate_lead_v3.
+
+        Raises:
+            RuntimeError: If both primary and backup endpoints fail.
+        """
+        return self.validate_params(_call_kwargs(
+            self.license_key, full_name=full_name, salutation=salutation, first_name=first_name,
+            last_name=last_name, business_name=business_name, business_domain=business_domain,
+            business_ein=business_ein, address1=address1, address2=address2, address3=address3,
+            address4=address4, address5=address5, locality=locality, admin_area=admin_area,
+            postal_code=postal_code, country=country, phone1=phone1, phone2=phone2, email=email,
+            ip_address=ip_address, gender=gender, date_of_birth=date_of_birth,
+            utc_capture_time=utc_capture_time, output_language=output_language, test_type=test_type,
+        ))
+
+    def validate_params(self, call_kwargs: dict, is_live: bool = None) -> Object:
+        """
+        Call ValidateLead_V3 with request fields keyed by REQUEST_FIELDS, e.g. as built
+        by REST/validate_lead_v3_rest.build_params, so that this client can be handed
+        to validate_leads_v3.
+
+        Parameters:
+            call_kwargs: Request fields. LicenseKey defaults to the client's license key.
+            is_live: Must match the client's is_live when given; endpoints are per client.
+        """
+        if is_live is not None and is_live != self.is_live:
+            raise ValueError("is_live must match the client's is_live")
+        if not call_kwargs.get("LicenseKey"):
+            call_kwargs = dict(call_kwargs, LicenseKey=self.license_key)
+        cached = self._cached(call_kwargs)
+        if cached is not None:
+            return cached
+        return self._result(call_kwargs, self._call(call_kwargs))
+
+    def _call(self, call_kwargs: dict) -> dict:
+        envelope = render_envelope(call_kwargs)
+        if self.retry_policy is not None:
+            return self._call_retrying(envelope, call_kwargs)
+        if self.health is not None and not self.health.allow(self.primary_url):
+            # The primary's circuit is open: skip straight to the backup
+            try:
+                plain = self._post(self.backup_url, envelope, call_kwargs)
+                if plain is None:
+                    raise ValueError("Backup returned no result")
+                return plain
+            except Exception as backup_ex:
+                raise RuntimeError(
+                    "Primary skipped while its circuit is open.\n"
+                    f"Backup error: {str(backup_ex)}"
+                )
+
+        try:
+            plain = self._post(self.primary_url, envelope, call_kwargs)
+            if _unavailable(plain):
+                raise ValueError("Primary returned no result or Error.TypeCode=3")
+            return plain
+        except Exception as primary_ex:
+            try:
+                plain = self._post(self.backup_url, envelope, call_kwargs)
+                if plain is None:
+                    raise ValueError("Backup returned no result")
+                return plain
+            except Exception as backup_ex:
+                raise _both_failed(primary_ex, backup_ex)
+
+    def _call_retrying(self, envelope: bytes, call_kwargs: dict) -> dict:
+        budget = self.retry_policy.begin()
+        while True:
+            try:
+                plain = self._post(self._attempt_url(budget), envelope, call_kwargs, budget)
+            except requests.HTTPError as ex:
+                delay = budget.failed(ex, "http", ex.response.status_code if ex.response is not None else None)
+            except Exception as ex:
+                delay = budget.failed(ex, "transport")
+            else:
+                if not _unavailable(plain):
+                    return plain
+                delay = budget.failed(ValueError("No result or Error.TypeCode=3"), "service")
+            if delay:
+                time.sleep(delay)
+
+    def _post(self, url: str, envelope: bytes, call_kwargs: dict, budget=None) -> Optional[dict]:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(call_kwargs.get("LicenseKey"))
+        timeout = self._timeout_s if budget is None else budget.attempt_timeout(self._timeout_s)
+        if self.health is None:
+            return self._fetch(url, envelope, timeout)
+        start = time.perf_counter()
+        try:
+            plain = self._fetch(url, envelope, timeout)
+        except Exception as ex:
+            self.health.record_failure(url, ex)
+            raise
+        self._record(url, start, plain)
+        return plain
+
+    def _fetch(self, url: str, envelope: bytes, timeout: float) -> Optional[dict]:
+        limits = self._limits
+        deadline = None if limits is None else limits.Deadline(timeout, self._read_timeout_s)
+        with self._send(url, envelope, timeout, deadline) as response:
+            if response.status_code != 200:
+                # Faults come with status 500 and are reported from the body
+                body = b"".join(self._chunks(response, deadline))
+                if not _is_fault(body):
+                    response.raise_for_status()
+                return parse_reply(body)
+            parser = ReplyParser()
+            for chunk in self._chunks(response, deadline):
+                parser.feed(chunk)
+            return parser.close()
+
+    def _send(self, url: str, envelope: bytes, timeout: float, deadline) -> requests.Response:
+        if deadline is None:
+            return self._session.post(url, data=envelope, headers=_HEADERS, timeout=timeout, stream=True)
+        # urllib3 takes the time a new connection took off the read timeout, so the headers
+        # arrive within the total too; the body is then read under deadline's clamp
+        phases = Timeout(connect=min(self._connect_timeout_s or timeout, timeout), read=deadline.read_timeout,
+                         total=timeout)
+        try:
+            return self._session.post(url, data=envelope, headers=_HEADERS, timeout=phases, stream=True)
+        except requests.exceptions.Timeout as ex:
+            if not deadline.is_total(ex):
+                raise
+            total = self._limits.TotalTimeout(timeout)
+            total.__cause__ = ex
+            raise requests.exceptions.Timeout(str(total), request=ex.request) from total
+
+    def _chunks(self, response: requests.Response, deadline):
+        """The reply body as it arrives, failing like a transport error past max_response_bytes or deadline."""
+        limits = self._limits
+        if limits is None:
+            yield from response.iter_content(_CHUNK_BYTES)
+            return
+        connection = response.raw.connection
+        deadline.sock = connection.sock if connection is not None else None
+        try:
+            limits.check_length(response.headers.get("Content-Length"), self.max_response_bytes)
+            chunks = deadline.chunks(limits.read1_chunks(response, _CHUNK_BYTES))
+            yield from limits.limit_chunks(chunks, self.max_response_bytes, deadline.at, deadline.timeout)
+        except limits.TotalTimeout as ex:
+            raise requests.exceptions.Timeout(str(ex), response=response) from ex
+        except limits.ResponseTooLarge as ex:
+            raise requests.RequestException(str(ex), response=response) from ex
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._session.close()
+
+    def __enter__(self) -> "ValidateLeadV3SoapPooled":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class AsyncValidateLeadV3SoapPooled(_PooledSoapBase):
+    """
+    asyncio ValidateLead_V3 SOAP client over one pooled aiohttp session.
+
+    Returns the same attribute-style objects as ValidateLeadV3Soap. A semaphore caps
+    how many leads are in flight; replies are parsed chunk by chunk as they arrive.
+    Use one instance per event loop.
+    """
+
+    def __init__(self,
+                 license_key: str,
+                 is_live: bool = True,
+                 timeout_ms: int = 15000,
+                 max_concurrency: int = 100,
+                 primary_url: str = None,
+                 backup_url: str = None,
+                 cache=None,
+                 health=None,
+                 rate_limiter=None,
+                 retry_policy=None,
+                 connect_timeout_ms: int = None,
+                 read_timeout_ms: int = None,
+                 max_response_bytes: int = None):
+        """
+        Parameters:
+            license_key: Service Objects LV license key.
+            is_live: Whether to use live or trial endpoints.
+            timeout_ms: Total time per request in milliseconds, reading the reply included.
+            max_concurrency: Maximum number of leads validated at the same time, and of
+                             pooled connections.
+            primary_url: Service address overriding the live or trial primary, e.g. a local stub.
+            backup_url: Service address overriding the live or trial backup.
+            cache: Optional LVCache (see REST/lv_cache.py) answering repeated leads without a call.
+            health: Optional EndpointHealth (see REST/endpoint_health.py). Every request is
+                    reported to it, and calls go straight to the backup while the primary's
+                    circuit is open.
+            rate_limiter: Optional LicenseRateLimiter (see REST/lv_rate_limit.py); every request,
+                          backup attempts included, waits for a token of the license key.
+            retry_policy: Optional RetryPolicy (see REST/lv_retry.py) replacing the one primary and
+                          one backup attempt with retries that alternate between them, back off
+                          with jitter and fit in a total deadline.
+            connect_timeout_ms: Milliseconds to open a connection, TLS handshake included
+                                (see REST/lv_timeouts.py).
+            read_timeout_ms: Milliseconds to wait for the reply to start, and between its chunks.
+            max_response_bytes: Largest reply body accepted. A larger one fails the request like
+                                a transport error.
+        """
+        super().__init__(license_key, is_live, timeout_ms, primary_url, backup_url, cache, health, rate_limiter,
+                         retry_policy, connect_timeout_ms, read_timeout_ms, max_response_bytes)
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # aiohttp sessions must be created inside the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self._timeout_s),
+                headers=_HEADERS,
+            )
+        return self._session
+
+    async def validate_lead_v3(self,
+                               full_name: str,
+                               salutation: str,
+                               first_name: str,
+                               last_name: str,
+                               business_name: str,
+                               business_domain: str,
+                               business_ein: str,
+                               address1: str,
+                               address2: str,
+                               address3: str,
+                               address4: str,
+                               address5: str,
+                               locality: str,
+                               admin_area: str,
+                               postal_code: str,
+                               country: str,
+                               phone1: str,
+                               phone2: str,
+                               email: str,
+                               ip_address: str,
+                               gender: str,
+                               date_of_birth: str,
+                               utc_capture_time: str,
+                               output_language: str,
+                               test_type: str) -> Object:
+        """
+        Call the ValidateLead_V3 SOAP API. Takes the same arguments, and returns the
+        same kind of object, as ValidateLeadV3Soap.validate_lead_v3.
+
+        Raises:
+            RuntimeError: If both primary and backup endpoints fail.
+        """
+        return await self.validate_params(_call_kwargs(
+            self.license_key, full_name=full_name, salutation=salutation, first_name=first_name,
+            last_name=last_name, business_name=business_name, business_domain=business_domain,
+            business_ein=business_ein, address1=address1, address2=address2, address3=address3,
+            address4=address4, address5=address5, locality=locality, admin_area=admin_area,
+            postal_code=postal_code, country=country, phone1=phone1, phone2=phone2, email=email,
+            ip_address=ip_address, gender=gender, date_of_birth=date_of_birth,
+            utc_capture_time=utc_capture_time, output_language=output_language, test_type=test_type,
+        ))
+
+    async def validate_params(self, call_kwargs: dict, is_live: bool = None) -> Object:
+        """Call ValidateLead_V3 with request fields keyed by REQUEST_FIELDS; see ValidateLeadV3SoapPooled."""
+        if is_live is not None and is_live != self.is_live:
+            raise ValueError("is_live must match the client's is_live")
+        if not call_kwargs.get("LicenseKey"):
+            call_kwargs = dict(call_kwargs, LicenseKey=self.license_key)
+        cached = self._cached(call_kwargs)
+        if cached is not None:
+            return cached
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            plain = await self._call(call_kwargs)
+        return self._result(call_kwargs, plain)
+
+    async def _call(self, call_kwargs: dict) -> dict:
+        envelope = render_envelope(call_kwargs)
+        if self.retry_policy is not None:
+            return await self._call_retrying(envelope, call_kwargs)
+        if self.health is not None and not self.health.allow(self.primary_url):
+            # The primary's circuit is open: skip straight to the backup
+            try:
+                plain = await self._post(self.backup_url, envelope, call_kwargs)
+                if plain is None:
+                    raise ValueError("Backup returned no result")
+                return plain
+            except Exception as backup_ex:
+                raise RuntimeError(
+                    "Primary skipped while its circuit is open.\n"
+                    f"Backup error: {str(backup_ex)}"
+                )
+
+        try:
+            plain = await self._post(self.primary_url, envelope, call_kwargs)
+            if _unavailable(plain):
+                raise ValueError("Primary returned no result or Error.TypeCode=3")
+            return plain
+        except Exception as primary_ex:
+            try:
+                plain = await self._post(self.backup_url, envelope, call_kwargs)
+                if plain is None:
+                    raise ValueError("Backup returned no result")
+                return plain
+            except Exception as backup_ex:
+                raise _both_failed(primary_ex, backup_ex)
+
+    async def _call_retrying(self, envelope: bytes, call_kwargs: dict) -> dict:
+        budget = self.retry_policy.begin()
+        while True:
+            try:
+                plain = await self._post(self._attempt_url(budget), envelope, call_kwargs, budget)
+            except aiohttp.ClientResponseError as ex:
+                delay = budget.failed(ex, "http", ex.status)
+            except Exception as ex:
+                delay = budget.failed(ex, "transport")
+            else:
+                if not _unavailable(plain):
+                    return plain
+                delay = budget.failed(ValueError("No result or Error.TypeCode=3"), "service")
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def _post(self, url: str, envelope: bytes, call_kwargs: dict, budget=None) -> Optional[dict]:
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.reserve(call_kwargs.get("LicenseKey"))
+            if delay:
+                await asyncio.sleep(delay)
+        timeout = self._timeout_s if budget is None else budget.attempt_timeout(self._timeout_s)
+        if self.health is None:
+            return await self._fetch(url, envelope, timeout)
+        start = time.perf_counter()
+        try:
+            plain = await self._fetch(url, envelope, timeout)
+        except Exception as ex:
+            self.health.record_failure(url, ex)
+            raise
+        self._record(url, start, plain)
+        return plain
+
+    async def _fetch(self, url: str, envelope: bytes, timeout: float) -> Optional[dict]:
+        client_timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=self._connect_timeout_s,
+                                               sock_read=self._read_timeout_s)
+        try:
+            async with self._get_session().post(url, data=envelope, timeout=client_timeout) as response:
+                if response.status != 200:
+                    # Faults come with status 500 and are reported from the body
+                    body = b"".join([chunk async for chunk in self._chunks(response)])
+                    if not _is_fault(body):
+                        response.raise_for_status()
+                    return parse_reply(body)
+                parser = ReplyParser()
+                async for chunk in self._chunks(response):
+                    parser.feed(chunk)
+                return parser.close()
+        except asyncio.TimeoutError as ex:
+            # aiohttp raises its connect and read timeouts as subclasses; a bare one is the total
+            if self._limits is not None and type(ex) is asyncio.TimeoutError:
+                raise self._limits.TotalTimeout(timeout) from ex
+            raise
+
+    async def _chunks(self, response: aiohttp.ClientResponse):
+        """The reply body as it arrives, failing with ResponseTooLarge past max_response_bytes."""
+        if self.max_response_bytes is not None:
+            self._limits.check_length(response.headers.get("Content-Length"), self.max_response_bytes)
+        size = 0
+        async for chunk in response.content.iter_chunked(_CHUNK_BYTES):
+            size += len(chunk)
+            if self.max_response_bytes is not None and size > self.max_response_bytes:
+                raise self._limits.ResponseTooLarge(self.max_response_bytes)
+            yield chunk
+
+    async def close(self) -> None:
+        """Close the pooled session held by the client."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncValidateLeadV3SoapPooled":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
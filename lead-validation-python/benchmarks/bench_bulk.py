@@ -0,0 +1,48 @@
+"""
+Measure how validate_leads_v3 throughput scales with the number of workers.
+
+Runs the same batch against a local StubServer with a fixed per-request
+latency for each worker count and prints leads/sec and the speedup over one worker.
+
+    python bench_bulk.py --leads 2000 --latency 0.02 --workers 1 2 4 8 16 32
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+from bench_session_pool import LEAD
+from stub_server import StubServer
+from validate_lead_v3_rest import ValidateLeadV3Client
+from validate_leads_v3_bulk import validate_leads_v3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub latency per request in seconds.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--unordered", action="store_true", help="Yield results in completion order.")
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as stub:
+        baseline = None
+        for workers in args.workers:
+            leads = (LEAD for _ in range(args.leads))
+            with ValidateLeadV3Client(pool_size=workers, primary_url=stub.url,
+                                      backup_url=stub.url, trial_url=stub.url) as client:
+                start = time.perf_counter()
+                errors = 0
+                for item in validate_leads_v3(leads, "BENCHMARK", workers=workers,
+                                              ordered=not args.unordered, client=client):
+                    response = item if not args.unordered else item[1]
+                    errors += response.Error is not None
+                rate = args.leads / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"workers={workers:3d}  {rate:10.1f} leads/s  speedup={rate / baseline:6.2f}x  errors={errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Show what an EndpointHealth circuit breaker saves while the primary is down.
+
+Runs a batch of leads against a local primary StubServer that hangs past the
+client timeout (or answers with an HTTP error) and a healthy backup stub,
+with and without an EndpointHealth, then brings the primary back and checks
+that the circuit closes again after a half-open probe.
+
+    python bench_failover.py --leads 50 --timeout 0.5 --outage hang
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+from bench_session_pool import LEAD
+from endpoint_health import EndpointHealth
+from stub_server import StubServer
+from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+
+
+def _run(client: ValidateLeadV3Client, params: dict, leads: int) -> float:
+    start = time.perf_counter()
+    for _ in range(leads):
+        client.validate_params(params)
+    return (time.perf_counter() - start) / leads
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=0.5, help="Client timeout in seconds.")
+    parser.add_argument("--outage", choices=["hang", "http503"], default="hang")
+    parser.add_argument("--recovery-time", type=float, default=1.0)
+    args = parser.parse_args()
+
+    params = build_params(LEAD, "BENCHMARK")
+    with StubServer() as primary, StubServer() as backup:
+        if args.outage == "hang":
+            primary.latency = args.timeout * 2
+        else:
+            primary.status = 503
+
+        plain = ValidateLeadV3Client(timeout=args.timeout, primary_url=primary.url, backup_url=backup.url)
+        health = EndpointHealth(recovery_time=args.recovery_time)
+        guarded = ValidateLeadV3Client(timeout=args.timeout, primary_url=primary.url, backup_url=backup.url,
+                                       health=health)
+        with plain, guarded:
+            without = _run(plain, params, args.leads)
+            primary.requests = 0
+            with_health = _run(guarded, params, args.leads)
+            print(f"primary {args.outage}, {args.leads} leads")
+            print(f"  without circuit breaker: {without * 1000:8.1f} ms/lead")
+            print(f"  with circuit breaker:    {with_health * 1000:8.1f} ms/lead "
+                  f"({primary.requests} calls reached the primary)")
+
+            # Primary recovers; the next probe after recovery_time closes the circuit
+            primary.latency = 0.0
+            primary.status = 200
+            time.sleep(args.recovery_time)
+            guarded.validate_params(params)
+            print(f"  after recovery: primary circuit {health.state(primary.url)}")
+            print(f"  {health.stats[primary.url]}")
+
+
+if __name__ == "__main__":
+    main()
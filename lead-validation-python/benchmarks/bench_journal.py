@@ -0,0 +1,72 @@
+"""
+Append, lookup and reopen time of LVJournal by journal size.
+
+Appends --records copies of the sample response under distinct keys, then
+times random lookups, and reopening the journal with its segments sealed
+(index files only) and with everything in one unsealed segment (full scan).
+Lookup time should stay flat as the journal grows.
+
+    python bench_journal.py --records 10000 100000 --segment-mib 16
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+from lv_journal import LVJournal
+from lv_response import LVResponse
+from stub_server import SAMPLE_RESPONSE
+
+
+def _reopen_ms(directory: str, segment_bytes: int) -> float:
+    started = time.perf_counter()
+    journal = LVJournal(directory, segment_bytes=segment_bytes)
+    elapsed = time.perf_counter() - started
+    journal.close()
+    return elapsed * 1e3
+
+
+def run(records: int, segment_bytes: int, lookups: int) -> None:
+    response = LVResponse.from_dict(SAMPLE_RESPONSE)
+    keys = [f"lead-{i:09d}" for i in range(records)]
+    for label, size in (("sealed", segment_bytes), ("unsealed", 2 ** 40)):
+        directory = tempfile.mkdtemp(prefix="lv-journal-")
+        try:
+            journal = LVJournal(directory, segment_bytes=size)
+            started = time.perf_counter()
+            for key in keys:
+                journal.append(key, response)
+            append_us = (time.perf_counter() - started) / records * 1e6
+            sample = random.choices(keys, k=lookups)
+            started = time.perf_counter()
+            for key in sample:
+                journal.get(key)
+            lookup_us = (time.perf_counter() - started) / lookups * 1e6
+            stats = journal.stats
+            if label == "sealed":
+                journal.rotate()
+            journal.close()
+            print(f"records={records:<9d} {label:8s} segments={stats['segments']:<4d} "
+                  f"MiB={stats['bytes'] / 2 ** 20:8.1f}  append {append_us:6.1f} us  "
+                  f"lookup {lookup_us:6.1f} us  reopen {_reopen_ms(directory, size):8.1f} ms")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, nargs="+", default=[10000, 100000], help="Journal sizes to test.")
+    parser.add_argument("--segment-mib", type=int, default=16, help="Segment size in MiB for the sealed run.")
+    parser.add_argument("--lookups", type=int, default=20000, help="Random lookups per size.")
+    args = parser.parse_args()
+    for records in args.records:
+        run(records, args.segment_mib * 2 ** 20, args.lookups)
+
+
+if __name__ == "__main__":
+    main()
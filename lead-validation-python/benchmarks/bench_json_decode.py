@@ -0,0 +1,62 @@
+"""
+Decode cost of a ValidateLead_V3 response body with json, orjson and msgspec.
+
+Times body -> LVResponse for the stub server's sample payload at several
+InformationComponents counts: json.loads, orjson.loads and msgspec's dict decoder
+each followed by LVResponse.from_dict, and msgspec's typed decoding through
+lv_json.decode_response. Libraries that are not installed are skipped. Every
+variant is first checked to produce the same LVResponse as json.loads + from_dict.
+
+    python bench_json_decode.py --components 2 20 200 --number 20000
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+import lv_json
+from lv_response import LVResponse
+from stub_server import make_response
+
+
+def _variants(body: bytes) -> list:
+    variants = [("json.loads + from_dict", lambda: LVResponse.from_dict(json.loads(body)))]
+    if lv_json.orjson is not None:
+        variants.append(("orjson.loads + from_dict", lambda: LVResponse.from_dict(lv_json.orjson.loads(body))))
+    if lv_json.msgspec is not None:
+        decoder = lv_json.msgspec.json.Decoder()
+        variants.append(("msgspec dict + from_dict", lambda: LVResponse.from_dict(decoder.decode(body))))
+        variants.append(("msgspec typed", lambda: lv_json.decode_response(body)))
+    return variants
+
+
+def _per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, nargs="+", default=[2, 20, 200],
+                        help="InformationComponents per response.")
+    parser.add_argument("--number", type=int, default=10000, help="Decodes per timing run.")
+    args = parser.parse_args()
+
+    print(f"lv_json.loads uses {lv_json.BACKEND}")
+    for components in args.components:
+        body = json.dumps(make_response(components)).encode("utf-8")
+        expected = LVResponse.from_dict(json.loads(body))
+        variants = _variants(body)
+        print(f"\ncomponents={components} body={len(body)} bytes")
+        baseline = None
+        for label, func in variants:
+            assert func() == expected, label
+            per_call = _per_call_us(func, args.number)
+            baseline = baseline or per_call
+            print(f"{label:26s} {per_call:8.2f} us/response  x{baseline / per_call:.2f}")
+
+
+if __name__ == "__main__":
+    main()
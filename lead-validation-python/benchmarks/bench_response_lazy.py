@@ -0,0 +1,81 @@
+"""
+Per-call cost of LazyLVResponse against LVResponse and CompactLVResponse.
+
+For each model, times building a response from a decoded payload and reading
+the fields a hot-path caller reads (OverallCertainty, OverallQuality and
+LeadType), and the same followed by reading every field. Also reports the bytes
+each model allocates per call on top of the decoded dict, measured with
+tracemalloc. The lazy view keeps the decoded dict alive in exchange, so use it
+for responses that are read and dropped, not for holding large batches (see
+bench_response_memory.py).
+
+    python bench_response_lazy.py --components 10 --number 50000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+from dataclasses import fields
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+from lv_response import LVResponse
+from lv_response_compact import CompactLVResponse
+from lv_response_lazy import LazyLVResponse
+from stub_server import SAMPLE_RESPONSE
+
+_ALL_FIELDS = tuple(f.name for f in fields(LVResponse))
+
+
+def read_scores(response) -> tuple:
+    return response.OverallCertainty, response.OverallQuality, response.LeadType
+
+
+def read_all(response) -> list:
+    return [getattr(response, name) for name in _ALL_FIELDS]
+
+
+def _per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def _bytes_per_call(response_class, read, payloads: list) -> float:
+    gc.collect()
+    tracemalloc.start()
+    responses = [response_class.from_dict(payload) for payload in payloads]
+    for response in responses:
+        read(response)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del responses
+    return current / len(payloads)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, default=2, help="InformationComponents per response.")
+    parser.add_argument("--number", type=int, default=20000, help="Calls per timing run.")
+    args = parser.parse_args()
+
+    payload = dict(SAMPLE_RESPONSE)
+    payload["InformationComponents"] = [
+        {"Name": f"Component{i}", "Value": str(i)} for i in range(args.components)
+    ]
+    body = json.dumps(payload)
+    assert LazyLVResponse.from_dict(payload) == LVResponse.from_dict(payload)
+    payloads = [json.loads(body) for _ in range(args.number)]
+
+    print(f"components={args.components}")
+    for label, read in (("scores only", read_scores), ("every field", read_all)):
+        for response_class in (LVResponse, CompactLVResponse, LazyLVResponse):
+            per_call = _per_call_us(lambda: read(response_class.from_dict(payload)), args.number)
+            per_call_bytes = _bytes_per_call(response_class, read, payloads)
+            print(f"{label:12s} {response_class.__name__:18s} {per_call:8.2f} us/call  "
+                  f"{per_call_bytes:8.0f} bytes/call")
+
+
+if __name__ == "__main__":
+    main()
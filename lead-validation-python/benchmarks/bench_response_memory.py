@@ -0,0 +1,53 @@
+"""
+Bytes held per response by LVResponse versus CompactLVResponse.
+
+Each response is decoded from its own JSON body, as it would be off the wire, so
+no strings are shared between responses unless the model interns them. Memory is
+measured with tracemalloc and projected to --project responses.
+
+    python bench_response_memory.py --count 100000
+    python bench_response_memory.py --count 1000000   # needs several GB for LVResponse
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+from lv_response import LVResponse
+from lv_response_compact import CompactLVResponse
+from stub_server import SAMPLE_RESPONSE
+
+
+def _bytes_per_response(response_class, body: str, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    responses = [response_class.from_dict(json.loads(body)) for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del responses
+    return current / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=100000, help="Responses to build per model.")
+    parser.add_argument("--project", type=int, default=1000000, help="Response count to project totals to.")
+    args = parser.parse_args()
+
+    body = json.dumps(SAMPLE_RESPONSE)
+    baseline = None
+    print(f"count={args.count}")
+    for response_class in (LVResponse, CompactLVResponse):
+        per_response = _bytes_per_response(response_class, body, args.count)
+        baseline = baseline or per_response
+        total_mb = per_response * args.project / 2 ** 20
+        print(f"{response_class.__name__:18s} {per_response:8.0f} bytes/response  "
+              f"{total_mb:8.0f} MiB per {args.project:,}  ({per_response / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Per-response parse cost of LVResponse.from_dict against the hand-written constructor it replaced.
+
+Times json decoding plus LVResponse construction, and construction alone, on the
+stub server's sample payload with a configurable number of InformationComponents.
+
+    python bench_response_parse.py --components 10 --number 50000
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+from lv_response import LVResponse, PhoneContact, InformationComponent, Error
+from stub_server import SAMPLE_RESPONSE
+
+
+def legacy_from_json(data: dict) -> LVResponse:
+    """The hand-written constructor validate_lead_v3 used before LVResponse.from_dict."""
+    error = Error(**data.get("Error", {})) if data.get("Error") else None
+    phone_contact = PhoneContact(**data.get("PhoneContact", {})) if data.get("PhoneContact") else None
+
+    return LVResponse(
+        OverallCertainty=data.get("OverallCertainty"),
+        OverallQuality=data.get("OverallQuality"),
+        LeadType=data.get("LeadType"),
+        LeadCountry=data.get("LeadCountry"),
+        NoteCodes=data.get("NoteCodes"),
+        NoteDesc=data.get("NoteDesc"),
+        NameCertainty=data.get("NameCertainty"),
+        NameQuality=data.get("NameQuality"),
+        FirstName=data.get("FirstName"),
+        LastName=data.get("LastName"),
+        FirstNameClean=data.get("FirstNameClean"),
+        LastNameClean=data.get("LastNameClean"),
+        NameNoteCodes=data.get("NameNoteCodes"),
+        NameNoteDesc=data.get("NameNoteDesc"),
+        AddressCertainty=data.get("AddressCertainty"),
+        AddressQuality=data.get("AddressQuality"),
+        Address1=data.get("Address1"),
+        Address2=data.get("Address2"),
+        Address3=data.get("Address3"),
+        Address4=data.get("Address4"),
+        Address5=data.get("Address5"),
+        AddressLocality=data.get("AddressLocality"),
+        AddressAdminArea=data.get("AddressAdminArea"),
+        AddressPostalCode=data.get("AddressPostalCode"),
+        AddressCountry=data.get("AddressCountry"),
+        AddressNoteCodes=data.get("AddressNoteCodes"),
+        AddressNoteDesc=data.get("AddressNoteDesc"),
+        EmailCertainty=data.get("EmailCertainty"),
+        EmailQuality=data.get("EmailQuality"),
+        EmailCorrected=data.get("EmailCorrected"),
+        EmailNoteCodes=data.get("EmailNoteCodes"),
+        EmailNoteDesc=data.get("EmailNoteDesc"),
+        IPAddressCertainty=data.get("IPAddressCertainty"),
+        IPAddressQuality=data.get("IPAddressQuality"),
+        IPCountry=data.get("IPCountry"),
+        IPLocality=data.get("IPLocality"),
+        IPAdminArea=data.get("IPAdminArea"),
+        IPNoteCodes=data.get("IPNoteCodes"),
+        IPNoteDesc=data.get("IPNoteDesc"),
+        Phone1Certainty=data.get("Phone1Certainty"),
+        Phone1Quality=data.get("Phone1Quality"),
+        Phone1Locality=data.get("Phone1Locality"),
+        Phone1AdminArea=data.get("Phone1AdminArea"),
+        Phone1Country=data.get("Phone1Country"),
+        Phone1NoteCodes=data.get("Phone1NoteCodes"),
+        Phone1NoteDesc=data.get("Phone1NoteDesc"),
+        Phone2Certainty=data.get("Phone2Certainty"),
+        Phone2Quality=data.get("Phone2Quality"),
+        Phone2Locality=data.get("Phone2Locality"),
+        Phone2AdminArea=data.get("Phone2AdminArea"),
+        Phone2Country=data.get("Phone2Country"),
+        Phone2NoteCodes=data.get("Phone2NoteCodes"),
+        Phone2NoteDesc=data.get("Phone2NoteDesc"),
+        PhoneContact=phone_contact,
+        InformationComponents=[
+            InformationComponent(Name=comp.get("Name"), Value=comp.get("Value"))
+            for comp in data.get("InformationComponents", [])
+        ] if "InformationComponents" in data else [],
+        Error=error
+    )
+
+def _per_call_us(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", type=int, default=2, help="InformationComponents per response.")
+    parser.add_argument("--number", type=int, default=20000, help="Parses per timing run.")
+    args = parser.parse_args()
+
+    payload = dict(SAMPLE_RESPONSE)
+    payload["InformationComponents"] = [
+        {"Name": f"Component{i}", "Value": str(i)} for i in range(args.components)
+    ]
+    body = json.dumps(payload)
+    assert legacy_from_json(payload) == LVResponse.from_dict(payload)
+
+    rows = [
+        ("hand-written constructor", lambda: legacy_from_json(payload)),
+        ("LVResponse.from_dict", lambda: LVResponse.from_dict(payload)),
+        ("json.loads + hand-written", lambda: legacy_from_json(json.loads(body))),
+        ("json.loads + from_dict", lambda: LVResponse.from_dict(json.loads(body))),
+    ]
+    print(f"components={args.components} body={len(body)} bytes")
+    for label, func in rows:
+        print(f"{label:28s} {_per_call_us(func, args.number):8.2f} us/response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Latency of interactive calls while a bulk run shares the client and license.
+
+A bulk run of --leads leads is pushed through validate_leads_v3 with many
+workers while one thread makes an interactive call every --interval seconds,
+all through one ValidateLeadV3Client and one LicenseRateLimiter, against a
+local StubServer. Without a scheduler the bulk workers reserve the license's
+tokens far ahead and interactive calls queue behind them. With a
+PriorityScheduler the bulk run only holds the batch class's slots, so
+interactive calls wait for at most those.
+
+    python bench_scheduler.py --leads 2000 --workers 64 --slots 16 --rate 400
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+from bench_session_pool import LEAD
+from lv_instrumentation import LatencyHistogram
+from lv_rate_limit import LicenseRateLimiter
+from lv_scheduler import PriorityClass, PriorityScheduler
+from stub_server import StubServer
+from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+from validate_leads_v3_bulk import validate_leads_v3
+
+
+def _run(stub: StubServer, args, scheduler) -> None:
+    rate_limiter = LicenseRateLimiter(rate=args.rate, burst=1)
+    params = build_params(LEAD, "BENCHMARK")
+    interactive = LatencyHistogram()
+    done = threading.Event()
+    with ValidateLeadV3Client(pool_size=args.workers, primary_url=stub.url, backup_url=stub.url,
+                              trial_url=stub.url, rate_limiter=rate_limiter, scheduler=scheduler,
+                              priority="interactive") as client:
+
+        def forms() -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                client.validate_params(params)
+                interactive.observe(time.perf_counter() - start)
+                time.sleep(args.interval)
+
+        thread = threading.Thread(target=forms)
+        start = time.perf_counter()
+        thread.start()
+        leads = (LEAD for _ in range(args.leads))
+        for _ in validate_leads_v3(leads, "BENCHMARK", workers=args.workers, client=client, priority="batch"):
+            pass
+        elapsed = time.perf_counter() - start
+        done.set()
+        thread.join()
+    summary = interactive.summary()
+    label = "scheduler" if scheduler is not None else "shared"
+    print(f"{label:10s} bulk {args.leads / elapsed:7.1f} leads/s  interactive calls={summary['count']:4d}  "
+          f"p50={summary['p50'] * 1e3:7.1f} ms  p99={summary['p99'] * 1e3:7.1f} ms")
+    if scheduler is not None:
+        for name, stats in scheduler.stats["classes"].items():
+            print(f"           {name:12s} dispatched={stats['dispatched']:5d}  "
+                  f"wait p99={stats['wait']['p99'] * 1e3:7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub latency per request in seconds.")
+    parser.add_argument("--workers", type=int, default=64, help="Bulk worker threads.")
+    parser.add_argument("--slots", type=int, default=16, help="Scheduler slots.")
+    parser.add_argument("--reserved", type=int, default=2, help="Slots reserved for interactive calls.")
+    parser.add_argument("--rate", type=float, default=400, help="License calls per second.")
+    parser.add_argument("--interval", type=float, default=0.02, help="Seconds between interactive calls.")
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as stub:
+        _run(stub, args, None)
+        _run(stub, args, PriorityScheduler(args.slots, {
+            "interactive": PriorityClass(weight=8, reserved=args.reserved),
+            "batch": PriorityClass(weight=1),
+        }))
+
+
+if __name__ == "__main__":
+    main()
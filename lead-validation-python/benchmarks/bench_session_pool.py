@@ -0,0 +1,81 @@
+"""
+Compare per-call requests.get against the pooled ValidateLeadV3Client.
+
+Both variants hit a local StubServer, so the difference is purely the cost of
+opening a new connection for every lead versus reusing keep-alive connections.
+
+    python bench_session_pool.py --calls 2000 --threads 8
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+import requests
+
+from stub_server import StubServer
+from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+
+LEAD = {
+    "full_name": "Tim Cook",
+    "business_name": "Apple",
+    "address1": "27 E Cota St",
+    "address2": "Suite 500",
+    "locality": "Cupertino",
+    "admin_area": "CA",
+    "postal_code": "93101",
+    "country": "US",
+    "phone1": "1-408-996-1010",
+    "email": "tim.cook@apple.com",
+    "ip_address": "192.168.1.1",
+    "date_of_birth": "1",
+    "output_language": "English",
+    "test_type": "business-noip",
+}
+
+
+def _run(call, calls: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for _ in pool.map(lambda _: call(), range(calls)):
+            pass
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per request in seconds.")
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as stub:
+        params = build_params(LEAD, "BENCHMARK")
+
+        def unpooled():
+            response = requests.get(stub.url, params=params, timeout=10)
+            response.raise_for_status()
+            return response.json()
+
+        with ValidateLeadV3Client(pool_size=args.threads, primary_url=stub.url,
+                                  backup_url=stub.url, trial_url=stub.url) as client:
+            pooled = lambda: client.validate_params(params, True)
+
+            # Warm both paths once so imports and lazy session creation are not timed
+            unpooled()
+            pooled()
+
+            unpooled_rps = _run(unpooled, args.calls, args.threads)
+            pooled_rps = _run(pooled, args.calls, args.threads)
+
+    print(f"calls={args.calls} threads={args.threads} latency={args.latency}s")
+    print(f"requests.get per call : {unpooled_rps:10.1f} req/s")
+    print(f"ValidateLeadV3Client  : {pooled_rps:10.1f} req/s")
+    print(f"speedup               : {pooled_rps / unpooled_rps:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measure how validate_leads_v3_sharded throughput scales with the number of processes.
+
+Starts stub_server.py in its own process, then runs the same batch for each
+process count with a fixed number of threads per process and prints leads/sec
+and the speedup over one process. The stub is single-process too, so on small
+machines it may become the bottleneck before the clients do.
+
+    python bench_sharded.py --leads 20000 --latency 0.02 --processes 1 2 4 8 16 32 --workers 16
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "REST")))
+
+from bench_session_pool import LEAD
+from run_benchmarks import _start_stub
+from validate_leads_v3_sharded import validate_leads_v3_sharded
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leads", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub latency per request in seconds.")
+    parser.add_argument("--components", type=int, default=None, help="InformationComponents per response.")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--workers", type=int, default=16, help="Threads per process.")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    stub, url, _, _ = _start_stub(SimpleNamespace(latency=args.latency, error_rate=0.0, components=args.components))
+    try:
+        options = {"primary_url": url, "backup_url": url, "trial_url": url}
+        baseline = None
+        for processes in args.processes:
+            leads = (LEAD for _ in range(args.leads))
+            start = time.perf_counter()
+            errors = 0
+            for response in validate_leads_v3_sharded(leads, "BENCHMARK", processes=processes,
+                                                      workers=args.workers, chunk_size=args.chunk_size,
+                                                      client_options=options):
+                errors += response.Error is not None
+            rate = args.leads / (time.perf_counter() - start)
+            baseline = baseline or rate
+            print(f"processes={processes:3d}  {rate:10.1f} leads/s  speedup={rate / baseline:6.2f}x  errors={errors}")
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Offline benchmark suite for the REST, asyncio and SOAP ValidateLead_V3 clients.
+
+Starts stub_server.py in its own process, so the stub's CPU time is not charged
+to the clients, then drives each client at each concurrency level against it.
+Every run happens in a fresh process so that peak memory belongs to that run
+alone. Reports throughput, latency percentiles, CPU time per call and peak RSS,
+and writes the results as JSON; pass --compare to diff them against an earlier
+run, e.g. one taken on the previous commit.
+
+    python run_benchmarks.py --calls 2000 --concurrency 1 8 32 --output results.json
+    python run_benchmarks.py --latency 0.02 --error-rate 0.05 --components 50 --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "REST"))
+sys.path.insert(0, os.path.join(HERE, "..", "SOAP"))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from bench_session_pool import LEAD
+
+APIS = ("rest", "rest-async", "soap", "soap-pooled", "soap-async")
+
+# Metrics where a higher value is better; all others are better lower
+_HIGHER_IS_BETTER = ("throughput",)
+_COMPARED = ("throughput", "p50_ms", "p95_ms", "p99_ms", "cpu_ms_per_call")
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _timed(call, latencies: list, errors: list) -> None:
+    start = time.perf_counter()
+    try:
+        response = call()
+        if getattr(response, "Error", None):
+            errors.append(1)
+    except RuntimeError:
+        errors.append(1)
+    latencies.append(time.perf_counter() - start)
+
+
+def _drive_threads(call, calls: int, concurrency: int, latencies: list, errors: list) -> None:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in pool.map(lambda _: _timed(call, latencies, errors), range(calls)):
+            pass
+
+
+def _run_rest(rest_url: str, wsdl_url: str, soap_url: str, calls: int, concurrency: int,
+              latencies: list, errors: list):
+    from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+
+    params = build_params(LEAD, "BENCHMARK")
+    with ValidateLeadV3Client(pool_size=concurrency, primary_url=rest_url, backup_url=rest_url) as client:
+        _drive_threads(lambda: client.validate_params(params), concurrency, concurrency, [], [])
+        yield
+        _drive_threads(lambda: client.validate_params(params), calls, concurrency, latencies, errors)
+
+
+def _run_rest_async(rest_url: str, wsdl_url: str, soap_url: str, calls: int, concurrency: int,
+                    latencies: list, errors: list):
+    from validate_lead_v3_rest import build_params
+    from validate_lead_v3_rest_async import AsyncValidateLeadV3Client
+
+    params = build_params(LEAD, "BENCHMARK")
+
+    async def drive(client, count: int, latencies: list, errors: list) -> None:
+        # Latency is measured once a slot is free, as it is for the thread pool drivers
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.validate_params(params)
+                    if response.Error:
+                        errors.append(1)
+                except RuntimeError:
+                    errors.append(1)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one() for _ in range(count)))
+
+    # One loop for warm-up and measurement, so the timed calls reuse the warmed-up connections
+    loop = asyncio.new_event_loop()
+    client = AsyncValidateLeadV3Client(max_concurrency=concurrency, primary_url=rest_url, backup_url=rest_url)
+    try:
+        loop.run_until_complete(drive(client, concurrency, [], []))
+        yield
+        loop.run_until_complete(drive(client, calls, latencies, errors))
+    finally:
+        loop.run_until_complete(client.close())
+        loop.close()
+
+
+def _run_soap(rest_url: str, wsdl_url: str, soap_url: str, calls: int, concurrency: int,
+              latencies: list, errors: list):
+    from validate_lead_v3_rest import LEAD_FIELDS
+    from validate_lead_v3_soap import ValidateLeadV3Soap
+
+    lead = {field: LEAD.get(field, "") for field, _ in LEAD_FIELDS}
+    service = ValidateLeadV3Soap("BENCHMARK", primary_wsdl=wsdl_url, backup_wsdl=wsdl_url)
+    _drive_threads(lambda: service.validate_lead_v3(**lead), concurrency, concurrency, [], [])
+    yield
+    _drive_threads(lambda: service.validate_lead_v3(**lead), calls, concurrency, latencies, errors)
+    service.close()
+
+
+def _run_soap_pooled(rest_url: str, wsdl_url: str, soap_url: str, calls: int, concurrency: int,
+                     latencies: list, errors: list):
+    from validate_lead_v3_rest import LEAD_FIELDS
+    from validate_lead_v3_soap_pooled import ValidateLeadV3SoapPooled
+
+    lead = {field: LEAD.get(field, "") for field, _ in LEAD_FIELDS}
+    with ValidateLeadV3SoapPooled("BENCHMARK", pool_size=concurrency, primary_url=soap_url,
+                                  backup_url=soap_url) as service:
+        _drive_threads(lambda: service.validate_lead_v3(**lead), concurrency, concurrency, [], [])
+        yield
+        _drive_threads(lambda: service.validate_lead_v3(**lead), calls, concurrency, latencies, errors)
+
+
+def _run_soap_async(rest_url: str, wsdl_url: str, soap_url: str, calls: int, concurrency: int,
+                    latencies: list, errors: list):
+    from validate_lead_v3_rest import LEAD_FIELDS
+    from validate_lead_v3_soap_pooled import AsyncValidateLeadV3SoapPooled
+
+    lead = {field: LEAD.get(field, "") for field, _ in LEAD_FIELDS}
+
+    async def drive(service, count: int, latencies: list, errors: list) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await service.validate_lead_v3(**lead)
+                    if getattr(response, "Error", None):
+                        errors.append(1)
+                except RuntimeError:
+                    errors.append(1)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one() for _ in range(count)))
+
+    loop = asyncio.new_event_loop()
+    service = AsyncValidateLeadV3SoapPooled("BENCHMARK", max_concurrency=concurrency, primary_url=soap_url,
+                                            backup_url=soap_url)
+    try:
+        loop.run_until_complete(drive(service, concurrency, [], []))
+        yield
+        loop.run_until_complete(drive(service, calls, latencies, errors))
+    finally:
+        loop.run_until_complete(service.close())
+        loop.close()
+
+
+_DRIVERS = {"rest": _run_rest, "rest-async": _run_rest_async, "soap": _run_soap,
+            "soap-pooled": _run_soap_pooled, "soap-async": _run_soap_async}
+
+
+def run_scenario(api: str, concurrency: int, calls: int, rest_url: str, wsdl_url: str,
+                 soap_url: str) -> dict:
+    """Warm up, then time `calls` calls of one client at one concurrency level."""
+    latencies, errors = [], []
+    driver = _DRIVERS[api](rest_url, wsdl_url, soap_url, calls, concurrency, latencies, errors)
+    # Everything up to the driver's yield is warm-up: imports, connections, WSDL parsing
+    next(driver)
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for _ in driver:
+        pass
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    latencies.sort()
+    return {
+        "api": api,
+        "concurrency": concurrency,
+        "calls": calls,
+        "errors": len(errors),
+        "seconds": round(elapsed, 4),
+        "throughput": round(calls / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "cpu_ms_per_call": round(cpu / calls * 1000, 4),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _start_stub(args) -> tuple:
+    command = [sys.executable, os.path.join(HERE, "stub_server.py"),
+               "--latency", str(args.latency), "--error-rate", str(args.error_rate), "--seed", "1"]
+    if args.components is not None:
+        command += ["--components", str(args.components)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    rest_url = process.stdout.readline().split(" ", 1)[1].strip()
+    wsdl_url = process.stdout.readline().split(" ", 1)[1].strip()
+    soap_url = process.stdout.readline().split(" ", 1)[1].strip()
+    return process, rest_url, wsdl_url, soap_url
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list:
+    """
+    Relative change of each metric between two result files, per api and concurrency.
+
+    Returns a list of (key, metric, old, new, change, regressed) tuples; a metric
+    regresses when it moved the wrong way by more than threshold (a fraction).
+    """
+    old_results = {(result["api"], result["concurrency"]): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        key = (result["api"], result["concurrency"])
+        old = old_results.get(key)
+        if old is None:
+            continue
+        for metric in _COMPARED:
+            if not old.get(metric):
+                continue
+            change = (result[metric] - old[metric]) / old[metric]
+            worse = -change if metric in _HIGHER_IS_BETTER else change
+            rows.append((key, metric, old[metric], result[metric], change, worse > threshold))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apis", nargs="+", choices=APIS, default=list(APIS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=1000, help="Timed calls per run.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub latency per request in seconds.")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of stub responses carrying Error.TypeCode 3.")
+    parser.add_argument("--components", type=int, default=None, help="InformationComponents per response.")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change counted as a regression in --compare (default 0.10).")
+    args = parser.parse_args()
+
+    process, rest_url, wsdl_url, soap_url = _start_stub(args)
+    results = []
+    try:
+        print(f"{'api':<11} {'conc':>5} {'calls/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'cpu ms':>8} {'rss MB':>7} {'errors':>6}")
+        for api in args.apis:
+            for concurrency in args.concurrency:
+                # A fresh process per run, so imports and memory of one run never favour the next
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    result = pool.submit(run_scenario, api, concurrency, args.calls, rest_url, wsdl_url,
+                                         soap_url).result()
+                results.append(result)
+                print(f"{api:<11} {concurrency:>5} {result['throughput']:>9.1f} {result['p50_ms']:>8.2f} "
+                      f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} {result['cpu_ms_per_call']:>8.3f} "
+                      f"{str(result['peak_rss_mb']):>7} {result['errors']:>6}")
+    finally:
+        process.terminate()
+        process.wait()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "stub": {"latency": args.latency, "error_rate": args.error_rate, "components": args.components},
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+            output.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"\nagainst {args.compare} (commit {baseline['meta'].get('commit')}):")
+        if baseline["meta"].get("stub") != report["meta"]["stub"]:
+            print(f"warning: stub settings differ: {baseline['meta'].get('stub')} vs {report['meta']['stub']}")
+        regressions = 0
+        for (api, concurrency), metric, old, new, change, regressed in compare(baseline, report, args.threshold):
+            regressions += regressed
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{api:<11} {concurrency:>5} {metric:<16} {old:>10} -> {new:<10} {change:+7.1%}{flag}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Local stand-in for the ValidateLead_V3 REST and SOAP endpoints, used by the benchmarks.
+
+Answers GETs with a canned ValidateLead_V3 JSON payload and SOAP POSTs with the
+same payload as a ContactInternational SOAP envelope, over HTTP/1.1 keep-alive,
+so the clients can be measured without touching (or paying for) the real
+service. Latency, HTTP failures, Error.TypeCode "3" responses and the payload
+size are configurable. SOAP requests with the wrong path, SOAPAction or body
+namespace get the 404 or fault the real WCF endpoint answers with.
+
+    python stub_server.py --latency 0.02 --error-rate 0.05 --components 50
+"""
+from urllib.parse import urlsplit
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_RESPONSE = {
+    "OverallCertainty": "85",
+    "OverallQuality": "Accept",
+    "LeadType": "Business",
+    "LeadCountry": "US",
+    "NoteCodes": "1,4",
+    "NoteDesc": "Good Name,Good Email",
+    "NameCertainty": "90",
+    "NameQuality": "Good",
+    "FirstName": "Tim",
+    "LastName": "Cook",
+    "FirstNameClean": "Tim",
+    "LastNameClean": "Cook",
+    "NameNoteCodes": "1",
+    "NameNoteDesc": "Name is a real name",
+    "AddressCertainty": "80",
+    "AddressQuality": "Good",
+    "Address1": "27 E Cota St Ste 500",
+    "Address2": "",
+    "Address3": "",
+    "Address4": "",
+    "Address5": "",
+    "AddressLocality": "Santa Barbara",
+    "AddressAdminArea": "CA",
+    "AddressPostalCode": "93101-7602",
+    "AddressCountry": "US",
+    "AddressNoteCodes": "1,6",
+    "AddressNoteDesc": "Deliverable,Business Address",
+    "EmailCertainty": "90",
+    "EmailQuality": "Good",
+    "EmailCorrected": "false",
+    "EmailNoteCodes": "1",
+    "EmailNoteDesc": "Email is deliverable",
+    "IPAddressCertainty": "0",
+    "IPAddressQuality": "Unknown",
+    "IPCountry": "",
+    "IPLocality": "",
+    "IPAdminArea": "",
+    "IPNoteCodes": "",
+    "IPNoteDesc": "",
+    "Phone1Certainty": "85",
+    "Phone1Quality": "Good",
+    "Phone1Locality": "Cupertino",
+    "Phone1AdminArea": "CA",
+    "Phone1Country": "US",
+    "Phone1NoteCodes": "1",
+    "Phone1NoteDesc": "Phone is a landline",
+    "Phone2Certainty": "0",
+    "Phone2Quality": "Unknown",
+    "Phone2Locality": "",
+    "Phone2AdminArea": "",
+    "Phone2Country": "",
+    "Phone2NoteCodes": "",
+    "Phone2NoteDesc": "",
+    "PhoneContact": {
+        "Name": "Apple Inc",
+        "Address": "1 Infinite Loop",
+        "City": "Cupertino",
+        "State": "CA",
+        "Zip": "95014",
+        "Type": "Business",
+    },
+    "InformationComponents": [
+        {"Name": "PhoneContactName", "Value": "Apple Inc"},
+        {"Name": "DomainAge", "Value": "12000"},
+    ],
+}
+
+
+# What the service returns when it cannot handle a request; clients fail over on TypeCode 3
+UNAVAILABLE_RESPONSE = {
+    "Error": {
+        "Type": "Service Not Available",
+        "TypeCode": "3",
+        "Desc": "Unhandled error. Please contact Service Objects.",
+        "DescCode": "3",
+    },
+}
+
+WSDL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lv_soap.wsdl")
+# The service's port address in lv_soap.wsdl, rewritten to the stub's own
+SOAP_ADDRESS = "https://sws.serviceobjects.com/LV/soap.svc/SOAP"
+_SOAP_NS = "http://www.serviceobjects.com"
+_SOAP_ACTION = "http://www.serviceobjects.com/ILVSoapService/ValidateLead_V3"
+_ENVELOPE_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+_REQUEST_PATH = f"{{{_ENVELOPE_NS}}}Body/{{{_SOAP_NS}}}ValidateLead_V3"
+
+# Where the SOAP contract (ContactInternational) names a field differently from the JSON one
+_SOAP_NAMES = {
+    "FirstNameClean": "FirstNameLatin",
+    "LastNameClean": "LastNameLatin",
+    "Address1": "AddressLine1",
+    "Address2": "AddressLine2",
+    "Address3": "AddressLine3",
+    "Address4": "AddressLine4",
+    "Address5": "AddressLine5",
+    "IPAddressCertainty": "IPCertainty",
+    "IPAddressQuality": "IPQuality",
+}
+
+
+def _result_fields() -> tuple:
+    """ContactInternational's elements, in the order of its xs:sequence in lv_soap.wsdl."""
+    xs = "{http://www.w3.org/2001/XMLSchema}"
+    for complex_type in ElementTree.parse(WSDL_PATH).iter(f"{xs}complexType"):
+        if complex_type.get("name") == "ContactInternational":
+            return tuple(element.get("name") for element in complex_type.iter(f"{xs}element"))
+    raise ValueError(f"{WSDL_PATH} has no ContactInternational type")
+
+
+_RESULT_FIELDS = {name: index for index, name in enumerate(_result_fields())}
+
+
+def make_response(components: int = None) -> dict:
+    """
+    SAMPLE_RESPONSE, optionally with its InformationComponents list padded to a given length.
+
+    Real responses carry anything from a couple to several dozen components,
+    which dominates the payload size.
+    """
+    response = dict(SAMPLE_RESPONSE)
+    if components is not None:
+        response["InformationComponents"] = [
+            {"Name": f"Component{index}", "Value": f"Value of information component {index}"}
+            for index in range(components)
+        ]
+    return response
+
+
+def _xml_elements(data: dict) -> str:
+    parts = []
+    for name, value in data.items():
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            parts.append(f"<{name}>{_xml_elements(value)}</{name}>")
+        elif isinstance(value, list):
+            items = "".join(f"<InformationComponent>{_xml_elements(item)}</InformationComponent>" for item in value)
+            parts.append(f"<{name}>{items}</{name}>")
+        else:
+            parts.append(f"<{name}>{escape(str(value))}</{name}>")
+    return "".join(parts)
+
+
+def soap_envelope(response: dict) -> bytes:
+    """The ValidateLead_V3 SOAP reply carrying response, renamed and ordered as a ContactInternational."""
+    result = {_SOAP_NAMES.get(name, name): value for name, value in response.items()}
+    result = dict(sorted(result.items(), key=lambda item: _RESULT_FIELDS.get(item[0], len(_RESULT_FIELDS))))
+    return (
+        f'<s:Envelope xmlns:s="{_ENVELOPE_NS}"><s:Body>'
+        f'<ValidateLead_V3Response xmlns="{_SOAP_NS}"><ValidateLead_V3Result>'
+        f"{_xml_elements(result)}"
+        "</ValidateLead_V3Result></ValidateLead_V3Response></s:Body></s:Envelope>"
+    ).encode("utf-8")
+
+
+def soap_fault(code: str, message: str) -> bytes:
+    """A SOAP 1.1 fault as WCF sends it, with a faultcode in the addressing namespace."""
+    return (
+        f'<s:Envelope xmlns:s="{_ENVELOPE_NS}"><s:Body><s:Fault>'
+        f'<faultcode xmlns:a="http://schemas.microsoft.com/ws/2005/05/addressing/none">a:{code}</faultcode>'
+        f'<faultstring xml:lang="en-US">{escape(message)}</faultstring>'
+        "</s:Fault></s:Body></s:Envelope>"
+    ).encode("utf-8")
+
+
+def _is_request(body: bytes) -> bool:
+    try:
+        return ElementTree.fromstring(body).find(_REQUEST_PATH) is not None
+    except ElementTree.ParseError:
+        return False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second write waits on a delayed ACK and keep-alive looks slower than it is
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        stub = self.server.stub
+        if self.path.lower().endswith("?wsdl"):
+            self._send(200, "text/xml", stub.wsdl)
+            return
+        self._answer(stub.body, stub.error_body, "application/json")
+
+    def do_POST(self):
+        stub = self.server.stub
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        action = self.headers.get("SOAPAction", "").strip('"')
+        if urlsplit(self.path).path.lower() != urlsplit(stub.soap_url).path.lower():
+            self._fault(404, b"")
+        elif action != _SOAP_ACTION:
+            self._fault(500, soap_fault(
+                "ActionNotSupported",
+                f"The message with Action '{action}' cannot be processed at the receiver, "
+                "due to a ContractFilter mismatch at the EndpointDispatcher."))
+        elif not _is_request(body):
+            self._fault(500, soap_fault(
+                "DeserializationFailed",
+                f"Expected to find a ValidateLead_V3 element in namespace '{_SOAP_NS}' in the message body."))
+        else:
+            self._answer(stub.soap_body, stub.soap_error_body, "text/xml; charset=utf-8")
+
+    def _fault(self, status: int, body: bytes) -> None:
+        # Counted apart from `requests`, so a client speaking the wrong contract shows up
+        self.server.stub.faults += 1
+        self._send(status, "text/xml; charset=utf-8", body)
+
+    def _answer(self, body: bytes, error_body: bytes, content_type: str) -> None:
+        stub = self.server.stub
+        if stub.latency:
+            time.sleep(stub.latency)
+        stub.requests += 1
+        if stub.status != 200:
+            # Simulated outage
+            self._send(stub.status, content_type, b"")
+        elif stub.error_rate and stub.inject_error():
+            self._send(200, content_type, error_body)
+        else:
+            self._send(200, content_type, body)
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on this request, e.g. the losing side of a hedge
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    # The default backlog of 5 drops connection attempts from concurrent clients,
+    # which then stall for a full one-second SYN retransmit
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+class StubServer:
+    """
+    Threaded local ValidateLead_V3 stub for both the REST and the SOAP contract.
+
+    Use as a context manager; `url` is a drop-in replacement for the module-level
+    primary_url/backup_url/trial_url of validate_lead_v3_rest, `wsdl_url` for
+    the primary_wsdl/backup_wsdl of ValidateLeadV3Soap, and `soap_url` for the
+    primary_url/backup_url of validate_lead_v3_soap_pooled. `latency`, `status` and
+    `error_rate` may be changed while the server runs to simulate a slow or
+    failing endpoint. `requests` counts the requests answered, and `faults`
+    the SOAP requests refused for not matching the service's contract.
+    """
+
+    def __init__(self, latency: float = 0.0, response: dict = None, host: str = "127.0.0.1", port: int = 0,
+                 status: int = 200, error_rate: float = 0.0, components: int = None, seed: int = None):
+        """
+        Parameters:
+            latency: Seconds to sleep before answering each request.
+            response: Payload to return. Defaults to SAMPLE_RESPONSE.
+            host: Interface to bind.
+            port: Port to bind; 0 picks a free port.
+            status: HTTP status to answer with; anything but 200 returns an empty body.
+            error_rate: Fraction of requests answered with an Error.TypeCode "3" payload.
+            components: Number of InformationComponents in the default payload, to vary its size.
+            seed: Seed for choosing which requests get an injected error.
+        """
+        self.latency = latency
+        self.status = status
+        self.error_rate = error_rate
+        self.requests = 0
+        self.faults = 0
+        if response is None:
+            response = make_response(components)
+        self.body = json.dumps(response).encode("utf-8")
+        self.soap_body = soap_envelope(response)
+        self.error_body = json.dumps(UNAVAILABLE_RESPONSE).encode("utf-8")
+        self.soap_error_body = soap_envelope(UNAVAILABLE_RESPONSE)
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.stub = self
+        with open(WSDL_PATH, encoding="utf-8") as wsdl:
+            self.wsdl = wsdl.read().replace(SOAP_ADDRESS, self.soap_url).encode("utf-8")
+        self._thread = None
+
+    def inject_error(self) -> bool:
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    @property
+    def _base(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def url(self) -> str:
+        return f"{self._base}/lv/api.svc/json/ValidateLead_V3?"
+
+    @property
+    def soap_url(self) -> str:
+        """The SOAP port address, in place of SOAP_ADDRESS."""
+        return f"{self._base}/LV/soap.svc/SOAP"
+
+    @property
+    def wsdl_url(self) -> str:
+        return f"{self._base}/LV/soap.svc?wsdl"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to sleep before each answer.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction answered with Error.TypeCode 3.")
+    parser.add_argument("--components", type=int, default=None, help="InformationComponents per response.")
+    parser.add_argument("--status", type=int, default=200, help="HTTP status to answer with.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency, host=args.host, port=args.port, status=args.status,
+                    error_rate=args.error_rate, components=args.components, seed=args.seed) as stub:
+        print(f"REST {stub.url}", flush=True)
+        print(f"WSDL {stub.wsdl_url}", flush=True)
+        print(f"SOAP {stub.soap_url}", flush=True)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
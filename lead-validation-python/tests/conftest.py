@@ -0,0 +1,45 @@
+"""
+Shared fixtures: the modules under REST/, SOAP/ and benchmarks/ are imported the
+way the samples import each other, by putting their directories on sys.path.
+Calls go to benchmarks/stub_server.py, never to the real service.
+"""
+import os
+import sys
+
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _directory in ("REST", "SOAP", "benchmarks"):
+    sys.path.insert(0, os.path.join(_ROOT, _directory))
+
+from stub_server import StubServer  # noqa: E402
+from validate_lead_v3_rest import ValidateLeadV3Client  # noqa: E402
+
+
+@pytest.fixture
+def stub():
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def backup_stub():
+    with StubServer() as server:
+        yield server
+
+
+@pytest.fixture
+def make_client(stub, backup_stub):
+    """Build ValidateLeadV3Clients calling stub as primary and trial, and backup_stub as backup."""
+    clients = []
+
+    def make(**kwargs):
+        kwargs.setdefault("timeout", 5)
+        client = ValidateLeadV3Client(primary_url=stub.url, backup_url=backup_stub.url, trial_url=stub.url,
+                                      **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
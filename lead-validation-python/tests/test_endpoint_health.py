@@ -0,0 +1,115 @@
+import pytest
+
+from endpoint_health import CLOSED, HALF_OPEN, OPEN, EndpointHealth
+from validate_lead_v3_rest import build_params
+
+ENDPOINT = "https://primary.example/"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def health(clock):
+    return EndpointHealth(failure_threshold=3, failure_window=10, recovery_time=5, clock=clock)
+
+
+def test_circuit_opens_after_threshold_failures(health):
+    for _ in range(2):
+        health.record_failure(ENDPOINT, ConnectionError())
+        assert health.state(ENDPOINT) == CLOSED
+    health.record_failure(ENDPOINT, ConnectionError())
+    assert health.state(ENDPOINT) == OPEN
+    assert not health.allow(ENDPOINT)
+    assert health.stats[ENDPOINT]["short_circuits"] == 1
+    assert health.stats[ENDPOINT]["last_error"] == "ConnectionError"
+
+
+def test_failures_outside_the_window_or_before_a_success_do_not_count(health, clock):
+    health.record_failure(ENDPOINT)
+    health.record_failure(ENDPOINT)
+    clock.now += 11
+    health.record_failure(ENDPOINT)
+    assert health.state(ENDPOINT) == CLOSED
+
+    health.record_success(ENDPOINT, 0.01)
+    health.record_failure(ENDPOINT)
+    health.record_failure(ENDPOINT)
+    assert health.state(ENDPOINT) == CLOSED
+
+
+def test_half_open_probe_success_closes_the_circuit(health, clock):
+    for _ in range(3):
+        health.record_failure(ENDPOINT)
+    clock.now += 5
+    assert health.allow(ENDPOINT)
+    assert health.state(ENDPOINT) == HALF_OPEN
+    # Only one probe at a time
+    assert not health.allow(ENDPOINT)
+
+    health.record_success(ENDPOINT, 0.02)
+    assert health.state(ENDPOINT) == CLOSED
+    assert health.allow(ENDPOINT)
+
+
+def test_failed_probe_reopens_for_another_recovery_time(health, clock):
+    for _ in range(3):
+        health.record_failure(ENDPOINT)
+    clock.now += 5
+    assert health.allow(ENDPOINT)
+    health.record_failure(ENDPOINT)
+    assert health.state(ENDPOINT) == OPEN
+    clock.now += 4.9
+    assert not health.allow(ENDPOINT)
+    clock.now += 0.1
+    assert health.allow(ENDPOINT)
+
+
+def test_probe_that_never_reports_back_does_not_wedge_the_circuit(health, clock):
+    for _ in range(3):
+        health.record_failure(ENDPOINT)
+    clock.now += 5
+    assert health.allow(ENDPOINT)
+    clock.now += 5
+    assert health.allow(ENDPOINT)
+
+
+def test_reset_forgets_the_endpoint(health):
+    for _ in range(3):
+        health.record_failure(ENDPOINT)
+    health.reset(ENDPOINT)
+    assert health.state(ENDPOINT) == CLOSED
+    assert health.stats[ENDPOINT]["failures"] == 0
+
+
+def test_client_skips_primary_while_its_circuit_is_open(stub, backup_stub, make_client, health, clock):
+    client = make_client(health=health)
+    params = build_params({"full_name": "Tim Cook"}, "KEY")
+    stub.status = 503
+
+    for _ in range(3):
+        assert client.validate_params(params).OverallQuality == "Accept"
+    assert health.state(stub.url) == OPEN
+    assert (stub.requests, backup_stub.requests) == (3, 3)
+
+    client.validate_params(params)
+    assert (stub.requests, backup_stub.requests) == (3, 4)
+    assert health.stats[stub.url]["short_circuits"] == 1
+
+    # After recovery_time one probe reaches the primary again, and its success closes the circuit
+    stub.status = 200
+    clock.now += 5
+    client.validate_params(params)
+    assert (stub.requests, backup_stub.requests) == (4, 4)
+    assert health.state(stub.url) == CLOSED
+    assert health.stats[backup_stub.url]["successes"] == 4
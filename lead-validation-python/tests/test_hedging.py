@@ -0,0 +1,60 @@
+import asyncio
+import inspect
+import time
+
+import pytest
+
+from endpoint_health import EndpointHealth
+from validate_lead_v3_rest import build_params
+from validate_lead_v3_rest_async import AsyncValidateLeadV3Client
+from validate_lead_v3_soap import ValidateLeadV3Soap
+
+PARAMS = build_params({"full_name": "Tim Cook", "email": "tim@example.com"}, "KEY")
+LEAD = dict.fromkeys(list(inspect.signature(ValidateLeadV3Soap.validate_lead_v3).parameters)[1:], "")
+LEAD.update(full_name="Tim Cook", email="tim@example.com", test_type="normal1p")
+
+
+def test_soap_hedge_stops_the_losing_call(stub, backup_stub):
+    health = EndpointHealth()
+    service = ValidateLeadV3Soap("KEY", timeout_ms=5000, hedge_after=0.1, health=health, hedge_workers=2,
+                                 primary_wsdl=stub.wsdl_url, backup_wsdl=backup_stub.wsdl_url)
+    # Parse both WSDLs up front, so the calls below time only the hedged race
+    service._client(stub.wsdl_url)
+    service._client(backup_stub.wsdl_url)
+    stub.latency = 2
+    try:
+        start = time.monotonic()
+        # Losers left running would hold both hedge workers and queue the later calls behind them
+        for _ in range(3):
+            assert service.validate_lead_v3(**LEAD).OverallQuality == "Accept"
+        assert time.monotonic() - start < 1.5
+        assert service.hedge_stats == {"fired": 3, "won": 3}
+        # Stopped losers finish at once; neither counts as an answer or a failure of the primary
+        service._hedge_pool.shutdown(wait=True)
+        assert time.monotonic() - start < 1.5
+        assert (health.stats[stub.wsdl_url]["successes"], health.stats[stub.wsdl_url]["failures"]) == (0, 0)
+        assert backup_stub.requests == 3
+    finally:
+        service.close()
+
+
+@pytest.mark.parametrize("give_up_after, fired", [(0.05, 0), (0.3, 1)])
+def test_async_hedge_cancels_its_requests_when_the_caller_gives_up(stub, backup_stub, give_up_after, fired):
+    stub.latency = backup_stub.latency = 2
+
+    async def run():
+        async with AsyncValidateLeadV3Client(primary_url=stub.url, backup_url=backup_stub.url, timeout=5,
+                                             hedge_after=0.1) as client:
+            start = time.monotonic()
+            try:
+                await asyncio.wait_for(client.validate_params(PARAMS), give_up_after)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                raise AssertionError("expected the caller to time out")
+            await asyncio.sleep(0)
+            assert time.monotonic() - start < 1.0
+            assert client.hedge_stats["fired"] == fired
+            return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
@@ -0,0 +1,99 @@
+import time
+
+import pytest
+
+from lv_cache import LVCache, ShelveCacheBackend, SqliteCacheBackend, cache_key
+from stub_server import StubServer
+from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+
+
+def _params(name, **lead):
+    return build_params(dict(lead, full_name=name), "KEY")
+
+
+def test_key_ignores_case_whitespace_and_license_key():
+    assert cache_key(build_params({"full_name": "Tim  Cook "}, "A")) == \
+        cache_key(build_params({"full_name": "tim cook"}, "B"))
+    assert cache_key(_params("Tim Cook")) != cache_key(_params("Tim Cook", email="tim@example.com"))
+
+
+def test_repeated_leads_are_answered_from_the_cache(stub, make_client):
+    cache = LVCache()
+    client = make_client(cache=cache)
+    first = client.validate_params(_params("Tim Cook"))
+    assert client.validate_params(_params(" TIM COOK")) == first
+    assert stub.requests == 1
+    assert cache.stats == {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size": 1}
+
+
+def test_entries_expire_after_ttl(stub, make_client):
+    client = make_client(cache=LVCache(ttl=0.2))
+    client.validate_params(_params("Tim Cook"))
+    client.validate_params(_params("Tim Cook"))
+    assert stub.requests == 1
+    time.sleep(0.3)
+    client.validate_params(_params("Tim Cook"))
+    assert stub.requests == 2
+
+
+def test_least_recently_used_entry_is_evicted(stub, make_client):
+    cache = LVCache(max_entries=2)
+    client = make_client(cache=cache)
+    for name in ("A", "B", "A", "C"):
+        client.validate_params(_params(name))
+    assert stub.requests == 3
+    # B was the least recently used when C came in
+    client.validate_params(_params("A"))
+    assert stub.requests == 3
+    client.validate_params(_params("B"))
+    assert stub.requests == 4
+    assert cache.stats["size"] == 2
+
+
+def test_live_and_trial_results_are_kept_apart(stub, make_client):
+    client = make_client(cache=LVCache())
+    client.validate_params(_params("Tim Cook"), is_live=True)
+    client.validate_params(_params("Tim Cook"), is_live=False)
+    assert stub.requests == 2
+    client.validate_params(_params("Tim Cook"), is_live=False)
+    assert stub.requests == 2
+
+
+def test_error_responses_are_not_cached():
+    error = {"Error": {"Type": "User Input", "TypeCode": "2", "Desc": "Please provide a valid license key",
+                       "DescCode": "1"}}
+    cache = LVCache()
+    with StubServer(response=error) as stub, \
+            ValidateLeadV3Client(primary_url=stub.url, backup_url=stub.url, cache=cache) as client:
+        assert client.validate_params(_params("Tim Cook")).Error.TypeCode == "2"
+        client.validate_params(_params("Tim Cook"))
+        assert stub.requests == 2
+        assert cache.stats["size"] == 0
+
+
+@pytest.mark.parametrize("backend_class, name", [(SqliteCacheBackend, "cache.db"), (ShelveCacheBackend, "cache")])
+def test_backend_survives_a_restart(tmp_path, stub, make_client, backend_class, name):
+    path = str(tmp_path / name)
+    cache = LVCache(backend=backend_class(path))
+    first = make_client(cache=cache).validate_params(_params("Tim Cook"))
+    cache.close()
+
+    cache = LVCache(backend=backend_class(path))
+    assert make_client(cache=cache).validate_params(_params("Tim Cook")) == first
+    assert stub.requests == 1
+    assert cache.stats["hits"] == 1
+    cache.close()
+
+
+@pytest.mark.parametrize("backend_class, name", [(SqliteCacheBackend, "cache.db"), (ShelveCacheBackend, "cache")])
+def test_backend_drops_expired_entries(tmp_path, stub, make_client, backend_class, name):
+    backend = backend_class(str(tmp_path / name))
+    client = make_client(cache=LVCache(ttl=0.2, backend=backend))
+    client.validate_params(_params("Tim Cook"))
+    time.sleep(0.3)
+
+    # A fresh cache has nothing in memory and must not serve the stale backend entry
+    client = make_client(cache=LVCache(ttl=0.2, backend=backend))
+    client.validate_params(_params("Tim Cook"))
+    assert stub.requests == 2
+    backend.close()
@@ -0,0 +1,79 @@
+import pytest
+
+from lv_delta import DeltaIndex, lead_fingerprint, validate_leads_v3_delta
+
+
+def _leads(count, name="Lead"):
+    return [(str(number), {"full_name": f"{name} {number}", "email": f"lead{number}@example.com"})
+            for number in range(count)]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DeltaIndex(str(tmp_path / "delta.db"))
+    yield index
+    index.close()
+
+
+def test_unchanged_leads_are_answered_from_the_index(stub, make_client, index):
+    first = list(validate_leads_v3_delta(_leads(6), "KEY", index, workers=2, client=make_client()))
+    assert stub.requests == 6
+    assert index.stats == {"reused": 0, "new": 6, "changed": 0, "expired": 0}
+
+    second = list(validate_leads_v3_delta(_leads(6), "KEY", index, workers=2, client=make_client()))
+    assert stub.requests == 6
+    assert index.stats["reused"] == 6
+    assert second == first
+
+
+def test_changed_and_expired_leads_are_sent_again(stub, make_client, index):
+    list(validate_leads_v3_delta(_leads(4), "KEY", index, client=make_client()))
+    leads = _leads(4)
+    leads[1][1]["email"] = "changed@example.com"
+
+    list(validate_leads_v3_delta(leads, "KEY", index, client=make_client()))
+    assert stub.requests == 5
+    assert index.stats == {"reused": 3, "new": 4, "changed": 1, "expired": 0}
+
+    list(validate_leads_v3_delta(leads, "KEY", index, max_age=-1, client=make_client()))
+    assert stub.requests == 9
+    assert index.stats["expired"] == 4
+
+
+def test_fingerprint_ignores_case_and_whitespace():
+    lead = {"full_name": "Tim Cook", "email": "tim@example.com"}
+    assert lead_fingerprint(lead) == lead_fingerprint({"full_name": " tim cook ", "email": "TIM@example.com"})
+    assert lead_fingerprint(lead) != lead_fingerprint(lead, is_live=False)
+
+
+def test_error_responses_are_not_stored(stub, make_client, index):
+    stub.error_rate = 1.0
+    responses = list(validate_leads_v3_delta(_leads(3), "KEY", index, is_live=False, client=make_client()))
+    assert all(response.Error is not None for response in responses)
+    assert len(index) == 0
+
+
+@pytest.mark.parametrize("stored", [False, True])
+def test_read_ahead_is_bounded_by_max_pending(make_client, index, stored):
+    if stored:
+        list(validate_leads_v3_delta(_leads(50), "KEY", index, client=make_client()))
+    read = []
+
+    def leads():
+        for pair in _leads(50):
+            read.append(pair[0])
+            yield pair
+
+    ahead = []
+    for yielded, response in enumerate(validate_leads_v3_delta(leads(), "KEY", index, workers=2, max_pending=5,
+                                                                client=make_client()), 1):
+        ahead.append(len(read) - yielded)
+    assert len(read) == 50
+    assert max(ahead) < 5
+
+
+def test_stopping_early_cancels_queued_calls(stub, make_client, index):
+    responses = validate_leads_v3_delta(_leads(100), "KEY", index, workers=2, max_pending=8, client=make_client())
+    next(responses)
+    responses.close()
+    assert stub.requests <= 8
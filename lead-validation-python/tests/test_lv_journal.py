@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+from lv_cache import LVCache
+from lv_journal import JournalCacheBackend, LVJournal
+from lv_response import LVResponse
+from stub_server import SAMPLE_RESPONSE
+from validate_lead_v3_rest import build_params
+
+
+@pytest.fixture
+def response():
+    return LVResponse.from_dict(SAMPLE_RESPONSE)
+
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".lvj"))
+
+
+def test_reopen_keeps_latest_records_and_tombstones(tmp_path, response):
+    directory = str(tmp_path / "journal")
+    journal = LVJournal(directory, segment_bytes=4096)
+    for number in range(40):
+        journal.append(f"lead-{number}", response, timestamp=number)
+    journal.append("lead-0", {"OverallQuality": "Reject"}, timestamp=100)
+    journal.delete("lead-1")
+    # Seal the segment holding the tombstone, so reopening loads its saved index instead of scanning it
+    journal.rotate()
+    journal.append("lead-2", {"OverallQuality": "Review"})
+    journal.close()
+    assert len(_segments(directory)) > 2
+
+    reopened = LVJournal(directory, segment_bytes=4096)
+    assert len(reopened) == 39
+    assert reopened.get("lead-0") == {"OverallQuality": "Reject"}
+    assert reopened.lookup("lead-0")[0] == 100
+    assert "lead-1" not in reopened and reopened.get("lead-1") is None
+    assert reopened.get("lead-2") == {"OverallQuality": "Review"}
+    assert reopened.get("lead-39") == response
+    reopened.close()
+
+
+def test_torn_record_is_dropped_on_reopen(tmp_path, response):
+    directory = str(tmp_path / "journal")
+    journal = LVJournal(directory)
+    journal.append("kept", response)
+    journal.close()
+    path = os.path.join(directory, _segments(directory)[-1])
+    size = os.path.getsize(path)
+
+    # A crash in the middle of an append leaves a header and part of the record behind
+    full = open(path, "rb").read()
+    with open(path, "ab") as handle:
+        handle.write(full[:len(full) // 2])
+
+    reopened = LVJournal(directory)
+    assert os.path.getsize(path) == size
+    assert list(reopened.keys()) == ["kept"]
+    assert reopened.get("kept") == response
+    reopened.append("after", {"OverallQuality": "Accept"})
+    reopened.close()
+
+    again = LVJournal(directory)
+    assert sorted(again.keys()) == ["after", "kept"]
+    assert again.get("after") == {"OverallQuality": "Accept"}
+    again.close()
+
+
+def test_sealed_segment_and_index_are_synced(tmp_path, response, monkeypatch):
+    directory = str(tmp_path / "journal")
+    journal = LVJournal(directory)
+    synced = []
+    fsync = os.fsync
+
+    def recording_fsync(fd):
+        synced.append(os.fstat(fd).st_ino)
+        fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", recording_fsync)
+    journal.append("lead", response)
+    assert synced == []
+    journal.rotate()
+    journal.close()
+    sealed = os.path.join(directory, _segments(directory)[0])
+    assert synced == [os.stat(sealed).st_ino, os.stat(sealed[:-4] + ".idx").st_ino]
+
+
+def test_compact_keeps_latest_live_records(tmp_path, response):
+    directory = str(tmp_path / "journal")
+    journal = LVJournal(directory, segment_bytes=4096)
+    for round_number in range(5):
+        for number in range(10):
+            journal.append(f"lead-{number}", {"round": round_number})
+    journal.append("expired", response, expires_at=50)
+    journal.append("live", response, expires_at=200)
+    journal.delete("lead-9")
+    before = journal.stats
+
+    reclaimed = journal.compact(now=100)
+    after = journal.stats
+    assert reclaimed == before["bytes"] - after["bytes"] > 0
+    assert after["keys"] == 10
+    assert journal.get("lead-0") == {"round": 4}
+    assert journal.get("expired") is None
+    assert journal.get("live") == response
+    assert journal.get("lead-9") is None
+    journal.close()
+
+    reopened = LVJournal(directory, segment_bytes=4096)
+    assert sorted(reopened.keys()) == sorted([f"lead-{number}" for number in range(9)] + ["live"])
+    assert reopened.get("lead-8") == {"round": 4}
+    reopened.close()
+
+
+def test_journal_backs_the_cache_across_restarts(tmp_path, stub, make_client):
+    params = build_params({"full_name": "Tim Cook", "email": "tim@example.com"}, "KEY")
+    directory = str(tmp_path / "journal")
+    cache = LVCache(backend=JournalCacheBackend(LVJournal(directory)))
+    client = make_client(cache=cache)
+    first = client.validate_params(params)
+    assert stub.requests == 1
+    cache.close()
+
+    cache = LVCache(backend=JournalCacheBackend(LVJournal(directory)))
+    client = make_client(cache=cache)
+    assert client.validate_params(params) == first
+    assert stub.requests == 1
+    cache.close()
@@ -0,0 +1,46 @@
+import pytest
+
+from lv_precheck import STRIP, LeadPrecheck
+from validate_lead_v3_rest import build_params
+
+
+def _params(**lead):
+    return build_params(lead, "KEY")
+
+
+@pytest.mark.parametrize("phone, country, valid", [
+    ("(805) 555-1234", "US", True),
+    ("555-123-4567", "US", False),
+    ("+1 805 555 1234", "", True),
+    ("020 7946 0958", "GB", True),
+    ("0171 234567", "", True),
+    ("12345", "DE", False),
+])
+def test_phone_rule(phone, country, valid):
+    _, rejection = LeadPrecheck(rules=["phone"]).apply(_params(phone1=phone, country=country))
+    assert (rejection is None) == valid
+
+
+def test_values_that_are_not_strings_are_checked_as_text():
+    precheck = LeadPrecheck(required=["Phone1"])
+    # JSON leads carry numbers as int
+    assert precheck.apply(_params(phone1=8055551234, country=840))[1] is None
+    assert precheck.apply(_params(phone1=5551234567, country="US"))[1] is not None
+    # 0 is a value, not a missing one
+    assert precheck.apply(_params(phone1=0))[1]["Error"]["Desc"].endswith("invalid Phone1")
+    assert precheck.stats["failures"] == {"email": 0, "phone": 2, "postal_code": 0, "ip_address": 0, "required": 0}
+
+
+def test_strip_mode_blanks_invalid_values_only():
+    params, rejection = LeadPrecheck(mode=STRIP).apply(_params(email="not an email", phone1="8055551234",
+                                                              country="US"))
+    assert rejection is None
+    assert params["Email"] == "" and params["Phone1"] == "8055551234"
+
+
+def test_rejected_leads_are_not_sent(stub, make_client):
+    client = make_client(precheck=LeadPrecheck())
+    assert client.validate_params(_params(email="a@@b", phone1=8055551234)).Error.TypeCode == "2"
+    assert stub.requests == 0
+    assert client.validate_params(_params(email="tim@example.com", phone1=8055551234)).Error is None
+    assert stub.requests == 1
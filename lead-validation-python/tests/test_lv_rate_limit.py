@@ -0,0 +1,82 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lv_rate_limit import AdaptiveConcurrency, FileTokenBucket, LicenseRateLimiter, TokenBucket
+from validate_lead_v3_rest import build_params
+
+PARAMS = build_params({"full_name": "Tim Cook", "email": "tim@example.com"}, "KEY")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_rate():
+    clock = _Clock()
+    bucket = TokenBucket(rate=10, burst=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+    clock.now = 1.0
+    # Refills at rate, never above burst
+    assert bucket.reserve() == 0.0
+    clock.now = 100.0
+    assert [bucket.reserve() for _ in range(4)][-1] == pytest.approx(0.1)
+
+
+def test_calls_stay_under_the_rate(stub, make_client):
+    limiter = LicenseRateLimiter(rate=20, burst=5)
+    client = make_client(rate_limiter=limiter)
+    start = time.monotonic()
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda _: client.validate_params(PARAMS), range(15)))
+    # 5 calls go out at once, the other 10 at 20 per second
+    assert time.monotonic() - start >= 0.45
+    assert stub.requests == 15
+
+
+def test_file_buckets_share_tokens(tmp_path):
+    path = str(tmp_path / "lv.bucket")
+    # Two handles on one file lock it like two processes do
+    first, second = FileTokenBucket(path, rate=10, burst=2), FileTokenBucket(path, rate=10, burst=2)
+    try:
+        assert first.reserve() == 0.0
+        assert first.reserve() == 0.0
+        assert second.reserve() == pytest.approx(0.1, abs=0.02)
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttling_halves_the_concurrency_limit(stub, backup_stub, make_client, status):
+    concurrency = AdaptiveConcurrency(initial=8, cooldown=60)
+    client = make_client(concurrency=concurrency)
+    stub.status = backup_stub.status = status
+    with ThreadPoolExecutor(8) as pool:
+        failures = [pool.submit(client.validate_params, PARAMS) for _ in range(8)]
+    assert all(isinstance(future.exception(), RuntimeError) for future in failures)
+    # The whole burst of failures counts as one overload
+    assert concurrency.stats == {"limit": 4, "in_flight": 0, "decreases": 1}
+
+    stub.status = backup_stub.status = 200
+    for _ in range(8):
+        client.validate_params(PARAMS)
+    # About +1 per `limit` successful calls
+    assert concurrency.stats["limit"] == 5
+
+
+def test_limit_decreases_again_after_cooldown(stub, backup_stub, make_client):
+    concurrency = AdaptiveConcurrency(initial=8, cooldown=0)
+    client = make_client(concurrency=concurrency)
+    stub.status = backup_stub.status = 429
+    for limit in (4, 2, 1, 1):
+        with pytest.raises(RuntimeError):
+            client.validate_params(PARAMS)
+        assert concurrency.stats["limit"] == limit
@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from lv_response import LVResponse  # noqa: E402
+from lv_result_table import MISSING_SCORE, LVResultTable  # noqa: E402
+from stub_server import SAMPLE_RESPONSE  # noqa: E402
+from validate_leads_v3_bulk import validate_leads_v3  # noqa: E402
+
+
+def _response(**changes):
+    data = dict(SAMPLE_RESPONSE)
+    data.update(changes)
+    return LVResponse.from_dict(data)
+
+
+@pytest.fixture
+def table():
+    return LVResultTable.from_responses([
+        _response(),
+        _response(OverallCertainty="40", EmailQuality="Bad", EmailNoteCodes="2,3", LeadType="Residential"),
+        _response(OverallCertainty=None, EmailQuality="Good", InformationComponents=[]),
+        _response(OverallCertainty="95", EmailNoteCodes="1,3", PhoneContact=None),
+    ])
+
+
+def test_text_columns_are_dictionary_encoded(table):
+    assert table.dictionary("LeadType") == [None, "Business", "Residential"]
+    assert table.codes("LeadType").tolist() == [1, 2, 1, 1]
+    assert table.codes("LeadType").dtype == np.int32
+    assert table.value_counts("LeadType") == {"Business": 3, "Residential": 1}
+    assert table.scores("OverallCertainty").tolist() == [85, 40, MISSING_SCORE, 95]
+
+
+def test_filters_combine_as_masks(table):
+    good = table.ge("OverallCertainty", 80) & table.eq("EmailQuality", "Good")
+    assert good.tolist() == [True, False, False, True]
+    assert table.le("OverallCertainty", 50).tolist() == [False, True, False, False]
+    assert table.isin("LeadType", ["Residential", "Unknown"]).tolist() == [False, True, False, False]
+    assert not table.eq("LeadType", "Unknown").any()
+    assert table.contains_code("EmailNoteCodes", "3").tolist() == [False, True, False, True]
+    assert table.count(good) == 2
+
+
+def test_rows_and_take_round_trip(table):
+    assert table.row(0) == _response()
+    assert table.row(-1).PhoneContact is None
+    picked = table.take(table.contains_code("EmailNoteCodes", "3"))
+    assert len(picked) == 2
+    assert list(picked.rows()) == [table.row(1), table.row(3)]
+    assert picked.row(0).InformationComponents == table.row(1).InformationComponents
+
+
+def test_table_from_stub_results(stub, make_client):
+    stub.error_rate = 0.5
+    stub_leads = [{"full_name": f"Lead {number}"} for number in range(20)]
+    responses = list(validate_leads_v3(stub_leads, "KEY", is_live=False, workers=4, client=make_client()))
+    table = LVResultTable.from_responses(responses)
+    failed = table.ne("Error.TypeCode", None)
+    assert table.count(failed) == sum(response.Error is not None for response in responses)
+    assert list(table.rows(~failed)) == [response for response in responses if response.Error is None]
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from lv_retry import DeadlineExceeded, RetryPolicy, call_deadline
+from validate_lead_v3_rest import build_params
+
+PARAMS = build_params({"full_name": "Tim Cook", "email": "tim@example.com"}, "KEY")
+
+
+def test_backoff_grows_up_to_its_cap():
+    policy = RetryPolicy(backoff=0.1, multiplier=2, max_backoff=0.3, jitter=False)
+    assert [policy.delay(retry) for retry in (1, 2, 3, 4)] == pytest.approx([0.1, 0.2, 0.3, 0.3])
+    jittered = RetryPolicy(backoff=0.1, multiplier=2, max_backoff=0.3, rand=lambda: 0.5)
+    assert jittered.delay(2) == pytest.approx(0.1)
+
+
+def test_retryable_failures():
+    policy = RetryPolicy()
+    assert policy.retryable("http", 503) and policy.retryable("http", 429)
+    assert not policy.retryable("http", 404)
+    assert policy.retryable("transport") and policy.retryable("service")
+    assert not RetryPolicy(retry_transport_errors=False).retryable("transport")
+
+
+def test_attempts_share_the_time_left():
+    budget = RetryPolicy(attempts=3, deadline=0.9).begin()
+    assert budget.attempt_timeout(10) == pytest.approx(0.3, abs=0.01)
+    assert budget.attempt_timeout(0.1) == 0.1
+    assert RetryPolicy(attempts=3).begin().attempt_timeout(10) == 10
+
+
+def test_out_of_attempts_raises_chained_error():
+    budget = RetryPolicy(attempts=2, jitter=False, backoff=0.01).begin()
+    budget.attempt_timeout(1)
+    first = ConnectionError("first")
+    assert budget.failed(first, "transport") == pytest.approx(0.01)
+    budget.attempt_timeout(1)
+    with pytest.raises(RuntimeError, match="after 2 attempts") as raised:
+        budget.failed(ConnectionError("second"), "transport")
+    assert isinstance(raised.value.__cause__, ConnectionError)
+
+
+def test_call_deadline_nests_only_shorter():
+    with call_deadline(10):
+        with call_deadline(60):
+            assert RetryPolicy().begin().remaining() <= 10
+        with call_deadline(1):
+            assert RetryPolicy(deadline=5).begin().remaining() <= 1
+    assert RetryPolicy().begin().remaining() is None
+
+
+def test_retry_moves_to_backup_after_retryable_status(stub, backup_stub, make_client):
+    client = make_client(retry_policy=RetryPolicy(attempts=3, backoff=0.01))
+    stub.status = 503
+    assert client.validate_params(PARAMS).OverallQuality == "Accept"
+    assert (stub.requests, backup_stub.requests) == (1, 1)
+
+
+def test_service_errors_are_retried(stub, backup_stub, make_client):
+    client = make_client(retry_policy=RetryPolicy(attempts=2, backoff=0.01))
+    stub.error_rate = 1.0
+    assert client.validate_params(PARAMS).Error is None
+    assert (stub.requests, backup_stub.requests) == (1, 1)
+
+
+def test_non_retryable_status_fails_at_once(stub, make_client):
+    client = make_client(retry_policy=RetryPolicy(attempts=4, backoff=0.01))
+    stub.status = 404
+    with pytest.raises(RuntimeError, match="call failed"):
+        client.validate_params(PARAMS, is_live=False)
+    assert stub.requests == 1
+
+
+def test_trial_endpoint_is_retried_until_attempts_run_out(stub, make_client):
+    client = make_client(retry_policy=RetryPolicy(attempts=3, backoff=0.01))
+    stub.status = 500
+    with pytest.raises(RuntimeError, match="after 3 attempts"):
+        client.validate_params(PARAMS, is_live=False)
+    assert stub.requests == 3
+
+
+def test_slow_endpoints_fail_within_the_deadline(stub, backup_stub, make_client):
+    client = make_client(retry_policy=RetryPolicy(attempts=2, deadline=0.6, backoff=0.01))
+    stub.latency = backup_stub.latency = 2
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.validate_params(PARAMS)
+    assert time.monotonic() - start < 1.0
+
+
+def test_call_deadline_caps_calls_of_a_client(stub, backup_stub, make_client):
+    client = make_client(retry_policy=RetryPolicy(attempts=2, backoff=0.01))
+    stub.latency = backup_stub.latency = 2
+    start = time.monotonic()
+    with call_deadline(0.5), pytest.raises(DeadlineExceeded):
+        client.validate_params(PARAMS)
+    assert time.monotonic() - start < 1.0
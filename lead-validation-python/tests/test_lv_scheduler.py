@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from lv_scheduler import AsyncPriorityScheduler, PriorityClass, PriorityScheduler
+
+
+def _run_order(scheduler, held, queued):
+    """
+    Fill the scheduler with the held calls, queue the others in the order given, then
+    release slots one at a time and return the classes in the order they were admitted.
+    """
+    async def run():
+        admitted = []
+
+        async def call(priority):
+            await scheduler.acquire(priority)
+            admitted.append(priority)
+
+        for priority in held:
+            await scheduler.acquire(priority)
+        tasks = []
+        for priority in queued:
+            tasks.append(asyncio.ensure_future(call(priority)))
+            # Let the call reach its queue before the next one arrives
+            await asyncio.sleep(0)
+        assert admitted == []
+        running = list(held)
+        while len(admitted) < len(queued):
+            scheduler.release(running.pop(0))
+            started = len(admitted)
+            await asyncio.sleep(0)
+            running += admitted[started:]
+        await asyncio.gather(*tasks)
+        return admitted
+
+    return asyncio.run(run())
+
+
+def test_interactive_call_overtakes_a_queued_batch_backlog():
+    scheduler = AsyncPriorityScheduler(slots=2, classes={
+        "interactive": PriorityClass(weight=4),
+        "batch": PriorityClass(weight=1),
+    })
+    order = _run_order(scheduler, ["batch", "batch"], ["batch"] * 5 + ["interactive"])
+    assert order[0] == "interactive"
+    assert scheduler.stats["classes"]["batch"]["dispatched"] == 7
+
+
+def test_backlogged_classes_share_slots_by_weight():
+    scheduler = AsyncPriorityScheduler(slots=1, classes={
+        "interactive": PriorityClass(weight=3),
+        "batch": PriorityClass(weight=1),
+    })
+    order = _run_order(scheduler, ["batch"], ["batch"] * 3 + ["interactive"] * 9)
+    # Three interactive calls per batch call, counting the batch call that held the slot;
+    # on equal virtual start times the class listed first goes first
+    assert order == ["interactive"] * 4 + ["batch"] + ["interactive"] * 3 + ["batch"] + ["interactive"] * 2 + \
+        ["batch"]
+
+
+def test_reserved_slots_and_limit():
+    scheduler = PriorityScheduler(slots=4, classes={
+        "interactive": PriorityClass(weight=4, reserved=1),
+        "batch": PriorityClass(weight=1, limit=2),
+        "bulk": PriorityClass(weight=1),
+    })
+    for priority in ("batch", "batch", "bulk"):
+        scheduler.acquire(priority)
+
+    # batch is at its limit and the last slot is reserved for interactive calls
+    waiting = [threading.Thread(target=scheduler.acquire, args=(priority,)) for priority in ("batch", "bulk")]
+    for thread in waiting:
+        thread.start()
+    for thread in waiting:
+        thread.join(0.2)
+        assert thread.is_alive()
+    scheduler.acquire("interactive")
+    stats = scheduler.stats
+    assert stats["in_flight"] == 4
+    assert {name: state["queued"] for name, state in stats["classes"].items()} == \
+        {"interactive": 0, "batch": 1, "bulk": 1}
+
+    # A freed bulk slot goes to the queued bulk call, since batch still holds its limit
+    scheduler.release("bulk")
+    waiting[1].join(1)
+    assert not waiting[1].is_alive() and waiting[0].is_alive()
+    scheduler.release("batch")
+    waiting[0].join(1)
+    assert not waiting[0].is_alive()
+
+
+def test_classes_cannot_reserve_more_than_the_slots():
+    with pytest.raises(ValueError, match="reserve more"):
+        PriorityScheduler(slots=2, classes={"interactive": PriorityClass(reserved=3)})
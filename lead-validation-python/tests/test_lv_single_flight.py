@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lv_single_flight import AsyncSingleFlight, SingleFlight
+from stub_server import StubServer
+from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+from validate_lead_v3_rest_async import AsyncValidateLeadV3Client
+
+PARAMS = build_params({"full_name": "Tim Cook", "email": "tim@example.com"}, "KEY")
+TRIAL_ERROR = {"Error": {"Type": "Service Not Available", "TypeCode": "3", "Desc": "Unhandled error",
+                         "DescCode": "1"}}
+
+
+def test_concurrent_duplicates_share_one_call(stub, make_client):
+    stub.latency = 0.3
+    flight = SingleFlight()
+    client = make_client(single_flight=flight)
+    # LicenseKey and letter case do not split a lead
+    duplicates = [PARAMS, dict(PARAMS, LicenseKey="OTHER"), build_params({"full_name": "TIM COOK",
+                                                                          "email": "tim@example.com"}, "KEY")]
+    with ThreadPoolExecutor(6) as pool:
+        responses = list(pool.map(client.validate_params, duplicates * 2))
+    assert stub.requests == 1
+    assert all(response == responses[0] for response in responses)
+    assert flight.stats == {"calls": 1, "shared": 5, "in_flight": 0}
+
+    client.validate_params(PARAMS)
+    assert stub.requests == 2
+
+
+def test_error_reaches_every_waiter():
+    flight = SingleFlight()
+    with StubServer(latency=0.3, response=TRIAL_ERROR) as stub, \
+            ValidateLeadV3Client(trial_url=stub.url, single_flight=flight) as client:
+        def validate(_):
+            with pytest.raises(RuntimeError, match="trial error"):
+                client.validate_params(PARAMS, is_live=False)
+
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(validate, range(4)))
+        assert stub.requests == 1
+        assert flight.stats == {"calls": 1, "shared": 3, "in_flight": 0}
+
+
+def test_async_waiters_outlive_a_cancelled_caller_and_share_errors(stub):
+    stub.latency = 0.3
+
+    async def run(failing):
+        flight = AsyncSingleFlight()
+        async with AsyncValidateLeadV3Client(primary_url=stub.url, backup_url=stub.url, timeout=5,
+                                             single_flight=flight) as client:
+            first = asyncio.ensure_future(client.validate_params(PARAMS))
+            await asyncio.sleep(0.05)
+            others = [asyncio.ensure_future(client.validate_params(PARAMS)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            # Cancelling the caller that started the call must not cancel it for the others
+            first.cancel()
+            responses = await asyncio.gather(*others)
+            assert first.cancelled()
+            assert all(response.OverallQuality == "Accept" for response in responses)
+            assert stub.requests == 1
+            assert flight.stats == {"calls": 1, "shared": 3, "in_flight": 0}
+
+        async with AsyncValidateLeadV3Client(trial_url=failing.url, timeout=5, single_flight=flight) as client:
+            results = await asyncio.gather(*(client.validate_params(PARAMS, is_live=False) for _ in range(3)),
+                                           return_exceptions=True)
+            assert all(isinstance(result, RuntimeError) for result in results)
+            assert failing.requests == 1
+            assert flight.stats == {"calls": 2, "shared": 5, "in_flight": 0}
+
+    with StubServer(latency=0.3, response=TRIAL_ERROR) as failing:
+        asyncio.run(run(failing))
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from lv_timeouts import ResponseTooLarge, check_length, error_label, timeout_phase
+from stub_server import SAMPLE_RESPONSE, StubServer
+from validate_lead_v3_rest import ValidateLeadV3Client, build_params
+from validate_lead_v3_rest_async import AsyncValidateLeadV3Client
+
+PARAMS = build_params({"full_name": "Tim Cook", "email": "tim@example.com"}, "KEY")
+BODY = json.dumps(SAMPLE_RESPONSE).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Answers with BODY in chunks of `chunk` bytes, `delay` seconds apart, declaring `length`
+    bytes: the real length when None, and no Content-Length at all when False.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if server.length is not False:
+            self.send_header("Content-Length", str(server.length if server.length is not None else len(BODY)))
+        self.end_headers()
+        try:
+            for start in range(0, len(BODY), server.chunk):
+                self.wfile.write(BODY[start:start + server.chunk])
+                self.wfile.flush()
+                time.sleep(server.delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def body_server():
+    """Start a server sending a whole, slowed down or misdeclared body; returns its URL."""
+    servers = []
+
+    def start(delay=0.0, chunk=len(BODY), length=None):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        server.daemon_threads = True
+        server.delay, server.chunk, server.length = delay, chunk, length
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_total_timeout_fires_during_a_slow_body(body_server):
+    # Every chunk arrives well within the read timeout, but the body as a whole takes over 10 s
+    url = body_server(delay=0.1, chunk=16)
+    with ValidateLeadV3Client(primary_url=url, backup_url=url, timeout=0.5, read_timeout=0.4) as client:
+        start = time.monotonic()
+        with pytest.raises(RuntimeError) as raised:
+            client.validate_params(PARAMS)
+        # Primary and backup each get their 0.5 s
+        assert time.monotonic() - start < 2
+    assert timeout_phase(raised.value) == "total"
+    assert error_label(raised.value) == "total_timeout"
+
+
+def test_async_total_timeout_fires_during_a_slow_body(body_server):
+    url = body_server(delay=0.1, chunk=16)
+
+    async def run():
+        async with AsyncValidateLeadV3Client(primary_url=url, backup_url=url, timeout=0.5,
+                                             read_timeout=0.4) as client:
+            with pytest.raises(RuntimeError) as raised:
+                await client.validate_params(PARAMS)
+            return raised.value
+
+    start = time.monotonic()
+    error = asyncio.run(run())
+    assert time.monotonic() - start < 2
+    assert timeout_phase(error) == "total"
+
+
+def test_oversized_body_is_rejected(stub, make_client):
+    assert make_client(max_response_bytes=4096).validate_params(PARAMS).OverallQuality == "Accept"
+    with StubServer(components=200) as large, \
+            ValidateLeadV3Client(primary_url=large.url, backup_url=large.url, max_response_bytes=4096) as client:
+        with pytest.raises(RuntimeError) as raised:
+            client.validate_params(PARAMS)
+        assert error_label(raised.value) == "response_too_large"
+        assert large.requests == 2
+
+
+def test_oversized_streamed_body_is_rejected(body_server):
+    # No usable Content-Length, so only counting the streamed bytes catches it
+    url = body_server(chunk=64, length=False)
+    with ValidateLeadV3Client(primary_url=url, backup_url=url, timeout=5, max_response_bytes=256) as client:
+        with pytest.raises(RuntimeError) as raised:
+            client.validate_params(PARAMS)
+    assert error_label(raised.value) == "response_too_large"
+
+
+@pytest.mark.parametrize("length", [len(BODY) + 100, len(BODY) - 100, 10 ** 9])
+def test_wrong_content_length_is_rejected(body_server, length):
+    url = body_server(length=length)
+    with ValidateLeadV3Client(primary_url=url, backup_url=url, timeout=1, max_response_bytes=64 * 1024) as client:
+        with pytest.raises(RuntimeError):
+            client.validate_params(PARAMS)
+
+
+def test_check_length():
+    check_length(None, 10)
+    check_length("100", None)
+    check_length("10", 10)
+    with pytest.raises(ResponseTooLarge, match="11 bytes is over the 10 byte limit"):
+        check_length("11", 10)
@@ -0,0 +1,117 @@
+import csv
+import json
+import os
+
+import pytest
+
+import validate_lead_file
+from lv_delta import DeltaIndex
+from validate_lead_file import validate_file
+
+
+def _write_csv(path, count):
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Id", "FullName", "Email"])
+        for number in range(count):
+            writer.writerow([str(number), f"Lead {number}", f"lead{number}@example.com"])
+
+
+def _output_ids(path):
+    with open(path, newline="", encoding="utf-8") as handle:
+        return [row["Id"] for row in csv.DictReader(handle)]
+
+
+def _crash_after(monkeypatch, rows):
+    """Make validate_file fail while writing output row number rows + 1, like a killed process."""
+    flatten = validate_lead_file.flatten_response
+    written = []
+
+    def flatten_then_crash(response):
+        if len(written) == rows:
+            raise KeyboardInterrupt
+        written.append(response)
+        return flatten(response)
+
+    monkeypatch.setattr(validate_lead_file, "flatten_response", flatten_then_crash)
+
+
+def test_resume_after_crash_validates_only_unwritten_rows(tmp_path, stub, make_client, monkeypatch):
+    input_path, output_path = str(tmp_path / "leads.csv"), str(tmp_path / "out.csv")
+    _write_csv(input_path, 10)
+
+    _crash_after(monkeypatch, 7)
+    with pytest.raises(KeyboardInterrupt):
+        validate_file(input_path, output_path, "KEY", workers=2, checkpoint_every=3, client=make_client())
+    checkpoint = json.load(open(output_path + ".checkpoint", encoding="utf-8"))
+    assert checkpoint["rows_done"] == 6
+    assert os.path.getsize(output_path) > checkpoint["output_bytes"]
+
+    monkeypatch.undo()
+    sent = stub.requests
+    assert validate_file(input_path, output_path, "KEY", workers=2, checkpoint_every=3, client=make_client()) == 4
+
+    # Row 6, written after the last checkpoint, is dropped and written again exactly once
+    assert _output_ids(output_path) == [str(number) for number in range(10)]
+    assert stub.requests - sent == 4
+    assert not os.path.exists(output_path + ".checkpoint")
+
+
+def test_checkpoint_without_output_starts_over(tmp_path, stub, make_client, monkeypatch):
+    input_path, output_path = str(tmp_path / "leads.csv"), str(tmp_path / "out.csv")
+    _write_csv(input_path, 5)
+    _crash_after(monkeypatch, 4)
+    with pytest.raises(KeyboardInterrupt):
+        validate_file(input_path, output_path, "KEY", workers=2, checkpoint_every=2, client=make_client())
+    monkeypatch.undo()
+    os.remove(output_path)
+
+    assert validate_file(input_path, output_path, "KEY", workers=2, checkpoint_every=2, client=make_client()) == 5
+    assert _output_ids(output_path) == [str(number) for number in range(5)]
+
+
+def test_restart_ignores_checkpoint(tmp_path, make_client, monkeypatch):
+    input_path, output_path = str(tmp_path / "leads.csv"), str(tmp_path / "out.csv")
+    _write_csv(input_path, 5)
+    _crash_after(monkeypatch, 4)
+    with pytest.raises(KeyboardInterrupt):
+        validate_file(input_path, output_path, "KEY", workers=2, checkpoint_every=2, client=make_client())
+    monkeypatch.undo()
+
+    assert validate_file(input_path, output_path, "KEY", checkpoint_every=2, restart=True, client=make_client()) == 5
+    assert _output_ids(output_path) == [str(number) for number in range(5)]
+
+
+def test_ragged_csv_row_is_rejected(tmp_path, make_client):
+    input_path = tmp_path / "leads.csv"
+    input_path.write_text("Id,FullName\n1,Lead 1\n2,Lead 2,extra\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="line 3"):
+        validate_file(str(input_path), str(tmp_path / "out.csv"), "KEY", client=make_client())
+
+
+def test_json_array_input(tmp_path, make_client):
+    input_path, output_path = tmp_path / "leads.json", tmp_path / "out.jsonl"
+    leads = [{"Id": str(number), "FullName": f"Lead {number}"} for number in range(3)]
+    input_path.write_text(json.dumps(leads, indent=2), encoding="utf-8")
+
+    assert validate_file(str(input_path), str(output_path), "KEY", client=make_client()) == 3
+    rows = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+    assert [row["Id"] for row in rows] == ["0", "1", "2"]
+    assert all(row["OverallQuality"] == "Accept" for row in rows)
+
+
+def test_delta_rows_without_id_get_a_local_error(tmp_path, stub, make_client):
+    input_path, output_path = tmp_path / "leads.jsonl", tmp_path / "out.jsonl"
+    rows = [{"Id": "1", "FullName": "Lead 1"}, {"FullName": "No Id"}, {"Id": "", "FullName": "Empty Id"},
+            {"Id": 4, "FullName": "Lead 4"}]
+    input_path.write_text("".join(json.dumps(row) + "\n" for row in rows), encoding="utf-8")
+    index = DeltaIndex(str(tmp_path / "delta.db"))
+
+    assert validate_file(str(input_path), str(output_path), "KEY", client=make_client(), delta_index=index,
+                         id_column="Id") == 4
+    written = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+    assert [row["FullName"] for row in written] == ["Lead 1", "No Id", "Empty Id", "Lead 4"]
+    assert [row["ErrorTypeCode"] for row in written] == [None, "local", "local", None]
+    assert stub.requests == 2
+    assert len(index) == 2
+    index.close()
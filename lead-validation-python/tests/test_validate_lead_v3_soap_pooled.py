@@ -0,0 +1,80 @@
+import asyncio
+import inspect
+from xml.etree import ElementTree
+
+import pytest
+import requests
+
+import validate_lead_v3_soap_pooled as pooled
+from stub_server import WSDL_PATH, StubServer, make_response, soap_envelope
+from validate_lead_v3_soap import ValidateLeadV3Soap, _to_plain
+from validate_lead_v3_soap_pooled import (AsyncValidateLeadV3SoapPooled, ReplyParser, ValidateLeadV3SoapPooled,
+                                          parse_reply, render_envelope)
+
+LEAD = dict.fromkeys(list(inspect.signature(ValidateLeadV3Soap.validate_lead_v3).parameters)[1:], "")
+LEAD.update(full_name="Tim O'Brien & <Sons>", email="tim@example.com", test_type="normal1p")
+_XS = "{http://www.w3.org/2001/XMLSchema}"
+_WSDL_SOAP = "{http://schemas.xmlsoap.org/wsdl/soap/}"
+
+
+def _wsdl():
+    return ElementTree.parse(WSDL_PATH).getroot()
+
+
+def test_envelope_follows_the_wsdl():
+    request_type = next(element for element in _wsdl().iter(f"{_XS}element")
+                        if element.get("name") == "ValidateLead_V3")
+    assert pooled.REQUEST_FIELDS == tuple(element.get("name") for element in request_type.iter(f"{_XS}element")
+                                          if element is not request_type)
+    action = next(_wsdl().iter(f"{_WSDL_SOAP}operation")).get("soapAction")
+    assert pooled._HEADERS["SOAPAction"] == f'"{action}"'
+
+    envelope = ElementTree.fromstring(render_envelope(pooled._call_kwargs("KEY", **LEAD)))
+    request = envelope.find(f"{{{pooled._ENVELOPE_NS}}}Body/{{{pooled._NS}}}ValidateLead_V3")
+    assert [child.tag.rpartition("}")[2] for child in request] == list(pooled.REQUEST_FIELDS)
+    assert request.findtext(f"{{{pooled._NS}}}FullName") == "Tim O'Brien & <Sons>"
+    assert request.findtext(f"{{{pooled._NS}}}LicenseKey") == "KEY"
+
+
+@pytest.mark.parametrize("components", [None, 200])
+def test_replies_match_suds(components):
+    with StubServer(components=components) as stub:
+        service = ValidateLeadV3Soap("KEY", primary_wsdl=stub.wsdl_url, backup_wsdl=stub.wsdl_url)
+        try:
+            expected = _to_plain(service.validate_lead_v3(**LEAD))
+        finally:
+            service.close()
+        with ValidateLeadV3SoapPooled("KEY", primary_url=stub.soap_url, backup_url=stub.soap_url) as client:
+            assert _to_plain(client.validate_lead_v3(**LEAD)) == expected
+        # Under a size cap the body is read through the limits, one socket read at a time
+        with ValidateLeadV3SoapPooled("KEY", primary_url=stub.soap_url, backup_url=stub.soap_url,
+                                      max_response_bytes=1 << 20) as client:
+            assert _to_plain(client.validate_lead_v3(**LEAD)) == expected
+
+        async def run():
+            async with AsyncValidateLeadV3SoapPooled("KEY", primary_url=stub.soap_url,
+                                                     backup_url=stub.soap_url) as client:
+                return _to_plain(await client.validate_lead_v3(**LEAD))
+
+        assert asyncio.run(run()) == expected
+        # The stub answers a request off the ValidateLead_V3 contract with a fault, not a reply
+        assert (stub.requests, stub.faults) == (4, 0)
+
+
+def test_reply_parsed_in_pieces_matches_whole():
+    body = soap_envelope(make_response(20))
+    parser = ReplyParser()
+    for start in range(0, len(body), 7):
+        parser.feed(body[start:start + 7])
+    result = parser.close()
+    assert result == parse_reply(body)
+    assert result["InformationComponents"]["InformationComponent"][19] == {
+        "Name": "Component19", "Value": "Value of information component 19", "__class__": "InformationComponent"}
+
+
+def test_fault_is_raised(stub):
+    response = requests.post(stub.soap_url, data=render_envelope(pooled._call_kwargs("KEY", **LEAD)),
+                             headers={"Content-Type": "text/xml; charset=utf-8", "SOAPAction": '"Other"'})
+    assert response.status_code == 500
+    with pytest.raises(ValueError, match="ContractFilter mismatch"):
+        parse_reply(response.content)